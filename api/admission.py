@@ -0,0 +1,150 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+import logging
+
+from fastapi import HTTPException
+
+from src.config import ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT_SECONDS
+from src.infrastructure.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Lanes in the order they are served; background may only use part of the queue
+PRIORITY_LANES = ("interactive", "background")
+BACKGROUND_QUEUE_SHARE = 0.5
+SERVICE_TIME_EWMA_ALPHA = 0.2
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded, prioritized wait queue for the chat endpoints.
+
+    - At most `max_concurrent` turns run at once; the rest wait in per-priority FIFO lanes
+      (interactive before background), handed a slot directly when one is released.
+    - A full lane is rejected immediately with 429; a request still queued after
+      `queue_timeout` seconds, or at its turn deadline if that comes first, gets 503. Both carry a Retry-After estimated from the
+      recent average turn duration, so served requests keep a stable latency instead
+      of everything timing out together.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = ADMISSION_MAX_CONCURRENT,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.queue_timeout = queue_timeout
+        self._lane_limits = {
+            "interactive": max_queue,
+            "background": int(max_queue * BACKGROUND_QUEUE_SHARE),
+        }
+        self._lanes: dict[str, deque[asyncio.Future]] = {lane: deque() for lane in PRIORITY_LANES}
+        self._active = 0
+        self._avg_service_seconds = 5.0
+        self._metrics = get_metrics()
+
+    @asynccontextmanager
+    async def admit(self, priority: str = "interactive", deadline: float | None = None):
+        """`deadline`: absolute turn deadline (time.time()); the queue wait never outlasts it."""
+        lane = priority if priority in self._lanes else "interactive"
+        started = time.perf_counter()
+        timeout = self.queue_timeout if deadline is None else min(self.queue_timeout, deadline - time.time())
+        await self._acquire(lane, timeout)
+        waited = time.perf_counter() - started
+        self._metrics.observe("admission_wait_seconds", waited, priority=lane)
+
+        try:
+            yield
+        finally:
+            self._record_service_time(time.perf_counter() - started - waited)
+            self._release()
+
+    # ── Slots ────────────────────────────────────────────────────────────────
+
+    async def _acquire(self, lane: str, timeout: float):
+        if self._active < self.max_concurrent and not self._queued():
+            self._active += 1
+            self._publish_gauges()
+            return
+
+        if len(self._lanes[lane]) >= self._lane_limits[lane]:
+            self._reject(429, "queue_full", lane, "Server is busy, too many queued requests")
+        if timeout <= 0:
+            self._reject(503, "deadline", lane, "Request deadline expired before it could be started")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._lanes[lane].append(waiter)
+        self._publish_gauges()
+        try:
+            # The slot is handed over by _release(): _active already counts us on success
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return      # granted right as the timeout fired
+            waiter.cancel()
+            self._remove(lane, waiter)
+            self._reject(503, "queue_timeout", lane, "Server is overloaded, request could not be started in time")
+        except asyncio.CancelledError:
+            # Client went away: give the slot back if we were granted one meanwhile
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            else:
+                waiter.cancel()
+                self._remove(lane, waiter)
+            raise
+
+    def _release(self):
+        for lane in PRIORITY_LANES:
+            while self._lanes[lane]:
+                waiter = self._lanes[lane].popleft()
+                if not waiter.done():
+                    waiter.set_result(True)     # slot handed over, _active unchanged
+                    self._publish_gauges()
+                    return
+        self._active -= 1
+        self._publish_gauges()
+
+    def _remove(self, lane: str, waiter: asyncio.Future):
+        try:
+            self._lanes[lane].remove(waiter)
+        except ValueError:
+            pass
+        self._publish_gauges()
+
+    def _queued(self) -> int:
+        return sum(len(q) for q in self._lanes.values())
+
+    # ── Rejection / stats ────────────────────────────────────────────────────
+
+    def _reject(self, status_code: int, reason: str, lane: str, detail: str):
+        retry_after = self.retry_after_seconds()
+        self._metrics.incr("admission_rejected_total", reason=reason, priority=lane)
+        logger.warning(f"Admission rejected ({reason}, {lane}): active={self._active}, queued={self._queued()}, retry after {retry_after}s")
+        raise HTTPException(status_code=status_code, detail=detail, headers={"Retry-After": str(retry_after)})
+
+    def retry_after_seconds(self) -> int:
+        """Time for the current queue to drain through the available slots."""
+        backlog = self._queued() + 1
+        return max(1, math.ceil(backlog * self._avg_service_seconds / self.max_concurrent))
+
+    def _record_service_time(self, seconds: float):
+        self._avg_service_seconds += SERVICE_TIME_EWMA_ALPHA * (seconds - self._avg_service_seconds)
+
+    def _publish_gauges(self):
+        self._metrics.set_gauge("admission_active", self._active)
+        self._metrics.set_gauge("admission_queued", self._queued())
+
+
+_admission_instance: AdmissionController | None = None
+
+
+def get_admission_controller() -> AdmissionController:
+    global _admission_instance
+    if _admission_instance is None:
+        _admission_instance = AdmissionController()
+    return _admission_instance
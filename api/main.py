@@ -1,16 +1,24 @@
-from fastapi import FastAPI, HTTPException, APIRouter
+from fastapi import FastAPI, HTTPException, APIRouter, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
+import os
 import sys
+import time
 from pathlib import Path
 import logging
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.multi_agent.state import log_state_summary
 from src.agent.session import MedicalAgent
+from src.infrastructure.metrics import get_metrics
+from api.session_store import get_session_store
+from api.session_locks import get_session_locks
+from api.admission import get_admission_controller
 from src.multi_agent.graph import build_multi_agent_graph
-from src.config import validate_config
+from src.config import validate_config, SESSION_BACKEND, CHECKPOINTER_BACKEND, TURN_DEADLINE_SECONDS, TURN_DEADLINE_MAX_SECONDS
+from src.infrastructure.deadline import deadline_scope, CONFIG_KEY as DEADLINE_CONFIG_KEY
 from src.utils.langfuse_client import get_langfuse_handler
 from langchain_core.messages import HumanMessage, AIMessage
 
@@ -43,8 +51,14 @@ app.add_middleware(
 # SESSION MANAGEMENT
 # ═══════════════════════════════════════════════════════════════
 
-# V1 sessions (single ReAct agent)
-sessions: Dict[str, MedicalAgent] = {}
+# V1 sessions (single ReAct agent) — in-process or SQLite-backed, see SESSION_BACKEND
+sessions = get_session_store()
+
+# One turn at a time per session; different sessions run in parallel in the threadpool
+session_locks = get_session_locks()
+
+# Bounded concurrency + prioritized wait queue; overflow gets 429/503 with Retry-After
+admission = get_admission_controller()
 
 # The compiled multi-agent graph (singleton)
 multi_agent_graph = None
@@ -58,10 +72,7 @@ def get_multi_agent_graph():
 
 
 def get_or_create_session(session_id: str) -> MedicalAgent:
-    if session_id not in sessions:
-        sessions[session_id] = MedicalAgent(session_id=session_id)
-        logger.info(f"Created new session: {session_id}")
-    return sessions[session_id]
+    return sessions.get_or_create(session_id)
 
 
 class ChatRequest(BaseModel):
@@ -69,6 +80,14 @@ class ChatRequest(BaseModel):
     session_id: str = Field(default="default", description="ID-ul sesiunii")
     user_id: Optional[str] = Field(default=None, description="ID-ul utilizatorului (pentru Langfuse)")
     return_details: bool = Field(default=False, description="Returnează detalii complete (entities, cypher, etc.)")
+    priority: Literal["interactive", "background"] = Field(
+        default="interactive",
+        description="Prioritatea la admitere: 'interactive' (utilizator) sau 'background' (evaluări, joburi)"
+    )
+    timeout_seconds: Optional[float] = Field(
+        default=None, gt=0,
+        description="Bugetul de timp al turei în secunde (implicit TURN_DEADLINE_SECONDS; și prin header X-Request-Timeout)"
+    )
 
     class Config:
         json_schema_extra = {
@@ -147,41 +166,64 @@ async def health_check():
         raise HTTPException(status_code=503, detail=f"Service unhealthy: {str(e)}")
 
 
+def _turn_deadline(request: ChatRequest, header_timeout: Optional[float]) -> float:
+    """Absolute deadline of this turn; the clock starts on arrival, so queueing counts too."""
+    budget = request.timeout_seconds or header_timeout or TURN_DEADLINE_SECONDS
+    return time.time() + min(budget, TURN_DEADLINE_MAX_SECONDS)
+
+
+def _run_v1_turn(request: ChatRequest, deadline: float) -> tuple[str, Optional[Dict[str, Any]]]:
+    """Blocking V1 turn (LLM + Neo4j calls) — runs in the threadpool under the session lock."""
+    with deadline_scope(deadline):
+        return _run_v1_agent(request)
+
+
+def _run_v1_agent(request: ChatRequest) -> tuple[str, Optional[Dict[str, Any]]]:
+    session = get_or_create_session(request.session_id)
+    if request.return_details:
+        result = session.run_medical_query(request.message)
+        details = {
+            "tool_calls": result.get("tool_calls", []),
+            "medications": result.get("medications", []),
+            "symptoms": result.get("symptoms", []),
+            "nutrients": result.get("nutrients", []),
+            "products": result.get("products", []),
+        }
+        response_text = result.get("final_response", "")
+    else:
+        response_text = session.chat(request.message)
+        details = None
+    sessions.record_turn(request.session_id, session)
+    return response_text, details
+
+
 @api_router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, x_request_timeout: Optional[float] = Header(default=None)):
+    deadline = _turn_deadline(request, x_request_timeout)
     try:
-        session = get_or_create_session(request.session_id)
-        if request.return_details:
-            result = session.run_medical_query(request.message)
-            details = {
-                "tool_calls": result.get("tool_calls", []),
-                "medications": result.get("medications", []),
-                "symptoms": result.get("symptoms", []),
-                "nutrients": result.get("nutrients", []),
-                "products": result.get("products", []),
-            }
-            response_text = result.get("final_response", "")
-        else:
-            response_text = session.chat(request.message)
-            details = None
+        async with session_locks.hold(request.session_id), admission.admit(request.priority, deadline):
+            response_text, details = await run_in_threadpool(_run_v1_turn, request, deadline)
         return ChatResponse(
             response=response_text,
             session_id=request.session_id,
             details=details
         )
+    except HTTPException:
+        raise       # admission rejections (429/503 + Retry-After) pass through unchanged
     except Exception as e:
         logger.error(f"Chat error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @api_router.post("/v2/chat", response_model=ChatResponse)
-async def chat_v2(request: ChatRequest):
+async def chat_v2(request: ChatRequest, x_request_timeout: Optional[float] = Header(default=None)):
 
+    deadline = _turn_deadline(request, x_request_timeout)
     try:
         graph = get_multi_agent_graph()
 
-        # Configurare Checkpointer (thread_id)
-        config = {"configurable": {"thread_id": request.session_id}}
+        # Configurare Checkpointer (thread_id) + turn deadline (read by every node, see with_deadline)
+        config = {"configurable": {"thread_id": request.session_id, DEADLINE_CONFIG_KEY: deadline}}
         
         # Configurare Langfuse (Observability)
         langfuse_handler = get_langfuse_handler()
@@ -196,11 +238,17 @@ async def chat_v2(request: ChatRequest):
             # Pasam handler-ul in config-ul Langchain
             config["callbacks"] = [langfuse_handler]
         
-        # Invoke graph with just the latest user message
-        result = graph.invoke(
-            {"messages": [HumanMessage(content=request.message)]},
-            config=config
-        )
+        # Invoke graph with just the latest user message.
+        # Serialized per thread_id so checkpoints of one conversation never interleave — within
+        # this worker process only: the session locks are not shared between uvicorn workers.
+        # The session is held before the admission slot (waiting turns don't occupy slots);
+        # its wait queue is bounded by SESSION_MAX_WAITING_TURNS.
+        async with session_locks.hold(f"v2:{request.session_id}"), admission.admit(request.priority, deadline):
+            result = await run_in_threadpool(
+                graph.invoke,
+                {"messages": [HumanMessage(content=request.message)]},
+                config=config,
+            )
         
         response_text = result.get("final_response", "")
 
@@ -225,6 +273,8 @@ async def chat_v2(request: ChatRequest):
             details=details,
         )
 
+    except HTTPException:
+        raise       # admission rejections (429/503 + Retry-After) pass through unchanged
     except Exception as e:
         logger.error(f"V2 Chat error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -239,10 +289,10 @@ async def chat_v2(request: ChatRequest):
 @api_router.get("/history/{session_id}", response_model=HistoryResponse)
 
 async def get_history(session_id: str):
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
     
-    session = sessions[session_id]
     history = session.get_history()
 
     # Convertește mesajele într-un format serializable
@@ -263,10 +313,13 @@ async def get_history(session_id: str):
 @api_router.delete("/history/{session_id}")
 async def clear_history(session_id: str):
 
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
-    
-    sessions[session_id].clear_history()
+    async with session_locks.hold(session_id):
+        session = sessions.get(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+        
+        session.clear_history()
+        sessions.record_turn(session_id, session)
     logger.info(f"Cleared history for session: {session_id}")
     
     return {"message": f"History cleared for session {session_id}"}
@@ -275,10 +328,10 @@ async def clear_history(session_id: str):
 @api_router.delete("/session/{session_id}")
 async def delete_session(session_id: str):
 
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    async with session_locks.hold(session_id):
+        if not sessions.delete(session_id):
+            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
     
-    del sessions[session_id]
     logger.info(f"Deleted session: {session_id}")
     
     return {"message": f"Session {session_id} deleted"}
@@ -287,18 +340,24 @@ async def delete_session(session_id: str):
 @api_router.get("/sessions")
 async def list_sessions():
 
-    session_info = {}
-    for session_id, session in sessions.items():
-        session_info[session_id] = {
-            "message_count": len(session.get_history())
-        }
+    # Stats are maintained by the store on every turn — no history scan here
+    session_info = sessions.stats()
     
     return {
-        "total_sessions": len(sessions),
+        "total_sessions": len(session_info),
+        "total_approx_bytes": sessions.total_bytes,
         "sessions": session_info
     }
 
 
+@api_router.get("/metrics")
+async def metrics():
+    return {
+        **get_metrics().snapshot(),
+        "session_queues": session_locks.queue_depths(),
+    }
+
+
 # ═══════════════════════════════════════════════════════════════
 # INCLUDE ROUTER
 # ═══════════════════════════════════════════════════════════════
@@ -316,6 +375,11 @@ async def startup_event():
     try:
         validate_config()
         logger.info("Configuration validated")
+        if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 and "memory" in (SESSION_BACKEND, CHECKPOINTER_BACKEND):
+            logger.warning(
+                "Several uvicorn workers with an in-memory session/checkpoint backend: each worker "
+                "only sees its own conversations. Set SESSION_BACKEND=sqlite and CHECKPOINTER_BACKEND=sqlite."
+            )
         logger.info("API is ready to accept requests")
         logger.info("Documentation available at /docs")
         logger.info("API endpoints available at /api/*")
@@ -0,0 +1,100 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import logging
+
+from fastapi import HTTPException
+
+from src.config import SESSION_MAX_WAITING_TURNS
+from src.infrastructure.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+HOLD_TIME_EWMA_ALPHA = 0.2
+
+
+@dataclass
+class _SessionQueue:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    depth: int = 0      # requests holding or waiting for the lock
+
+
+class SessionLockManager:
+    """
+    Serializes turns within a session while different sessions run in parallel.
+
+    One asyncio.Lock per *active* session_id, reference-counted: the entry is created by
+    the first request and dropped when the last one leaves, so idle sessions cost nothing.
+    Lives on the event loop thread — the work done under the lock is expected to be
+    offloaded (run_in_threadpool) so other sessions keep being served.
+
+    The locks are per process: with several uvicorn workers, two turns of one session that
+    land on different workers are not serialized against each other.
+
+    Callers hold the session before taking an admission slot, so at most `max_waiting`
+    turns may wait behind the running one; further turns of that session get a 429 with a
+    Retry-After instead of queuing without bound.
+    """
+
+    def __init__(self, max_waiting: int = SESSION_MAX_WAITING_TURNS):
+        self.max_waiting = max(0, max_waiting)
+        self._queues: dict[str, _SessionQueue] = {}
+        self._avg_hold_seconds = 5.0
+        self._metrics = get_metrics()
+
+    @asynccontextmanager
+    async def hold(self, session_id: str):
+        queue = self._queues.get(session_id)
+        if queue is not None and queue.depth > self.max_waiting:
+            self._reject(session_id, queue)
+        if queue is None:
+            queue = self._queues[session_id] = _SessionQueue()
+        queue.depth += 1
+        self._metrics.observe("session_queue_depth", queue.depth)
+        self._metrics.set_gauge("session_queues_active", len(self._queues))
+
+        started = time.perf_counter()
+        try:
+            async with queue.lock:
+                waited = time.perf_counter() - started
+                self._metrics.observe("session_lock_wait_seconds", waited)
+                if waited > 1.0:
+                    logger.info(f"Session {session_id} waited {waited:.2f}s for a previous turn (depth {queue.depth})")
+                try:
+                    yield
+                finally:
+                    held = time.perf_counter() - started - waited
+                    self._avg_hold_seconds += HOLD_TIME_EWMA_ALPHA * (held - self._avg_hold_seconds)
+        finally:
+            queue.depth -= 1
+            if queue.depth == 0:
+                del self._queues[session_id]
+            self._metrics.set_gauge("session_queues_active", len(self._queues))
+
+    def _reject(self, session_id: str, queue: _SessionQueue):
+        # Every turn ahead of this one (running + waiting) must finish first
+        retry_after = max(1, math.ceil(queue.depth * self._avg_hold_seconds))
+        self._metrics.incr("session_lock_rejected_total")
+        logger.warning(f"Session {session_id} rejected: {queue.depth} turn(s) already in flight, retry after {retry_after}s")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests in flight for this session",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    def queue_depths(self) -> dict[str, int]:
+        """Sessions with at least one request in flight -> requests holding or waiting."""
+        return {session_id: queue.depth for session_id, queue in self._queues.items()}
+
+
+_session_locks_instance: SessionLockManager | None = None
+
+
+def get_session_locks() -> SessionLockManager:
+    global _session_locks_instance
+    if _session_locks_instance is None:
+        _session_locks_instance = SessionLockManager()
+    return _session_locks_instance
@@ -0,0 +1,427 @@
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import logging
+
+from src.agent.session import MedicalAgent
+from src.agent.state import ConversationState
+from src.config import (
+    SESSION_BACKEND,
+    SESSION_DB_PATH,
+    SESSION_MAX_SESSIONS,
+    SESSION_IDLE_TTL_SECONDS,
+    SESSION_MAX_TOTAL_BYTES,
+)
+from src.infrastructure.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+SESSION_BASE_BYTES = 2048       # MedicalAgent + ConversationState + PromptBuilder objects
+MESSAGE_OVERHEAD_BYTES = 400    # BaseMessage object + metadata dicts
+
+
+@dataclass
+class SessionEntry:
+    agent: MedicalAgent
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    message_count: int = 0
+    approx_bytes: int = SESSION_BASE_BYTES
+
+
+def estimate_session_bytes(agent: MedicalAgent) -> int:
+    """Rough memory footprint of a V1 session: history text + entity lists + fixed overhead."""
+    state = agent.session_state
+    history_bytes = sum(len(str(m.content)) + MESSAGE_OVERHEAD_BYTES for m in state.history)
+    entity_bytes = sum(
+        len(e) + 50
+        for entities in (state.medications, state.symptoms, state.nutrients, state.products)
+        for e in entities
+    )
+    return SESSION_BASE_BYTES + history_bytes + entity_bytes
+
+
+class BaseSessionStore(ABC):
+    """
+    V1 session store: session_id -> MedicalAgent.
+
+    Callers must hand the agent back with `record_turn` after every change to its
+    history / entities — persistent backends rebuild the agent on each `get`.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> MedicalAgent | None: ...
+
+    @abstractmethod
+    def get_or_create(self, session_id: str, factory: Callable[[str], MedicalAgent] = MedicalAgent) -> MedicalAgent: ...
+
+    @abstractmethod
+    def record_turn(self, session_id: str, agent: MedicalAgent): ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool: ...
+
+    @abstractmethod
+    def stats(self) -> dict[str, dict]: ...
+
+    @property
+    @abstractmethod
+    def total_bytes(self) -> int: ...
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def __len__(self) -> int:
+        return len(self.stats())
+
+
+class InMemorySessionStore(BaseSessionStore):
+    """
+    Bounded in-process V1 session store.
+
+    The OrderedDict is kept in access order (least recently used first), so every
+    operation is O(1) amortized:
+      - idle_ttl: sessions idle longer than `idle_ttl_seconds` sit at the front and are
+                  popped lazily on each access
+      - capacity: beyond `max_sessions`, the least recently used session is evicted
+      - memory:   beyond `max_total_bytes` (approximate), LRU sessions are evicted
+    Per-session stats (message count, bytes) are refreshed by `record_turn` after each
+    chat, so listing sessions never walks conversation histories.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = SESSION_MAX_SESSIONS,
+        idle_ttl_seconds: float = SESSION_IDLE_TTL_SECONDS,
+        max_total_bytes: int = SESSION_MAX_TOTAL_BYTES,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_total_bytes = max_total_bytes
+        self._entries: OrderedDict[str, SessionEntry] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._metrics = get_metrics()
+
+    # ── Lookup ───────────────────────────────────────────────────────────────
+
+    def get(self, session_id: str) -> MedicalAgent | None:
+        with self._lock:
+            self._evict_expired()
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            self._touch(session_id, entry)
+            return entry.agent
+
+    def get_or_create(self, session_id: str, factory: Callable[[str], MedicalAgent] = MedicalAgent) -> MedicalAgent:
+        with self._lock:
+            agent = self.get(session_id)
+            if agent is not None:
+                return agent
+
+            entry = SessionEntry(agent=factory(session_id=session_id))
+            self._entries[session_id] = entry
+            self._total_bytes += entry.approx_bytes
+            self._metrics.incr("sessions_created_total")
+            logger.info(f"Created new session: {session_id}")
+
+            self._enforce_limits(keep=session_id)
+            self._publish_gauges()
+            return entry.agent
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict_expired()
+            return len(self._entries)
+
+    # ── Updates ──────────────────────────────────────────────────────────────
+
+    def record_turn(self, session_id: str, agent: MedicalAgent):
+        """Refresh the stats of a session after its history / entities changed."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return
+            entry.agent = agent
+            new_bytes = estimate_session_bytes(entry.agent)
+            self._total_bytes += new_bytes - entry.approx_bytes
+            entry.approx_bytes = new_bytes
+            entry.message_count = len(entry.agent.session_state.history)
+            self._touch(session_id, entry)
+
+            self._enforce_limits(keep=session_id)
+            self._publish_gauges()
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id not in self._entries:
+                return False
+            self._evict(session_id, reason="deleted")
+            return True
+
+    # ── Introspection ────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, dict]:
+        now = time.time()
+        with self._lock:
+            self._evict_expired()
+            return {
+                session_id: {
+                    "message_count": entry.message_count,
+                    "approx_bytes": entry.approx_bytes,
+                    "idle_seconds": round(now - entry.last_access, 1),
+                }
+                for session_id, entry in self._entries.items()
+            }
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    # ── Eviction ─────────────────────────────────────────────────────────────
+
+    def _touch(self, session_id: str, entry: SessionEntry):
+        entry.last_access = time.time()
+        self._entries.move_to_end(session_id)
+
+    def _evict_expired(self):
+        if self.idle_ttl_seconds <= 0:
+            return
+        cutoff = time.time() - self.idle_ttl_seconds
+        while self._entries:
+            session_id, entry = next(iter(self._entries.items()))
+            if entry.last_access > cutoff:
+                break
+            self._evict(session_id, reason="idle_ttl")
+
+    def _enforce_limits(self, keep: str):
+        """Evict LRU sessions until both limits hold. The session in use is never evicted."""
+        while len(self._entries) > max(1, self.max_sessions):
+            self._evict(self._oldest_except(keep), reason="capacity")
+        while self._total_bytes > self.max_total_bytes and len(self._entries) > 1:
+            self._evict(self._oldest_except(keep), reason="memory")
+
+    def _oldest_except(self, keep: str) -> str:
+        for session_id in self._entries:
+            if session_id != keep:
+                return session_id
+        return keep
+
+    def _evict(self, session_id: str, reason: str):
+        entry = self._entries.pop(session_id)
+        self._total_bytes -= entry.approx_bytes
+        self._metrics.incr("sessions_evicted_total", reason=reason)
+        logger.info(f"Session {session_id} evicted ({reason}), ~{entry.approx_bytes} bytes, {entry.message_count} messages")
+        self._publish_gauges()
+
+    def _publish_gauges(self):
+        self._metrics.set_gauge("sessions_active", len(self._entries))
+        self._metrics.set_gauge("sessions_memory_bytes", self._total_bytes)
+
+
+SESSIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    approx_bytes INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access);
+"""
+
+
+class SqliteSessionStore(BaseSessionStore):
+    """
+    V1 session store in a WAL-mode SQLite file, shared by every uvicorn worker on the host.
+
+    Each `get` rebuilds the MedicalAgent from the stored ConversationState; `record_turn`
+    writes it back. Idle TTL and max-session limits are enforced in SQL (oldest
+    last_access first); there is no memory budget since sessions live on disk.
+    Concurrent turns of one session in different processes are last-write-wins.
+    """
+
+    def __init__(
+        self,
+        db_path: str = SESSION_DB_PATH,
+        max_sessions: int = SESSION_MAX_SESSIONS,
+        idle_ttl_seconds: float = SESSION_IDLE_TTL_SECONDS,
+        busy_timeout_ms: int = 5000,
+    ):
+        self.db_path = db_path
+        self.max_sessions = max(1, max_sessions)
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._metrics = get_metrics()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None -> we control transactions explicitly (BEGIN IMMEDIATE)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self.conn.executescript(SESSIONS_SCHEMA)
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def _transaction(self):
+        with self.lock:
+            cur = self.conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                yield cur
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            finally:
+                cur.close()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # ── Lookup ───────────────────────────────────────────────────────────────
+
+    def get(self, session_id: str) -> MedicalAgent | None:
+        now = time.time()
+        with self._transaction() as cur:
+            row = cur.execute(
+                "SELECT state, last_access FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1], now):
+                cur.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                self._metrics.incr("sessions_evicted_total", reason="idle_ttl")
+                return None
+            cur.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (now, session_id))
+        return self._to_agent(session_id, row[0])
+
+    def get_or_create(self, session_id: str, factory: Callable[[str], MedicalAgent] = MedicalAgent) -> MedicalAgent:
+        agent = self.get(session_id)
+        if agent is not None:
+            return agent
+
+        agent = factory(session_id=session_id)
+        now = time.time()
+        with self._transaction() as cur:
+            # Another worker may have created it in the meantime: keep theirs
+            cur.execute(
+                "INSERT OR IGNORE INTO sessions (session_id, state, approx_bytes, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (session_id, json.dumps(agent.session_state.to_dict()), estimate_session_bytes(agent), now, now),
+            )
+            created = cur.rowcount == 1
+            if created:
+                self._enforce_limits(cur, keep=session_id, now=now)
+        if created:
+            self._metrics.incr("sessions_created_total")
+            logger.info(f"Created new session: {session_id}")
+            return agent
+        return self.get(session_id) or agent
+
+    # ── Updates ──────────────────────────────────────────────────────────────
+
+    def record_turn(self, session_id: str, agent: MedicalAgent):
+        now = time.time()
+        state = json.dumps(agent.session_state.to_dict())
+        with self._transaction() as cur:
+            cur.execute(
+                "INSERT INTO sessions (session_id, state, message_count, approx_bytes, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET state = excluded.state, "
+                "message_count = excluded.message_count, approx_bytes = excluded.approx_bytes, "
+                "last_access = excluded.last_access",
+                (session_id, state, len(agent.session_state.history), estimate_session_bytes(agent), now, now),
+            )
+
+    def delete(self, session_id: str) -> bool:
+        with self._transaction() as cur:
+            cur.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            deleted = cur.rowcount == 1
+        if deleted:
+            self._metrics.incr("sessions_evicted_total", reason="deleted")
+        return deleted
+
+    # ── Introspection ────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, dict]:
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT session_id, message_count, approx_bytes, last_access FROM sessions "
+                "WHERE last_access > ? ORDER BY last_access",
+                (self._cutoff(now),),
+            ).fetchall()
+        return {
+            session_id: {
+                "message_count": message_count,
+                "approx_bytes": approx_bytes,
+                "idle_seconds": round(now - last_access, 1),
+            }
+            for session_id, message_count, approx_bytes, last_access in rows
+        }
+
+    @property
+    def total_bytes(self) -> int:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT COALESCE(SUM(approx_bytes), 0) FROM sessions WHERE last_access > ?",
+                (self._cutoff(time.time()),),
+            ).fetchone()
+        return row[0]
+
+    # ── Eviction ─────────────────────────────────────────────────────────────
+
+    def _cutoff(self, now: float) -> float:
+        return now - self.idle_ttl_seconds if self.idle_ttl_seconds > 0 else 0.0
+
+    def _expired(self, last_access: float, now: float) -> bool:
+        return self.idle_ttl_seconds > 0 and last_access <= self._cutoff(now)
+
+    def _enforce_limits(self, cur: sqlite3.Cursor, keep: str, now: float):
+        """Runs on session creation only: drop idle sessions, then the LRU ones over capacity."""
+        cur.execute("DELETE FROM sessions WHERE last_access <= ?", (self._cutoff(now),))
+        if cur.rowcount > 0:
+            self._metrics.incr("sessions_evicted_total", cur.rowcount, reason="idle_ttl")
+
+        count = cur.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        if count > self.max_sessions:
+            cur.execute(
+                "DELETE FROM sessions WHERE session_id IN ("
+                "SELECT session_id FROM sessions WHERE session_id != ? ORDER BY last_access LIMIT ?)",
+                (keep, count - self.max_sessions),
+            )
+            self._metrics.incr("sessions_evicted_total", cur.rowcount, reason="capacity")
+
+    def _to_agent(self, session_id: str, state_json: str) -> MedicalAgent:
+        agent = MedicalAgent(session_id=session_id)
+        agent.session_state = ConversationState.from_dict(json.loads(state_json))
+        return agent
+
+
+_session_store_instance: BaseSessionStore | None = None
+
+
+def get_session_store() -> BaseSessionStore:
+    """Build the store selected by SESSION_BACKEND ('memory' or 'sqlite')."""
+    global _session_store_instance
+    if _session_store_instance is None:
+        if SESSION_BACKEND == "sqlite":
+            logger.info(f"Using SQLite session store at '{SESSION_DB_PATH}'")
+            _session_store_instance = SqliteSessionStore()
+        else:
+            if SESSION_BACKEND != "memory":
+                logger.warning(f"Unknown SESSION_BACKEND '{SESSION_BACKEND}', falling back to memory")
+            _session_store_instance = InMemorySessionStore()
+    return _session_store_instance
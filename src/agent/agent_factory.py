@@ -1,4 +1,4 @@
-from src.utils.get_llm import get_llm_4_1_mini
+from src.infrastructure.llm_client import get_llm_4_1_mini
 from src.agent.tools import get_tools
 from langgraph.prebuilt import create_react_agent
 
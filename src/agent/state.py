@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, messages_to_dict, messages_from_dict
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ENTITY TYPES
@@ -70,6 +70,27 @@ class ConversationState:
        
         return "\n".join(context)
 
+    def to_dict(self) -> dict:
+        """JSON-serializable snapshot, used by the persistent session stores."""
+        return {
+            "session_id": self.session_id,
+            "history": messages_to_dict(self.history),
+            "medications": self.medications,
+            "symptoms": self.symptoms,
+            "nutrients": self.nutrients,
+            "products": self.products,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConversationState":
+        state = cls(data.get("session_id"))
+        state.history = messages_from_dict(data.get("history", []))
+        state.medications = list(data.get("medications", []))
+        state.symptoms = list(data.get("symptoms", []))
+        state.nutrients = list(data.get("nutrients", []))
+        state.products = list(data.get("products", []))
+        return state
+
     def clear_history(self):
         self.history = []
         self.medications = []
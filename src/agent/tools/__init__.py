@@ -5,6 +5,7 @@ All tools are registered here and exposed via get_tools().
 """
 
 from src.agent.tools.medication_tool import medication_lookup
+from src.agent.tools.medication_overlap_tool import medication_overlap
 from src.agent.tools.symptom_investigation_tool import symptom_investigation
 from src.agent.tools.connection_validation_tool import connection_validation
 from src.agent.tools.nutrient_tool import nutrient_lookup
@@ -18,6 +19,7 @@ def get_tools():
     return [
         # Medical Knowledge (graph relationships)
         medication_lookup,
+        medication_overlap,
         symptom_investigation,
         connection_validation,
         nutrient_lookup,
@@ -30,6 +32,7 @@ def get_tools():
 __all__ = [
     "get_tools",
     "medication_lookup",
+    "medication_overlap",
     "symptom_investigation",
     "connection_validation",
     "nutrient_lookup",
@@ -46,7 +46,8 @@ def connection_validation(medication: str, symptom: str) -> str:
     logger.info(f"Symptom lookup for '{symptom}' resolved to '{resolved_sym.resolved_name}' (method: {resolved_sym.match_method})")
     results = neo4j.run_safe_query(
         CypherQueries.CONNECTION_VALIDATION,
-        {"medications": [resolved_med.resolved_name], "symptoms": [resolved_sym.resolved_name]}
+        {"medications": [resolved_med.resolved_name], "symptoms": [resolved_sym.resolved_name]},
+        cache_name="CONNECTION_VALIDATION",
     )
    
     if isinstance(results, str) and "ERROR" in results:
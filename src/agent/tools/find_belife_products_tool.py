@@ -2,14 +2,18 @@
 Consolidated product discovery tool — replaces product_recommendation,
 product_recommendation_flexible, and product_search.
 
-Uses vector embeddings for cross-language semantic search,
-with keyword fallback for exact ingredient matches.
+Uses vector embeddings for cross-language semantic search and keyword matching for exact
+ingredient matches: run concurrently and rank-fused (PRODUCT_SEARCH_MODE="hybrid"), or
+keyword only as a fallback after a vector miss ("cascade").
 """
 from langchain_core.tools import tool
 import json
 import logging
 from src.database.neo4j_client import get_neo4j_client
 from src.database.cypher_queries import CypherQueries
+from src.config import PRODUCT_SEARCH_MODE
+from src.repositories.product_keyword_index import get_product_keyword_index
+from src.repositories.hybrid_product_search import hybrid_search_products
 from src.services.embeddings_service import get_embeddings
 from src.services.results_formatter import clean_results
 
@@ -41,6 +45,20 @@ def find_belife_products(query: str) -> str:
     neo4j = get_neo4j_client()
     
     logger.info(f"find_belife_products: '{query}'")
+
+    if PRODUCT_SEARCH_MODE == "hybrid":
+        try:
+            results = hybrid_search_products(query)
+            if not _is_error(results):
+                cleaned = clean_results(results)
+                if cleaned:
+                    logger.info(f"Hybrid search found {len(cleaned)} products for '{query}'")
+                    return json.dumps(cleaned, indent=2, ensure_ascii=False)
+            else:
+                logger.warning(f"Hybrid search failed for '{query}': {results}")
+        except Exception as e:
+            logger.warning(f"Hybrid search failed for '{query}': {e}")
+        return _not_found(query)
     
     # Strategy 1: Vector search (cross-language, semantic)
     embedding = get_embeddings(query)
@@ -58,13 +76,10 @@ def find_belife_products(query: str) -> str:
         except Exception as e:
             logger.warning(f"Vector search failed for '{query}': {e}")
     
-    # Strategy 2: Keyword fallback (exact ingredient/name match)
+    # Strategy 2: Keyword fallback (exact ingredient/name match, in-process inverted index)
     logger.info(f"Vector miss, trying keyword for '{query}'")
     try:
-        results = neo4j.run_safe_query(
-            CypherQueries.PRODUCT_KEYWORD_SEARCH,
-            {"keywords": [query]}
-        )
+        results = get_product_keyword_index().search([query])
         if not _is_error(results):
             cleaned = clean_results(results)
             if cleaned:
@@ -73,6 +88,10 @@ def find_belife_products(query: str) -> str:
     except Exception as e:
         logger.warning(f"Keyword search failed for '{query}': {e}")
     
+    return _not_found(query)
+
+
+def _not_found(query: str) -> str:
     return json.dumps({
         "error": False,
         "message": f"I couldn't find BeLife products matching '{query}' in my database. Try different keywords or ask to browse the catalog.",
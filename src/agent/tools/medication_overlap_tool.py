@@ -0,0 +1,40 @@
+import json
+import logging
+from langchain_core.tools import tool
+from src.services import get_medication_service
+ 
+logger = logging.getLogger(__name__)
+ 
+@tool
+def medication_overlap(medications: list[str]) -> str:
+    """
+    Finds the nutrients depleted by more than one of the user's medications.
+    Returns the shared nutrients ranked by how many medications deplete them (with the
+    deficiency symptoms), the medication pairs that overlap, and the overlap matrix.
+    Use when the user takes several medications.
+   
+    Args:
+        medications: All the medications the user takes (e.g., ["Metformin", "Omeprazole"])
+    """
+
+    medication_service = get_medication_service()
+    results = medication_service.get_medication_overlap(medications)
+
+    if results.is_success:
+        return json.dumps(results.data[0], indent=2, ensure_ascii=False)
+
+    if results.is_error:
+        return json.dumps({
+            "error": True,
+            "message": "A database error occurred while comparing the medications. Please try again later.",
+            "medications_searched": medications,
+        }, ensure_ascii=False)
+
+    return json.dumps({
+        "error": False,
+        "message": (
+            "At least two medications must be found in the knowledge graph to compare them. "
+            f"Found: {results.entity_found or 'none'}. Check the spelling of the others."
+        ),
+        "medications_searched": medications,
+    }, ensure_ascii=False)
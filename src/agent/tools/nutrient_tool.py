@@ -32,7 +32,8 @@ def nutrient_lookup(nutrient: str) -> str:
    
     results = neo4j.run_safe_query(
         CypherQueries.NUTRIENT_LOOKUP,
-        {"nutrients": [resolved.resolved_name]}
+        {"nutrients": [resolved.resolved_name]},
+        cache_name="NUTRIENT_LOOKUP",
     )
    
     if isinstance(results, str) and "ERROR" in results:
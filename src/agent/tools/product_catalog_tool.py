@@ -1,8 +1,7 @@
 from langchain_core.tools import tool
 import json
 import logging
-from src.database.neo4j_client import get_neo4j_client
-from src.database.cypher_queries import CypherQueries
+from src.repositories.product_catalog import get_product_catalog
 from src.services.results_formatter import clean_results
 
 logger = logging.getLogger(__name__)
@@ -18,23 +17,19 @@ def product_catalog(category: str = "") -> str:
         category: Optional category filter (e.g., 'vitamin', 'mineral', 'energy', 'immunity').
                   Leave empty to list all categories.
     """
-    neo4j = get_neo4j_client()
-    
     logger.info(f"Product catalog browse, category='{category}'")
     
-    results = neo4j.run_safe_query(
-        CypherQueries.PRODUCT_CATALOG,
-        {"category": category}
-    )
+    # Served from the in-memory catalog snapshot (refreshed when the graph version changes)
+    snapshot = get_product_catalog().snapshot()
     
-    if isinstance(results, str) and "ERROR" in results:
-        logger.error(f"Database error during product catalog browse: {results}")
+    if isinstance(snapshot, str):
+        logger.error(f"Database error during product catalog browse: {snapshot}")
         return json.dumps({
             "error": True,
             "message": "I encountered a technical issue browsing products. Please try again."
         }, ensure_ascii=False)
     
-    cleaned = clean_results(results)
+    cleaned = clean_results(snapshot.browse(category))
     if not cleaned:
         if category:
             return json.dumps({
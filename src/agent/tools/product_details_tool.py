@@ -2,7 +2,7 @@ from langchain_core.tools import tool
 import json
 import logging
 from src.database.neo4j_client import get_neo4j_client
-from src.database.cypher_queries import CypherQueries
+from src.repositories.product_catalog import get_product_catalog
 from src.services.results_formatter import clean_results
 
 logger = logging.getLogger(__name__)
@@ -45,21 +45,18 @@ def product_details(product_name: str) -> str:
     
     logger.info(f"Product details lookup for: '{product_name}'")
     
-    # Strategy 1: Exact match + CONTAINS (fast, precise)
-    results = neo4j.run_safe_query(
-        CypherQueries.PRODUCT_DETAILS,
-        {"product_name": product_name}
-    )
+    # Strategy 1: Exact / normalized / name-token match on the in-memory catalog snapshot
+    snapshot = get_product_catalog().snapshot()
     
-    if not _is_error(results):
-        cleaned = clean_results(results)
+    if not _is_error(snapshot):
+        cleaned = clean_results(snapshot.details(product_name))
         if cleaned:
             found_name = _extract_name(cleaned)
-            logger.info(f"Product details found (exact/contains): '{found_name}'")
+            logger.info(f"Product details found (catalog): '{found_name}'")
             return json.dumps(cleaned, indent=2, ensure_ascii=False)
     
     # Strategy 2: Fulltext fuzzy match (handles typos, spacing)
-    logger.info(f"Exact/CONTAINS miss for '{product_name}', trying fulltext")
+    logger.info(f"Catalog miss for '{product_name}', trying fulltext")
     try:
         results = neo4j.run_safe_query(
             PRODUCT_DETAILS_FULLTEXT,
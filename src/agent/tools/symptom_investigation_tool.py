@@ -3,6 +3,7 @@ import json
 import logging
 from src.database.neo4j_client import get_neo4j_client
 from src.database.cypher_queries import CypherQueries
+from src.config import SYMPTOM_CAUSES_PAGE_SIZE
 from src.services.results_formatter import clean_results
 from src.services.entity_resolver import get_entity_resolver
  
@@ -34,7 +35,8 @@ def symptom_investigation(symptom: str) -> str:
    
     results = neo4j.run_safe_query(
         CypherQueries.SYMPTOM_INVESTIGATION,
-        {"symptom": resolved.resolved_name}
+        {"symptom": resolved.resolved_name, "offset": 0, "limit": SYMPTOM_CAUSES_PAGE_SIZE},
+        cache_name="SYMPTOM_INVESTIGATION",
     )
    
     if isinstance(results, str) and "ERROR" in results:
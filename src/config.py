@@ -13,6 +13,12 @@ AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
 OPENAI_API_VERSION = os.getenv("OPENAI_API_VERSION")
 AZURE_DEPLOYMENT_NAME = os.getenv("AZURE_DEPLOYMENT_NAME")
 AZURE_EMBEDDINGS_DEPLOYMENT_NAME = os.getenv("AZURE_EMBEDDINGS_DEPLOYMENT_NAME")
+# Client-side quota pacing per deployment (0 = unlimited); split evenly across uvicorn workers
+AZURE_CHAT_TPM = int(os.getenv("AZURE_CHAT_TPM", "0"))
+AZURE_CHAT_RPM = int(os.getenv("AZURE_CHAT_RPM", "0"))
+AZURE_EMBEDDINGS_TPM = int(os.getenv("AZURE_EMBEDDINGS_TPM", "0"))
+AZURE_EMBEDDINGS_RPM = int(os.getenv("AZURE_EMBEDDINGS_RPM", "0"))
+LLM_COMPLETION_TOKEN_ESTIMATE = 500        # expected output tokens when max_tokens is not set
 # ═══════════════════════════════════════════════════════════════════════════════
 # NEO4J CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -22,6 +28,92 @@ NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 LLM_READER_USER = os.getenv("LLM_READER_USER")
 LLM_READER_PASSWORD = os.getenv("LLM_READER_PASSWORD")
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# V1 SESSION STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+SESSION_IDLE_TTL_SECONDS = int(os.getenv("SESSION_IDLE_TTL_SECONDS", "3600"))          # 0 disables idle eviction
+SESSION_MAX_TOTAL_BYTES = int(os.getenv("SESSION_MAX_TOTAL_BYTES", str(256 * 1024 * 1024)))  # approximate
+# "memory" keeps sessions in the worker process; "sqlite" shares them between all uvicorn workers
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory").lower()
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "data/sessions.sqlite")
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ADMISSION CONTROL (chat endpoints, per worker process)
+# ═══════════════════════════════════════════════════════════════════════════════
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", "8"))          # turns running at once
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))                   # waiting turns before 429
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))  # then 503
+SESSION_MAX_WAITING_TURNS = int(os.getenv("SESSION_MAX_WAITING_TURNS", "2"))       # per session, behind the running turn; then 429
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TURN DEADLINE
+# ═══════════════════════════════════════════════════════════════════════════════
+TURN_DEADLINE_SECONDS = float(os.getenv("TURN_DEADLINE_SECONDS", "45"))               # default per-request budget
+TURN_DEADLINE_MAX_SECONDS = float(os.getenv("TURN_DEADLINE_MAX_SECONDS", "120"))       # cap for client-requested budgets
+DEADLINE_RESPOND_THRESHOLD_SECONDS = float(os.getenv("DEADLINE_RESPOND_THRESHOLD_SECONDS", "10"))  # supervisor -> synthesis
+DEADLINE_LLM_MIN_TIMEOUT_SECONDS = 5.0
+DEADLINE_LLM_RETRY_MIN_SECONDS = 15.0
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MULTI-AGENT CHECKPOINTING
+# ═══════════════════════════════════════════════════════════════════════════════
+# "memory" keeps the graph state in process (lost on restart, not shared between workers)
+# "sqlite" persists it to a WAL-mode SQLite file that every worker on the host can open
+CHECKPOINTER_BACKEND = os.getenv("CHECKPOINTER_BACKEND", "memory").lower()
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "data/checkpoints.sqlite")
+CHECKPOINT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", "20"))          # checkpoints kept per thread
+CHECKPOINT_PRUNE_EVERY = int(os.getenv("CHECKPOINT_PRUNE_EVERY", "10"))      # prune a thread every N puts
+CHECKPOINT_COMPRESS_MIN_BYTES = int(os.getenv("CHECKPOINT_COMPRESS_MIN_BYTES", "512"))
+
+# Conversation history kept in the v2 state: a recent window + a rolling summary of older turns.
+# The LLMs see the same window (plus the summary), so no message is in neither.
+MAX_HISTORY_MESSAGES = int(os.getenv("MAX_HISTORY_MESSAGES", "10"))
+HISTORY_SUMMARY_MAX_CHARS = int(os.getenv("HISTORY_SUMMARY_MAX_CHARS", "1500"))
+PROMPT_HISTORY_MESSAGES = MAX_HISTORY_MESSAGES                               # recent messages shown to the LLMs
+
+# Token budgets for the whole prompt (system template + context + evidence + history)
+SUPERVISOR_PROMPT_TOKEN_BUDGET = int(os.getenv("SUPERVISOR_PROMPT_TOKEN_BUDGET", "6000"))
+SYNTHESIS_PROMPT_TOKEN_BUDGET = int(os.getenv("SYNTHESIS_PROMPT_TOKEN_BUDGET", "8000"))
+
+# Synthesis: "llm" (template only if the LLM fails), "template" (template whenever the turn is
+# data-only and covered), "auto" (template when covered AND the LLM is slow/failing or time is short)
+SYNTHESIS_MODE = os.getenv("SYNTHESIS_MODE", "llm").lower()
+SYNTHESIS_SLOW_SECONDS = float(os.getenv("SYNTHESIS_SLOW_SECONDS", "8"))
+SYNTHESIS_PROBE_SECONDS = float(os.getenv("SYNTHESIS_PROBE_SECONDS", "30"))     # "auto": retry a degraded LLM this often
+SYNTHESIS_TEMPLATE_MIN_REMAINING_SECONDS = 6.0
+
+# Per-session cache of worker results (worker, entity, query type), kept across turns
+KNOWLEDGE_CACHE_MAX_ENTRIES = int(os.getenv("KNOWLEDGE_CACHE_MAX_ENTRIES", "32"))
+
+# Cross-session cache of final answers to self-contained questions (see multi_agent/answer_cache.py)
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))     # >= 1.0 disables near-duplicate matching
+GRAPH_VERSION_CHECK_SECONDS = float(os.getenv("GRAPH_VERSION_CHECK_SECONDS", "5"))
+
+# Named read-query result cache in Neo4jManager, invalidated by the graph version stamp
+QUERY_CACHE_ENABLED = os.getenv("QUERY_CACHE_ENABLED", "true").lower() == "true"
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "2048"))
+
+# Product search: "hybrid" (vector + keyword concurrently, reciprocal-rank fusion) or
+# "cascade" (vector first, keyword only on a miss)
+PRODUCT_SEARCH_MODE = os.getenv("PRODUCT_SEARCH_MODE", "hybrid").lower()
+PRODUCT_SEARCH_TOP_K = 5
+PRODUCT_SEARCH_RRF_K = 60
+
+# Causes returned per SYMPTOM_INVESTIGATION page (ranked by supporting depletion events)
+SYMPTOM_CAUSES_PAGE_SIZE = int(os.getenv("SYMPTOM_CAUSES_PAGE_SIZE", "10"))
+
+# Answer the medical lookups (medication, symptom, connection, nutrient) from an in-process
+# projection of the graph (see infrastructure/kg_projection.py) instead of Neo4j
+KG_PROJECTION_ENABLED = os.getenv("KG_PROJECTION_ENABLED", "false").lower() == "true"
+# Published projection snapshot, memory-mapped by every worker on the host ("" = each worker loads its own)
+KG_SNAPSHOT_PATH = os.getenv("KG_SNAPSHOT_PATH", "data/kg_snapshot.bin")
+# First retry delay after a failed projection load (doubles on each further failure)
+KG_PROJECTION_RETRY_SECONDS = float(os.getenv("KG_PROJECTION_RETRY_SECONDS", "5"))
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # VALIDATION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1,48 +1,6 @@
 class CypherQueries:
     """Predefined Cypher queries for different retrieval types."""
 
-    PRODUCT_KEYWORD_SEARCH = """
-    // Search for products by keyword in name, description, ingredients, or benefit
-    // Searches enriched properties: ingredients_text, ingredient_names, marketing_text
-    
-    UNWIND $keywords AS keyword
-    
-    MATCH (product:BeLifeProduct)
-    WHERE toLower(product.name) CONTAINS toLower(keyword)
-       OR toLower(product.scientific_description) CONTAINS toLower(keyword)
-       OR toLower(product.target_benefit) CONTAINS toLower(keyword)
-       OR toLower(COALESCE(product.ingredients_text, "")) CONTAINS toLower(keyword)
-       OR ANY(ing IN COALESCE(product.ingredient_names, []) WHERE toLower(ing) CONTAINS toLower(keyword))
-       OR toLower(COALESCE(product.marketing_text, "")) CONTAINS toLower(keyword)
-    
-    // Collect all nutrients in the product for context
-    OPTIONAL MATCH (product)-[r:CONTAINS]->(nut:Nutrient)
-    WITH product, keyword,
-         collect(DISTINCT {
-             name: nut.name,
-             amount: r.amount,
-             unit: r.unit
-         }) AS all_product_nutrients
-    
-    RETURN {
-        recommended_product: {
-            name: product.name,
-            primary_category: product.primary_category,
-            target_benefit: product.target_benefit,
-            scientific_description: product.scientific_description,
-            dosage_per_day: product.dosage_per_day,
-            dosage_timing: product.dosage_timing,
-            precautions: product.precautions,
-            ingredients_summary: product.ingredients_text
-        },
-        search_method: "keyword_match",
-        matched_keyword: keyword,
-        all_nutrients_in_product: all_product_nutrients[0..10]
-    } AS recommendation
-    
-    LIMIT 5
-"""
-
     PRODUCT_FULLTEXT_SEARCH = """
     // Fulltext search on BeLifeProduct nodes (requires product_full_search index)
     // Uses scoring for better relevance ranking
@@ -112,52 +70,6 @@ class CypherQueries:
 
 
 
-    PRODUCT_CATALOG = """
-    // Browse products - optionally filtered by category
-    WITH $category AS cat_filter
-    
-    MATCH (product:BeLifeProduct)
-    WHERE cat_filter = "" OR toLower(product.primary_category) CONTAINS toLower(cat_filter)
-       OR toLower(product.target_benefit) CONTAINS toLower(cat_filter)
-    
-    RETURN {
-        product: {
-            name: product.name,
-            primary_category: product.primary_category,
-            target_benefit: product.target_benefit,
-            scientific_description: product.scientific_description,
-            dosage_per_day: product.dosage_per_day,
-            ingredients_summary: product.ingredients_text
-        }
-    } AS catalog_entry
-    
-    ORDER BY product.primary_category, product.name
-    LIMIT 20
-"""
-   
-    PRODUCT_DETAILS = """
-    MATCH (product:BeLifeProduct)
-    WHERE toLower(product.name) = toLower($product_name)
-       OR toLower(product.name) CONTAINS toLower($product_name)
-    
-    RETURN {
-        name: product.name,
-        primary_category: product.primary_category,
-        target_benefit: product.target_benefit,
-        scientific_description: product.scientific_description,
-        dosage_per_day: product.dosage_per_day,
-        dosage_timing: product.dosage_timing,
-        precautions: product.precautions,
-        marketing_claims: product.marketing_claims,
-        ingredients_summary: product.ingredients_text,
-        ingredient_names: product.ingredient_names,
-        interactions: product.interactions_text
-    } AS product_details
-    ORDER BY CASE WHEN toLower(product.name) = toLower($product_name) THEN 0 ELSE 1 END
-    LIMIT 1
-"""
-
-   
     MEDICATION_LOOKUP = """
     UNWIND $medications AS med_name
    
@@ -166,34 +78,41 @@ class CypherQueries:
     YIELD node AS med, score
     WHERE score > 0.5
     WITH med, score ORDER BY score DESC LIMIT 1
+
+    // Profiles are only trusted when stamped with the current graph version: after a
+    // re-ingest that skipped materialization they describe the old graph and are walked live
+    OPTIONAL MATCH (gv:GraphVersion {id: 'knowledge_graph'})
+    WITH med, gv.version AS graph_version
  
-    // 2. Find the relationships: Medication → DepletionEvent → Nutrient
-    OPTIONAL MATCH (med)-[:CAUSES]->(de:DepletionEvent)-[:DEPLETES]->(nut:Nutrient)
-   
-    // 3. For each nutrient, collect the associated symptoms
-    OPTIONAL MATCH (de)-[:Has_Symptom]->(sym:Symptom)
-   
-    // 4. Group symptoms by nutrient (KEY AGGREGATION!)
-    WITH med, nut, de, collect(DISTINCT sym.name) AS symptoms_for_nutrient
-   
-    // 5. Build the object per nutrient with its symptoms
-    WITH med,
-        CASE WHEN nut IS NOT NULL THEN {
+    // 2. Depletion profile: read from the properties materialized at ingest time
+    //    (src/ingestion/depletion_profiles.py); medications not materialized yet are walked live
+    CALL {
+        WITH med, graph_version
+        WITH med WHERE med.depletion_profile_nutrients IS NOT NULL
+                   AND med.depletion_profile_version = graph_version
+        RETURN [i IN range(0, size(med.depletion_profile_nutrients) - 1) | {
+            nutrient: med.depletion_profile_nutrients[i],
+            symptoms: CASE med.depletion_profile_symptoms[i]
+                WHEN "" THEN []
+                ELSE split(med.depletion_profile_symptoms[i], "\\u001F")
+            END
+        }] AS depletions
+      UNION
+        WITH med, graph_version
+        WITH med WHERE med.depletion_profile_nutrients IS NULL
+                    OR coalesce(med.depletion_profile_version <> graph_version, true)
+        OPTIONAL MATCH (med)-[:CAUSES]->(de:DepletionEvent)-[:DEPLETES]->(nut:Nutrient)
+        OPTIONAL MATCH (de)-[:Has_Symptom]->(sym:Symptom)
+        WITH nut, collect(DISTINCT sym.name) AS symptoms_for_nutrient
+        ORDER BY nut.name
+        WITH collect(CASE WHEN nut IS NOT NULL THEN {
             nutrient: nut.name,
             symptoms: symptoms_for_nutrient
-        } ELSE null END AS nutrient_data
+        } END) AS depletions
+        RETURN depletions
+    }
    
-    // 6. Collect all nutrients into a list
-    WITH med, collect(nutrient_data) AS all_nutrients
-   
-    // 7. Filter out nulls and extract the list of symptoms for quick questions
-    WITH med,
-        [n IN all_nutrients WHERE n IS NOT NULL] AS depletions,
-        reduce(acc = [], n IN all_nutrients |
-            CASE WHEN n IS NOT NULL THEN acc + n.symptoms ELSE acc END
-        ) AS all_symptoms_flat
-   
-    // 8. Return the final structure
+    // 3. Return the final structure
     RETURN {
         medication: {
             name: med.name,
@@ -205,35 +124,126 @@ class CypherQueries:
     """
  
    
+    MEDICATION_BATCH_LOOKUP = """
+    // INPUT: $medications (N medication names), $max_depletions (null = the whole profile)
+    // OUTPUT: N rows in input order; context is null for a name with no matching Medicament
+    UNWIND range(0, size($medications) - 1) AS position
+    WITH position, $medications[position] AS med_name
+
+    // 1. Find each medication on its own (MEDICATION_LOOKUP's LIMIT 1 applies per name here)
+    CALL {
+        WITH med_name
+        CALL db.index.fulltext.queryNodes("medicament_full_search", med_name)
+        YIELD node, score
+        WHERE score > 0.5
+        WITH node ORDER BY score DESC LIMIT 1
+        RETURN collect(node) AS found
+    }
+    WITH position, med_name, head(found) AS med
+
+    // Profiles are only trusted when stamped with the current graph version: after a
+    // re-ingest that skipped materialization they describe the old graph and are walked live
+    OPTIONAL MATCH (gv:GraphVersion {id: 'knowledge_graph'})
+    WITH position, med_name, med, gv.version AS graph_version
+
+    // 2. Depletion profile, as in MEDICATION_LOOKUP (an unmatched name yields no depletions)
+    CALL {
+        WITH med, graph_version
+        WITH med WHERE med.depletion_profile_nutrients IS NOT NULL
+                   AND med.depletion_profile_version = graph_version
+        RETURN [i IN range(0, size(med.depletion_profile_nutrients) - 1) | {
+            nutrient: med.depletion_profile_nutrients[i],
+            symptoms: CASE med.depletion_profile_symptoms[i]
+                WHEN "" THEN []
+                ELSE split(med.depletion_profile_symptoms[i], "\\u001F")
+            END
+        }] AS depletions
+      UNION
+        WITH med, graph_version
+        WITH med WHERE med.depletion_profile_nutrients IS NULL
+                    OR coalesce(med.depletion_profile_version <> graph_version, true)
+        OPTIONAL MATCH (med)-[:CAUSES]->(de:DepletionEvent)-[:DEPLETES]->(nut:Nutrient)
+        OPTIONAL MATCH (de)-[:Has_Symptom]->(sym:Symptom)
+        WITH nut, collect(DISTINCT sym.name) AS symptoms_for_nutrient
+        ORDER BY nut.name
+        WITH collect(CASE WHEN nut IS NOT NULL THEN {
+            nutrient: nut.name,
+            symptoms: symptoms_for_nutrient
+        } END) AS depletions
+        RETURN depletions
+    }
+
+    // 3. One row per requested name, same context shape as MEDICATION_LOOKUP
+    RETURN position,
+           med_name AS medication_searched,
+           CASE WHEN med IS NULL THEN null ELSE {
+               medication: {
+                   name: med.name,
+                   synonyms: med.synonyms
+               },
+               depletions: CASE WHEN $max_depletions IS NULL THEN depletions
+                                ELSE depletions[0..$max_depletions] END
+           } END AS context
+    ORDER BY position
+    """
+
+
     SYMPTOM_INVESTIGATION = """
-    // INPUT: $symptom (A symptom)
-    // OUTPUT: ALL possible causes - filtered by the agent
+    // INPUT: $symptom (A symptom), $offset / $limit (page of causes)
+    // OUTPUT: one page of possible causes, ranked by supporting depletion events
    
     // 1. Find the symptom
     CALL db.index.fulltext.queryNodes('symptom_full_search', $symptom)
     YIELD node AS sym, score
     WHERE score > 0.3
     WITH sym ORDER BY score DESC LIMIT 1
+
+    // The causes index is only trusted when stamped with the current graph version: after a
+    // re-ingest that skipped materialization it describes the old graph and causes are ranked live
+    OPTIONAL MATCH (gv:GraphVersion {id: 'knowledge_graph'})
+    WITH sym, gv.version AS graph_version
    
-    // 2. Find ALL connections
-    MATCH (de:DepletionEvent)-[:Has_Symptom]->(sym)
-    MATCH (de)-[:DEPLETES]->(nut:Nutrient)
-    OPTIONAL MATCH (med:Medicament)-[:CAUSES]->(de)
-   
-    // 3. Group by medication
-    WITH sym, med, collect(DISTINCT nut.name) AS nutrients_depleted
-   
-    // 4. Collect all medication-cause pairs
-    WITH sym, collect({
-        medication: COALESCE(med.name, "General Deficiency (no specific drug)"),
-        depleted_nutrients: nutrients_depleted
-    }) AS all_causes
+    // 2. Ranked causes: sliced from the index materialized at ingest time
+    //    (src/ingestion/symptom_causes.py); symptoms not materialized yet are ranked live
+    CALL {
+        WITH sym, graph_version
+        WITH sym WHERE sym.cause_medications IS NOT NULL
+                   AND sym.causes_version = graph_version
+        WITH sym, size(sym.cause_medications) AS total
+        WITH sym, total,
+             CASE WHEN $offset + $limit < total THEN $offset + $limit ELSE total END AS page_end
+        RETURN total, [i IN range($offset, page_end - 1) | {
+            medication: sym.cause_medications[i],
+            depleted_nutrients: CASE sym.cause_nutrients[i]
+                WHEN "" THEN []
+                ELSE split(sym.cause_nutrients[i], "\\u001F")
+            END,
+            supporting_events: sym.cause_support[i]
+        }] AS page
+      UNION
+        WITH sym, graph_version
+        WITH sym WHERE sym.cause_medications IS NULL
+                    OR coalesce(sym.causes_version <> graph_version, true)
+        MATCH (de:DepletionEvent)-[:Has_Symptom]->(sym)
+        MATCH (de)-[:DEPLETES]->(nut:Nutrient)
+        OPTIONAL MATCH (med:Medicament)-[:CAUSES]->(de)
+        WITH med, count(DISTINCT de) AS support, collect(DISTINCT nut.name) AS nutrients_depleted
+        ORDER BY support DESC, med.name
+        WITH collect({
+            medication: COALESCE(med.name, "General Deficiency (no specific drug)"),
+            depleted_nutrients: nutrients_depleted,
+            supporting_events: support
+        }) AS all_causes
+        RETURN size(all_causes) AS total, all_causes[$offset..($offset + $limit)] AS page
+    }
    
-    // 5. Return results
+    // 3. Return results
     RETURN {
         symptom: sym.name,
-        possible_causes: all_causes,
-        total_causes_found: size(all_causes)
+        possible_causes: page,
+        total_causes_found: total,
+        offset: $offset,
+        has_more: $offset + size(page) < total
     } AS context
     """
  
@@ -273,38 +283,32 @@ class CypherQueries:
     """
    
     CONNECTION_VALIDATION = """
-// 1. FIRST, find the medication (only one)
+        // $symptoms are CANONICAL Symptom names, resolved beforehand by the symptom resolver:
+        // matching is exact set membership on the medication's adjacency, not string scanning
+       
+        // 1. FIRST, find the medication (only one)
         UNWIND $medications AS med_input
         CALL db.index.fulltext.queryNodes('medicament_full_search', med_input)
         YIELD node AS med, score AS med_score
         WHERE med_score > 0.2
         WITH med ORDER BY med_score DESC LIMIT 1
        
-        // 2. THEN, check EACH symptom from the input
-        UNWIND $symptoms AS sym_input
-       
-        // 3. Find the connection for this symptom
-        MATCH (med)-[:CAUSES]->(de:DepletionEvent)-[:DEPLETES]->(nut:Nutrient)
-        MATCH (de)-[:Has_Symptom]->(real_symptom:Symptom)
-        WHERE toLower(real_symptom.name) CONTAINS toLower(sym_input)
-        OR toLower(sym_input) CONTAINS toLower(real_symptom.name)
+        // 2. Medication -> depletion events -> symptoms, kept only if in the requested set
+        MATCH (med)-[:CAUSES]->(de:DepletionEvent)-[:Has_Symptom]->(real_symptom:Symptom)
+        WHERE real_symptom.name IN $symptoms
+        MATCH (de)-[:DEPLETES]->(nut:Nutrient)
        
-        // 4. Collect all matches for this symptom
-        WITH med, sym_input,
-            collect(DISTINCT {
-                nutrient: nut.name,
-                graph_symptom: real_symptom.name
-            }) AS matches_for_symptom
-        WHERE size(matches_for_symptom) > 0
+        // 3. Collect the nutrients behind each matched symptom
+        WITH med, real_symptom.name AS symptom_name, collect(DISTINCT nut.name) AS matched_nutrients
        
-        // 5. Aggregate results for ALL symptoms
+        // 4. Aggregate results for ALL symptoms
         WITH med, collect({
-            user_symptom: sym_input,
-            matched_nutrients: [m IN matches_for_symptom | m.nutrient],
-            matched_graph_symptoms: [m IN matches_for_symptom | m.graph_symptom]
+            user_symptom: symptom_name,
+            matched_nutrients: matched_nutrients,
+            matched_graph_symptoms: [symptom_name]
         }) AS all_symptom_matches
        
-        // 6. Extract unique list of nutrients
+        // 5. Extract unique list of nutrients
         WITH med, all_symptom_matches,
             reduce(acc = [], sm IN all_symptom_matches |
                 acc + [n IN sm.matched_nutrients WHERE NOT n IN acc]
@@ -0,0 +1,74 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from src.config import DEADLINE_LLM_MIN_TIMEOUT_SECONDS, DEADLINE_LLM_RETRY_MIN_SECONDS
+
+# Absolute wall-clock deadline (time.time()) of the current turn, None = no budget
+_deadline: ContextVar[float | None] = ContextVar("turn_deadline", default=None)
+
+CONFIG_KEY = "deadline"
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def deadline_from_config(config: dict | None) -> float | None:
+    """The turn deadline stored by the API in config['configurable']['deadline']."""
+    return ((config or {}).get("configurable") or {}).get(CONFIG_KEY)
+
+
+@contextmanager
+def deadline_scope(deadline: float | None):
+    """Make `deadline` visible to everything called in this context (Neo4j, LLM factories)."""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_seconds() -> float | None:
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+def query_timeout(default: float | None = None) -> float | None:
+    """Timeout for a database call: what is left of the turn (raises once it is spent)."""
+    remaining = remaining_seconds()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise DeadlineExceeded("Turn deadline exceeded")
+    return remaining if default is None else min(default, remaining)
+
+
+def llm_timeout() -> float | None:
+    """
+    Per-request timeout for an LLM call made now: the remaining budget, but never less than
+    DEADLINE_LLM_MIN_TIMEOUT_SECONDS so the final synthesis still gets a chance.
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return None
+    return max(DEADLINE_LLM_MIN_TIMEOUT_SECONDS, remaining)
+
+
+def llm_max_retries(default: int) -> int:
+    """Retries for an LLM client created now: none once the budget can't absorb them."""
+    remaining = remaining_seconds()
+    if remaining is None or remaining >= DEADLINE_LLM_RETRY_MIN_SECONDS:
+        return default
+    return 0
+
+
+def with_deadline(node):
+    """Wrap a graph node so the turn deadline from its RunnableConfig is active while it runs."""
+    def run(state, config):
+        with deadline_scope(deadline_from_config(config)):
+            return node(state)
+    run.__name__ = node.__name__
+    return run
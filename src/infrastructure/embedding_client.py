@@ -1,14 +1,33 @@
-from typing import Optional, List
+import asyncio
+from typing import Any, Optional, List
 from langchain_openai import AzureOpenAIEmbeddings
 from src.config import validate_config, AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY, OPENAI_API_VERSION, AZURE_EMBEDDINGS_DEPLOYMENT_NAME
+from src.infrastructure.rate_limiter import get_rate_limiter, PRIORITY_DEFAULT
+from src.infrastructure.singleflight import get_singleflight
+from src.utils import count_tokens
 
 import logging
 logger = logging.getLogger(__name__)
 
+
+class RateLimitedAzureOpenAIEmbeddings(AzureOpenAIEmbeddings):
+    """AzureOpenAIEmbeddings paced by the shared 'embeddings' scheduler (embed_query goes through embed_documents)."""
+
+    priority: int = PRIORITY_DEFAULT
+
+    def embed_documents(self, texts: list[str], chunk_size: int | None = None, **kwargs: Any) -> list[list[float]]:
+        get_rate_limiter("embeddings").acquire(sum(count_tokens(t) for t in texts), self.priority)
+        return super().embed_documents(texts, chunk_size=chunk_size, **kwargs)
+
+    async def aembed_documents(self, texts: list[str], chunk_size: int | None = None, **kwargs: Any) -> list[list[float]]:
+        await asyncio.to_thread(get_rate_limiter("embeddings").acquire, sum(count_tokens(t) for t in texts), self.priority)
+        return await super().aembed_documents(texts, chunk_size=chunk_size, **kwargs)
+
+
 def get_embeddings_client() -> AzureOpenAIEmbeddings:
     """Get the Azure OpenAI embeddings client."""
     validate_config()
-    return AzureOpenAIEmbeddings(
+    return RateLimitedAzureOpenAIEmbeddings(
         azure_endpoint=AZURE_OPENAI_ENDPOINT,
         api_key=AZURE_OPENAI_API_KEY,
         api_version=OPENAI_API_VERSION,
@@ -22,10 +41,8 @@ def get_embeddings(text: str) -> Optional[List[float]]:
         return None
     
     try:
-        embedding_client = get_embeddings_client()
-
-        embedding = embedding_client.embed_query(text)
-        return embedding
+        # Concurrent requests for the same text share one Azure call
+        return get_singleflight("embeddings").do(text, lambda: get_embeddings_client().embed_query(text))
     except Exception as e:
         logger.error(f"Error generating embedding for '{text}': {e}")
         return None
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import logging
+
+from src.config import GRAPH_VERSION_CHECK_SECONDS
+from src.infrastructure.neo4j_client import get_neo4j_client
+
+logger = logging.getLogger(__name__)
+
+# Single stamp node, bumped by every (re-)ingestion. Caches key their entries on its value.
+GRAPH_VERSION_QUERY = """
+MATCH (v:GraphVersion {id: 'knowledge_graph'})
+RETURN v.version AS version
+"""
+
+BUMP_GRAPH_VERSION_QUERY = """
+MERGE (v:GraphVersion {id: 'knowledge_graph'})
+SET v.version = coalesce(v.version, 0) + 1,
+    v.updated_at = datetime()
+"""
+
+_lock = threading.Lock()
+_version: int = 0
+_checked_at: float = 0.0
+
+
+def get_graph_version() -> int:
+    """
+    Current knowledge-graph version, re-read from Neo4j at most every
+    GRAPH_VERSION_CHECK_SECONDS. 0 when the graph was never stamped; on a read error the
+    last known value is kept.
+    """
+    global _version, _checked_at
+    now = time.monotonic()
+    if now - _checked_at < GRAPH_VERSION_CHECK_SECONDS:
+        return _version
+
+    with _lock:
+        if now - _checked_at < GRAPH_VERSION_CHECK_SECONDS:
+            return _version
+        rows = get_neo4j_client().run_safe_query(GRAPH_VERSION_QUERY)
+        if isinstance(rows, list):
+            version = (rows[0].get("version") if rows else None) or 0
+            if version != _version:
+                logger.info(f"Knowledge graph version changed: {_version} -> {version}")
+            _version = version
+        else:
+            logger.warning(f"Could not read graph version, keeping {_version}: {rows}")
+        _checked_at = now
+    return _version
+
+
+def bump_graph_version() -> int:
+    """Called by ingestion after writing: invalidates every version-keyed cache."""
+    global _checked_at
+    get_neo4j_client().run_admin_write(BUMP_GRAPH_VERSION_QUERY)
+    with _lock:
+        _checked_at = 0.0
+    return get_graph_version()
@@ -0,0 +1,535 @@
+"""
+Read-only in-process projection of the medical knowledge graph.
+
+MEDICATION_LOOKUP (and its batch form), SYMPTOM_INVESTIGATION, CONNECTION_VALIDATION and
+NUTRIENT_LOOKUP only walk Medicament -[:CAUSES]-> DepletionEvent -[:DEPLETES|Has_Symptom]->
+Nutrient / Symptom plus the nutrient's food sources and side effects. That subgraph is small,
+so it is loaded once per graph version into integer-ID adjacency arrays (CSR: the neighbours of
+row i are targets[offsets[i]:offsets[i + 1]]) and string tables, and those queries are answered
+from memory with the same rows the Cypher returns.
+
+Names are matched exactly (case, spacing and punctuation aside) against node names, medication
+synonyms and brand names. A name the projection cannot resolve is left to the Cypher query, whose
+fulltext seek is fuzzier, so enabling the projection never turns a hit into a miss.
+
+When KG_SNAPSHOT_PATH is set, each projection is also published as a memory-mapped snapshot
+file (infrastructure/kg_snapshot_file.py). A worker whose graph version matches the published
+file maps it instead of querying Neo4j, so every uvicorn worker on the host shares one copy
+of the tables and only the first one to see a new graph version pays for the export.
+"""
+import re
+import threading
+import time
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import logging
+
+from src.config import KG_PROJECTION_ENABLED, KG_PROJECTION_RETRY_SECONDS, KG_SNAPSHOT_PATH
+from src.infrastructure.deadline import deadline_scope
+from src.infrastructure.graph_version import get_graph_version
+from src.infrastructure.kg_snapshot_file import SnapshotFile, SnapshotWriter, read_graph_version
+from src.infrastructure.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+GENERAL_DEFICIENCY = "General Deficiency (no specific drug)"
+
+# Ceiling of the doubling retry delay after failed loads
+RETRY_MAX_SECONDS = 300.0
+
+PROJECTION_MEDICATIONS = """
+    MATCH (med:Medicament)
+    RETURN med.name AS name, med.synonyms AS synonyms, COALESCE(med.brand_names, []) AS brand_names
+"""
+
+PROJECTION_SYMPTOMS = """
+    MATCH (sym:Symptom)
+    RETURN sym.name AS name
+"""
+
+PROJECTION_NUTRIENTS = """
+    MATCH (nut:Nutrient)
+    OPTIONAL MATCH (nut)-[:Found_In]->(food:FoodSource)
+    WITH nut, collect(DISTINCT food.dietary_source) AS food_sources
+    OPTIONAL MATCH (nut)-[:Has_Side_Effect]->(se:SideEffect)
+    RETURN nut.name AS name,
+           nut.overview AS overview,
+           nut.biological_function_effect AS biological_function,
+           nut.forms AS forms,
+           nut.rda AS rda,
+           food_sources,
+           collect(DISTINCT se.side_effect) AS side_effects
+"""
+
+PROJECTION_DEPLETION_EVENTS = """
+    MATCH (de:DepletionEvent)
+    OPTIONAL MATCH (med:Medicament)-[:CAUSES]->(de)
+    WITH de, collect(DISTINCT med.name) AS medications
+    OPTIONAL MATCH (de)-[:DEPLETES]->(nut:Nutrient)
+    WITH de, medications, collect(DISTINCT nut.name) AS nutrients
+    OPTIONAL MATCH (de)-[:Has_Symptom]->(sym:Symptom)
+    RETURN medications, nutrients, collect(DISTINCT sym.name) AS symptoms
+"""
+
+_TOKEN = re.compile(r"\w+")
+
+
+def name_key(name: str) -> str:
+    """'Vitamin B-12' and 'vitamin b12' map to the same key."""
+    return "".join(_TOKEN.findall(name.casefold())) if name else ""
+
+
+class _Adjacency:
+    """CSR adjacency over integer ids (arrays, or memoryviews over a mapped snapshot); never mutated."""
+
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, offsets: Sequence[int], targets: Sequence[int]):
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_edges(cls, rows: int, edges: set[tuple[int, int]]) -> "_Adjacency":
+        counts = [0] * (rows + 1)
+        for source, _ in edges:
+            counts[source + 1] += 1
+        for i in range(rows):
+            counts[i + 1] += counts[i]
+        return cls(array("i", counts), array("i", (target for _, target in sorted(edges))))
+
+    def __getitem__(self, row: int) -> Sequence[int]:
+        return self.targets[self.offsets[row]:self.offsets[row + 1]]
+
+
+@dataclass(frozen=True)
+class KnowledgeGraphSnapshot:
+    """The projected medical subgraph at one graph version; replaced, never mutated."""
+    version: int
+    medications: Sequence[str]
+    medication_synonyms: Sequence[list | None]
+    symptoms: Sequence[str]
+    nutrients: Sequence[str]
+    nutrient_details: Sequence[dict]
+    medication_keys: dict[str, int]             # name_key(name | synonym | brand) -> medication id
+    symptom_keys: dict[str, int]
+    symptom_ids: dict[str, int]                 # exact canonical name -> symptom id
+    nutrient_keys: dict[str, int]               # (KeyTable instead of dict when mapped from a file)
+    event_medications: _Adjacency
+    event_nutrients: _Adjacency
+    event_symptoms: _Adjacency
+    medication_events: _Adjacency
+    symptom_events: _Adjacency
+
+    @classmethod
+    def build(cls, version: int, medications: list[dict], symptoms: list[dict],
+              nutrients: list[dict], events: list[dict]) -> "KnowledgeGraphSnapshot":
+        medications = sorted((row for row in medications if row.get("name")), key=lambda row: row["name"])
+        symptom_names = sorted({row["name"] for row in symptoms if row.get("name")})
+        nutrients = sorted((row for row in nutrients if row.get("name")), key=lambda row: row["name"])
+
+        medication_ids = {row["name"]: i for i, row in enumerate(medications)}
+        symptom_ids = {name: i for i, name in enumerate(symptom_names)}
+        nutrient_ids = {row["name"]: i for i, row in enumerate(nutrients)}
+
+        # Own name first, then synonyms, then brand names: the first claim on a key wins
+        medication_keys: dict[str, int] = {}
+        for field in ("name", "synonyms", "brand_names"):
+            for i, row in enumerate(medications):
+                aliases = [row[field]] if field == "name" else (row.get(field) or [])
+                for alias in aliases:
+                    if isinstance(alias, str) and name_key(alias):
+                        medication_keys.setdefault(name_key(alias), i)
+
+        event_medications: set[tuple[int, int]] = set()
+        event_nutrients: set[tuple[int, int]] = set()
+        event_symptoms: set[tuple[int, int]] = set()
+        for event_id, row in enumerate(events):
+            event_medications.update((event_id, medication_ids[n]) for n in row.get("medications") or [] if n in medication_ids)
+            event_nutrients.update((event_id, nutrient_ids[n]) for n in row.get("nutrients") or [] if n in nutrient_ids)
+            event_symptoms.update((event_id, symptom_ids[n]) for n in row.get("symptoms") or [] if n in symptom_ids)
+
+        return cls(
+            version=version,
+            medications=tuple(row["name"] for row in medications),
+            medication_synonyms=tuple(row.get("synonyms") for row in medications),
+            symptoms=tuple(symptom_names),
+            nutrients=tuple(row["name"] for row in nutrients),
+            nutrient_details=tuple(nutrients),
+            medication_keys=medication_keys,
+            symptom_keys={name_key(name): i for i, name in reversed(list(enumerate(symptom_names)))},
+            symptom_ids=symptom_ids,
+            nutrient_keys={name_key(row["name"]): i for i, row in reversed(list(enumerate(nutrients)))},
+            event_medications=_Adjacency.from_edges(len(events), event_medications),
+            event_nutrients=_Adjacency.from_edges(len(events), event_nutrients),
+            event_symptoms=_Adjacency.from_edges(len(events), event_symptoms),
+            medication_events=_Adjacency.from_edges(len(medications), {(m, e) for e, m in event_medications}),
+            symptom_events=_Adjacency.from_edges(len(symptom_names), {(s, e) for e, s in event_symptoms}),
+        )
+
+    # Tables and adjacency lists, in snapshot file order
+    _STRING_TABLES = ("medications", "symptoms", "nutrients")
+    _JSON_TABLES = ("medication_synonyms", "nutrient_details")
+    _KEY_TABLES = ("medication_keys", "symptom_keys", "symptom_ids", "nutrient_keys")
+    _ADJACENCIES = ("event_medications", "event_nutrients", "event_symptoms", "medication_events", "symptom_events")
+
+    def publish(self, path: str):
+        writer = SnapshotWriter()
+        for name in self._STRING_TABLES:
+            writer.add_strings(name, getattr(self, name))
+        for name in self._JSON_TABLES:
+            writer.add_json(name, getattr(self, name))
+        for name in self._KEY_TABLES:
+            writer.add_keys(name, getattr(self, name))
+        for name in self._ADJACENCIES:
+            adjacency = getattr(self, name)
+            writer.add_array(f"{name}.offsets", "i", adjacency.offsets)
+            writer.add_array(f"{name}.targets", "i", adjacency.targets)
+        writer.publish(path, self.version)
+
+    @classmethod
+    def from_file(cls, path: str) -> "KnowledgeGraphSnapshot":
+        """Map a published snapshot; nothing is copied, every table reads the shared pages."""
+        mapped = SnapshotFile(path)
+        return cls(
+            version=mapped.graph_version,
+            **{name: mapped.strings(name) for name in cls._STRING_TABLES},
+            **{name: mapped.json(name) for name in cls._JSON_TABLES},
+            **{name: mapped.keys(name) for name in cls._KEY_TABLES},
+            **{
+                name: _Adjacency(mapped.array(f"{name}.offsets", "i"), mapped.array(f"{name}.targets", "i"))
+                for name in cls._ADJACENCIES
+            },
+        )
+
+    # ── Queries (same rows as the Cypher of the same name) ──────────────────
+
+    def medication_lookup(self, medication_id: int, max_depletions: int | None = 10) -> list[dict]:
+        profile: dict[int, set[int]] = {}
+        for event in self.medication_events[medication_id]:
+            symptoms = self.event_symptoms[event]
+            for nutrient in self.event_nutrients[event]:
+                profile.setdefault(nutrient, set()).update(symptoms)
+
+        depletions = [
+            {"nutrient": self.nutrients[n], "symptoms": sorted(self.symptoms[s] for s in profile[n])}
+            for n in sorted(profile, key=lambda n: self.nutrients[n])
+        ]
+        synonyms = self.medication_synonyms[medication_id]
+        return [{
+            "context": {
+                "medication": {
+                    "name": self.medications[medication_id],
+                    "synonyms": list(synonyms) if synonyms is not None else None,
+                },
+                "depletions": depletions[:max_depletions],
+            }
+        }]
+
+    def symptom_investigation(self, symptom_id: int, offset: int, limit: int) -> list[dict]:
+        # -1 stands for depletion events no medication causes
+        events_by_medication: dict[int, set[int]] = {}
+        nutrients_by_medication: dict[int, set[int]] = {}
+        for event in self.symptom_events[symptom_id]:
+            nutrients = self.event_nutrients[event]
+            if not nutrients:
+                continue
+            for medication in self.event_medications[event] or (-1,):
+                events_by_medication.setdefault(medication, set()).add(event)
+                nutrients_by_medication.setdefault(medication, set()).update(nutrients)
+
+        # ORDER BY support DESC, med.name (nulls last)
+        ranked = sorted(
+            events_by_medication,
+            key=lambda m: (-len(events_by_medication[m]), m < 0, self.medications[m] if m >= 0 else ""),
+        )
+        page = [
+            {
+                "medication": self.medications[m] if m >= 0 else GENERAL_DEFICIENCY,
+                "depleted_nutrients": sorted(self.nutrients[n] for n in nutrients_by_medication[m]),
+                "supporting_events": len(events_by_medication[m]),
+            }
+            for m in ranked[offset:offset + limit]
+        ]
+        return [{
+            "context": {
+                "symptom": self.symptoms[symptom_id],
+                "possible_causes": page,
+                "total_causes_found": len(ranked),
+                "offset": offset,
+                "has_more": offset + len(page) < len(ranked),
+            }
+        }]
+
+    def connection_validation(self, medication_id: int, symptoms: list[str]) -> list[dict]:
+        wanted = [i for i in (self.symptom_ids.get(name) for name in dict.fromkeys(symptoms)) if i is not None]
+        matched: dict[int, list[int]] = {}
+        for event in self.medication_events[medication_id]:
+            nutrients = self.event_nutrients[event]
+            if not nutrients:
+                continue
+            event_symptoms = set(self.event_symptoms[event])
+            for symptom in wanted:
+                if symptom in event_symptoms:
+                    found = matched.setdefault(symptom, [])
+                    found.extend(n for n in nutrients if n not in found)
+
+        if not matched:
+            return []
+
+        matches = [
+            {
+                "user_symptom": self.symptoms[s],
+                "matched_nutrients": [self.nutrients[n] for n in matched[s]],
+                "matched_graph_symptoms": [self.symptoms[s]],
+            }
+            for s in wanted if s in matched
+        ]
+        return [{
+            "validation": {
+                "connection_found": True,
+                "medication": self.medications[medication_id],
+                "validated_symptoms": matches,
+                "nutrients_to_recommend": list(dict.fromkeys(n for m in matches for n in m["matched_nutrients"])),
+            }
+        }]
+
+    def nutrient_lookup(self, nutrient_id: int) -> list[dict]:
+        details = self.nutrient_details[nutrient_id]
+        forms = details.get("forms")
+        return [{
+            "context": {
+                "nutrient_info": {
+                    "name": details["name"],
+                    "overview": details.get("overview"),
+                    "biological_function": details.get("biological_function"),
+                },
+                "supplementation": {
+                    "recommended_forms": list(forms) if isinstance(forms, list) else forms,
+                    "daily_allowance": details.get("rda"),
+                    "side_effects_if_overdosed": list((details.get("side_effects") or [])[:5]),
+                },
+                "dietary_sources": list((details.get("food_sources") or [])[:10]),
+            }
+        }]
+
+
+class KnowledgeGraphProjection:
+    """
+    Holds the current KnowledgeGraphSnapshot and answers the projected queries from it.
+
+    Snapshots are loaded in a background thread, never on the request path and never under a
+    turn deadline: the first call starts the load, and a graph-version change starts a reload
+    (Cypher answers until it is swapped in). A failed load is retried with a doubling delay
+    (KG_PROJECTION_RETRY_SECONDS up to RETRY_MAX_SECONDS). `query` returns None whenever the
+    projection cannot answer (disabled, not loaded yet, unresolvable name), and the caller
+    runs the Cypher query instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: KnowledgeGraphSnapshot | None = None
+        self._loading = False
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        self._metrics = get_metrics()
+        self._handlers = {
+            "MEDICATION_LOOKUP": self._medication_lookup,
+            "MEDICATION_BATCH_LOOKUP": self._medication_batch_lookup,
+            "SYMPTOM_INVESTIGATION": self._symptom_investigation,
+            "CONNECTION_VALIDATION": self._connection_validation,
+            "NUTRIENT_LOOKUP": self._nutrient_lookup,
+        }
+
+    def serves(self, query_name: str | None) -> bool:
+        return KG_PROJECTION_ENABLED and query_name in self._handlers
+
+    def query(self, query_name: str, parameters: dict) -> list[dict] | None:
+        if not self.serves(query_name):
+            return None
+        snapshot = self.snapshot()
+        if snapshot is None:
+            self._metrics.incr("kg_projection_total", query=query_name, result="unavailable")
+            return None
+
+        rows = self._handlers[query_name](snapshot, parameters)
+        self._metrics.incr("kg_projection_total", query=query_name, result="fallback" if rows is None else "served")
+        return rows
+
+    # ── Parameter handling ───────────────────────────────────────────────────
+
+    @staticmethod
+    def _resolve_first(names: list[str], keys: dict[str, int]) -> int | None:
+        """Id of the first name (the Cypher keeps one match), or None if any name is unknown."""
+        ids = [keys.get(name_key(name)) for name in names]
+        return None if any(i is None for i in ids) else ids[0]
+
+    def _medication_lookup(self, snapshot: KnowledgeGraphSnapshot, parameters: dict) -> list[dict] | None:
+        if not parameters.get("medications"):
+            return []
+        medication = self._resolve_first(parameters["medications"], snapshot.medication_keys)
+        if medication is None:
+            return None
+        return snapshot.medication_lookup(medication)
+
+    def _medication_batch_lookup(self, snapshot: KnowledgeGraphSnapshot, parameters: dict) -> list[dict] | None:
+        names = parameters.get("medications") or []
+        ids = [snapshot.medication_keys.get(name_key(name)) for name in names]
+        if any(i is None for i in ids):
+            return None
+        return [
+            {
+                "position": position,
+                "medication_searched": name,
+                "context": snapshot.medication_lookup(i, parameters.get("max_depletions"))[0]["context"],
+            }
+            for position, (name, i) in enumerate(zip(names, ids))
+        ]
+
+    def _symptom_investigation(self, snapshot: KnowledgeGraphSnapshot, parameters: dict) -> list[dict] | None:
+        symptom = snapshot.symptom_keys.get(name_key(parameters.get("symptom") or ""))
+        if symptom is None:
+            return None
+        return snapshot.symptom_investigation(symptom, int(parameters.get("offset", 0)), int(parameters["limit"]))
+
+    def _connection_validation(self, snapshot: KnowledgeGraphSnapshot, parameters: dict) -> list[dict] | None:
+        if not parameters.get("medications"):
+            return []
+        medication = self._resolve_first(parameters["medications"], snapshot.medication_keys)
+        if medication is None:
+            return None
+        return snapshot.connection_validation(medication, parameters.get("symptoms") or [])
+
+    def _nutrient_lookup(self, snapshot: KnowledgeGraphSnapshot, parameters: dict) -> list[dict] | None:
+        if not parameters.get("nutrients"):
+            return []
+        nutrient = self._resolve_first(parameters["nutrients"], snapshot.nutrient_keys)
+        if nutrient is None:
+            return None
+        return snapshot.nutrient_lookup(nutrient)
+
+    # ── Loading ──────────────────────────────────────────────────────────────
+
+    def snapshot(self) -> KnowledgeGraphSnapshot | None:
+        """
+        The snapshot of the current graph version, or None (and a background load starts) when
+        there is none yet. A snapshot of an older version never serves, like the query cache:
+        until the reload succeeds, queries go to Cypher.
+        """
+        current = self._snapshot
+        if current is not None and current.version == get_graph_version():
+            return current
+        self._load_in_background()
+        return None
+
+    def _load_in_background(self):
+        """Start one loader thread, unless one is running or the last failure is backing off."""
+        with self._lock:
+            if self._loading or time.monotonic() < self._retry_at:
+                return
+            self._loading = True
+        threading.Thread(target=self._run_load, name="kg-projection-load", daemon=True).start()
+
+    def _run_load(self):
+        loaded = False
+        try:
+            # Not part of any request: the export runs without a turn deadline
+            with deadline_scope(None):
+                loaded = self._load(get_graph_version())
+        except Exception as e:
+            logger.error(f"Knowledge graph projection load failed: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._loading = False
+                if loaded:
+                    self._retry_delay = 0.0
+                else:
+                    self._retry_delay = min(max(2 * self._retry_delay, KG_PROJECTION_RETRY_SECONDS), RETRY_MAX_SECONDS)
+                    self._retry_at = time.monotonic() + self._retry_delay
+        if not loaded:
+            logger.warning(f"Knowledge graph projection unavailable, Cypher serves; retrying in {self._retry_delay:g}s")
+
+    def _load(self, version: int) -> bool:
+        snapshot = self._open_published(version)
+        if snapshot is None:
+            snapshot = load_snapshot_from_graph(version)
+            if isinstance(snapshot, str):
+                self._metrics.incr("kg_projection_refresh_total", result="error")
+                return False
+            self._publish(snapshot)
+
+        # Staged swap: the new snapshot is complete before readers see it; the old one (and
+        # its mapping) is released once the last in-flight query drops its reference
+        self._snapshot = snapshot
+        self._metrics.incr("kg_projection_refresh_total", result="ok")
+        return True
+
+    def _open_published(self, version: int) -> KnowledgeGraphSnapshot | None:
+        if not KG_SNAPSHOT_PATH or read_graph_version(KG_SNAPSHOT_PATH) != version:
+            return None
+        try:
+            snapshot = KnowledgeGraphSnapshot.from_file(KG_SNAPSHOT_PATH)
+        except Exception as e:
+            logger.warning(f"Could not map the knowledge graph snapshot {KG_SNAPSHOT_PATH}: {e}")
+            return None
+        self._metrics.incr("kg_projection_snapshot_total", result="mapped")
+        logger.info(f"Knowledge graph projection mapped from {KG_SNAPSHOT_PATH} (graph version {version})")
+        return snapshot
+
+    def _publish(self, snapshot: KnowledgeGraphSnapshot):
+        if not KG_SNAPSHOT_PATH:
+            return
+        # A newer file (published ahead of its version bump by materialize) is not replaced
+        if (read_graph_version(KG_SNAPSHOT_PATH) or 0) > snapshot.version:
+            return
+        try:
+            snapshot.publish(KG_SNAPSHOT_PATH)
+            self._metrics.incr("kg_projection_snapshot_total", result="published")
+        except OSError as e:
+            logger.warning(f"Could not publish the knowledge graph snapshot to {KG_SNAPSHOT_PATH}: {e}")
+
+
+def load_snapshot_from_graph(version: int) -> KnowledgeGraphSnapshot | str:
+    """Build the projection from Neo4j, or return the 'ERROR: ...' string of the failed read."""
+    # Imported here: the client consults the projection before running a named query
+    from src.infrastructure.neo4j_client import get_neo4j_client
+    from src.utils import is_error
+
+    client = get_neo4j_client()
+    results = []
+    for cypher in (PROJECTION_MEDICATIONS, PROJECTION_SYMPTOMS, PROJECTION_NUTRIENTS, PROJECTION_DEPLETION_EVENTS):
+        rows = client.run_safe_query(cypher)
+        if is_error(rows):
+            logger.error(f"Could not load the knowledge graph projection: {rows}")
+            return rows
+        results.append(rows)
+
+    snapshot = KnowledgeGraphSnapshot.build(version, *results)
+    logger.info(
+        f"Knowledge graph projection loaded: {len(snapshot.medications)} medications, "
+        f"{len(snapshot.nutrients)} nutrients, {len(snapshot.symptoms)} symptoms, "
+        f"{len(results[3])} depletion events (graph version {version})"
+    )
+    return snapshot
+
+
+def publish_kg_snapshot(version: int):
+    """Export the projection for `version` to KG_SNAPSHOT_PATH, ready for the API workers to map."""
+    if not KG_SNAPSHOT_PATH:
+        return
+    snapshot = load_snapshot_from_graph(version)
+    if isinstance(snapshot, str):
+        raise RuntimeError(f"Knowledge graph snapshot export failed: {snapshot}")
+    snapshot.publish(KG_SNAPSHOT_PATH)
+    logger.info(f"Knowledge graph snapshot for graph version {version} published to {KG_SNAPSHOT_PATH}")
+
+
+_kg_projection_instance: KnowledgeGraphProjection | None = None
+
+
+def get_kg_projection() -> KnowledgeGraphProjection:
+    global _kg_projection_instance
+    if _kg_projection_instance is None:
+        _kg_projection_instance = KnowledgeGraphProjection()
+    return _kg_projection_instance
@@ -0,0 +1,192 @@
+"""
+Binary snapshot file for read-only, memory-mapped data shared by every worker on a host.
+
+Layout (native byte order, recorded in the header; all sections 8-byte aligned):
+
+    header    MAGIC, format version, byte order, graph version, section count
+    table     one (name, offset, length) entry per section
+    sections  int arrays (array typecodes) and string tables (int64 offsets + UTF-8 bytes;
+              JSON documents and sorted key tables are string tables too)
+
+Readers map the file read-only and wrap sections in memoryviews, so the pages are shared
+through the page cache instead of copied into each process. Writers publish with a temp
+file + os.replace: a reader either maps the old file or the complete new one, and a mapping
+that is still in use keeps the replaced file's pages alive.
+"""
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterable, Sequence
+
+MAGIC = b"MEDKGSNP"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sIBxxxqI")            # magic, format, little-endian flag, graph version, sections
+_SECTION = struct.Struct("<32sqq")               # name, offset, length
+_ALIGN = 8
+
+
+class SnapshotFormatError(Exception):
+    pass
+
+
+def _little_endian() -> int:
+    return 1 if sys.byteorder == "little" else 0
+
+
+def _aligned(position: int) -> int:
+    return (position + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class StringTable(Sequence):
+    """Strings stored back to back; item i is data[offsets[i]:offsets[i + 1]], decoded on access."""
+
+    def __init__(self, offsets: Sequence[int], data: memoryview | bytes):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        return bytes(self._data[self._offsets[i]:self._offsets[i + 1]]).decode("utf-8")
+
+
+class JsonTable(Sequence):
+    """One JSON document per row of a StringTable, parsed on access (callers get their own copy)."""
+
+    def __init__(self, rows: StringTable):
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, i: int):
+        return json.loads(self._rows[i])
+
+
+class KeyTable:
+    """Read-only str -> int map over a sorted StringTable (bisect lookup, nothing to rebuild)."""
+
+    def __init__(self, keys: Sequence[str], ids: Sequence[int]):
+        self._keys = keys
+        self._ids = ids
+
+    def get(self, key: str, default: int | None = None) -> int | None:
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._ids[i]
+        return default
+
+
+class SnapshotWriter:
+
+    def __init__(self):
+        self._sections: list[tuple[str, bytes]] = []
+
+    def add_array(self, name: str, typecode: str, values: Iterable[int]):
+        self._sections.append((name, array(typecode, values).tobytes()))
+
+    def add_strings(self, name: str, values: Iterable[str]):
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = [0]
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        self.add_array(f"{name}.offsets", "q", offsets)
+        self._sections.append((f"{name}.data", b"".join(encoded)))
+
+    def add_json(self, name: str, values: Iterable):
+        self.add_strings(name, (json.dumps(value, ensure_ascii=False) for value in values))
+
+    def add_keys(self, name: str, mapping: dict[str, int]):
+        keys = sorted(mapping)
+        self.add_strings(f"{name}.keys", keys)
+        self.add_array(f"{name}.ids", "i", (mapping[key] for key in keys))
+
+    def publish(self, path: str, graph_version: int):
+        """Write to a temp file next to `path`, then atomically replace it."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".kg_snapshot.", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._encode(graph_version))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _encode(self, graph_version: int) -> bytes:
+        position = _aligned(_HEADER.size + _SECTION.size * len(self._sections))
+        table, body = [], bytearray()
+        for name, payload in self._sections:
+            table.append(_SECTION.pack(name.encode("ascii"), position + len(body), len(payload)))
+            body += payload
+            body += b"\0" * (_aligned(len(body)) - len(body))
+
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, _little_endian(), graph_version, len(self._sections))
+        prefix = header + b"".join(table)
+        return prefix + b"\0" * (position - len(prefix)) + bytes(body)
+
+
+class SnapshotFile:
+    """A snapshot file mapped read-only. Sections are memoryviews over the shared mapping."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        self.graph_version, count = _read_header(view)
+
+        self._sections: dict[str, memoryview] = {}
+        for i in range(count):
+            raw_name, offset, length = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+            self._sections[raw_name.rstrip(b"\0").decode("ascii")] = view[offset:offset + length]
+
+    def array(self, name: str, typecode: str) -> memoryview:
+        return self._section(name).cast(typecode)
+
+    def strings(self, name: str) -> StringTable:
+        return StringTable(self.array(f"{name}.offsets", "q"), self._section(f"{name}.data"))
+
+    def json(self, name: str) -> JsonTable:
+        return JsonTable(self.strings(name))
+
+    def keys(self, name: str) -> KeyTable:
+        return KeyTable(self.strings(f"{name}.keys"), self.array(f"{name}.ids", "i"))
+
+    def _section(self, name: str) -> memoryview:
+        try:
+            return self._sections[name]
+        except KeyError:
+            raise SnapshotFormatError(f"Snapshot section '{name}' is missing") from None
+
+
+def _read_header(view) -> tuple[int, int]:
+    if len(view) < _HEADER.size:
+        raise SnapshotFormatError("Snapshot file is truncated")
+    magic, format_version, little_endian, graph_version, count = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        raise SnapshotFormatError(f"Not a format-{FORMAT_VERSION} snapshot file")
+    if little_endian != _little_endian():
+        raise SnapshotFormatError("Snapshot file was written with another byte order")
+    return graph_version, count
+
+
+def read_graph_version(path: str) -> int | None:
+    """Graph version of the snapshot at `path` (header only), or None if there is no valid one."""
+    try:
+        with open(path, "rb") as f:
+            return _read_header(f.read(_HEADER.size))[0]
+    except (OSError, SnapshotFormatError):
+        return None
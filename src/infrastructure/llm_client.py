@@ -1,25 +1,101 @@
+import asyncio
+import json
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
 from langchain_openai import AzureChatOpenAI
-from langchain_openai import AzureOpenAIEmbeddings
-from src.config import  AZURE_DEPLOYMENT_NAME, AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY, OPENAI_API_VERSION, validate_config, AZURE_EMBEDDINGS_DEPLOYMENT_NAME
+from src.config import  AZURE_DEPLOYMENT_NAME, AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY, OPENAI_API_VERSION, validate_config
+from src.config import LLM_COMPLETION_TOKEN_ESTIMATE
+from src.infrastructure.rate_limiter import get_rate_limiter, PRIORITY_DEFAULT
+from src.infrastructure.deadline import llm_timeout, llm_max_retries, remaining_seconds
+from src.utils import count_tokens, count_message_tokens
+
+# Retries per call; fewer once the turn deadline can't absorb them (see llm_max_retries)
+LLM_MAX_RETRIES = 3
+
+
+class RateLimitedAzureChatOpenAI(AzureChatOpenAI):
+    """
+    AzureChatOpenAI that reserves TPM/RPM quota from the shared 'chat' scheduler before each
+    call, and bounds each request by what is left of the turn deadline: the quota wait, the
+    request timeout and the retry count are all decided per call, so a model object that
+    outlives the turn it was built in (the V1 agent singleton) never keeps that turn's limits.
+    """
+
+    priority: int = PRIORITY_DEFAULT
+
+    def _estimate_tokens(self, messages: list[BaseMessage], kwargs: dict) -> int:
+        prompt = sum(count_message_tokens(m) for m in messages)
+        if kwargs.get("tools"):
+            prompt += count_tokens(json.dumps(kwargs["tools"], default=str))
+        return prompt + (self.max_tokens or LLM_COMPLETION_TOKEN_ESTIMATE)
+
+    def _with_deadline_retries(self) -> "RateLimitedAzureChatOpenAI":
+        """This model, or a shallow copy whose OpenAI clients retry less because the turn is nearly spent."""
+        retries = llm_max_retries(self.max_retries or 0)
+        if retries == (self.max_retries or 0) or self.root_client is None:
+            return self
+        update = {"max_retries": retries}
+        update["root_client"] = self.root_client.with_options(max_retries=retries)
+        update["client"] = update["root_client"].chat.completions
+        if self.root_async_client is not None:
+            update["root_async_client"] = self.root_async_client.with_options(max_retries=retries)
+            update["async_client"] = update["root_async_client"].chat.completions
+        return self.model_copy(update=update)
+
+    def _generate(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        limiter = get_rate_limiter("chat")
+        estimated = self._estimate_tokens(messages, kwargs)
+        limiter.acquire(estimated, self.priority, max_wait=remaining_seconds())
+        _apply_deadline(kwargs)
+        llm = self._with_deadline_retries()
+        result = super(RateLimitedAzureChatOpenAI, llm)._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        limiter.settle(estimated, _total_tokens(result))
+        return result
+
+    async def _agenerate(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        limiter = get_rate_limiter("chat")
+        estimated = self._estimate_tokens(messages, kwargs)
+        await asyncio.to_thread(limiter.acquire, estimated, self.priority, remaining_seconds())
+        _apply_deadline(kwargs)
+        llm = self._with_deadline_retries()
+        result = await super(RateLimitedAzureChatOpenAI, llm)._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        limiter.settle(estimated, _total_tokens(result))
+        return result
+
+
+def _apply_deadline(kwargs: dict):
+    timeout = llm_timeout()
+    if timeout is not None:
+        kwargs.setdefault("timeout", timeout)      # forwarded per request to the OpenAI client
+
+
+def _total_tokens(result: ChatResult) -> int | None:
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    return usage.get("total_tokens")
+
 
-def get_llm_5_1_chat() -> AzureChatOpenAI:
+def get_llm_5_1_chat(priority: int = PRIORITY_DEFAULT) -> AzureChatOpenAI:
     """Get the Azure OpenAI LLM instance."""
     validate_config()
-    return AzureChatOpenAI(
+    return RateLimitedAzureChatOpenAI(
         azure_endpoint=AZURE_OPENAI_ENDPOINT,
         api_key=AZURE_OPENAI_API_KEY,
         api_version=OPENAI_API_VERSION,
         azure_deployment=AZURE_DEPLOYMENT_NAME,
-        max_retries=3
+        max_retries=LLM_MAX_RETRIES,
+        priority=priority,
     )
 
-def get_llm_4_1_mini() -> AzureChatOpenAI:
+def get_llm_4_1_mini(priority: int = PRIORITY_DEFAULT) -> AzureChatOpenAI:
     """Get the Azure OpenAI LLM instance."""
     validate_config()
-    return AzureChatOpenAI(
+    return RateLimitedAzureChatOpenAI(
         azure_endpoint=AZURE_OPENAI_ENDPOINT,
         api_key=AZURE_OPENAI_API_KEY,
         api_version=OPENAI_API_VERSION,
         azure_deployment=AZURE_DEPLOYMENT_NAME,
-        max_retries=3  
+        max_retries=LLM_MAX_RETRIES,
+        priority=priority,
         )
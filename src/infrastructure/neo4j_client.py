@@ -1,6 +1,9 @@
-from neo4j import GraphDatabase, RoutingControl
+from neo4j import GraphDatabase, RoutingControl, Query
 from dotenv import load_dotenv
-from src.config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, LLM_READER_USER, LLM_READER_PASSWORD
+from src.config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, LLM_READER_USER, LLM_READER_PASSWORD, QUERY_CACHE_ENABLED
+from src.infrastructure.deadline import query_timeout
+from src.infrastructure.singleflight import get_singleflight, flight_key
+from src.infrastructure.query_cache import QueryResultCache
 
 load_dotenv()
 
@@ -8,28 +11,69 @@ class Neo4jManager:
     def __init__(self):
         self._driver_admin = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
         self._driver_reader = GraphDatabase.driver(NEO4J_URI, auth=(LLM_READER_USER, LLM_READER_PASSWORD))
+        # Identical (query, params) reads issued concurrently by different sessions run once
+        self._reads = get_singleflight("neo4j")
+        self._cache = QueryResultCache()
 
     def close(self):
         self._driver_admin.close()
         self._driver_reader.close()
 
-    def run_safe_query(self, cypher_query, parameters=None):
+    def run_safe_query(self, cypher_query, parameters=None, cache_name=None):
+        """
+        Read query on the restricted reader account. Pass `cache_name` for named lookups whose
+        result depends only on the graph content: they are served from the result cache until
+        the next ingestion bumps the graph version. The medical lookups are answered from the
+        in-process graph projection when it is enabled and can resolve the names.
+        """
         try:
-            # Folosim execute_query (metoda modernă din Neo4j 5.x)
-            records, _, _ = self._driver_reader.execute_query(
-                cypher_query,
-                parameters_=parameters,
-                routing_=RoutingControl.READ
-            )
-            # Transformăm în JSON simplu pentru LLM
-            return [r.data() for r in records]
-            
+            if cache_name:
+                rows = self._projection().query(cache_name, parameters or {})
+                if rows is not None:
+                    return rows
+
+            params_key = flight_key(cypher_query, parameters or {})
+            if cache_name and QUERY_CACHE_ENABLED:
+                version = self._graph_version()
+                rows = self._cache.get(cache_name, params_key, version)
+                if rows is not None:
+                    return rows
+
+            rows = self._reads.do(params_key, lambda: self._execute_read(cypher_query, parameters))
+
+            if cache_name and QUERY_CACHE_ENABLED:
+                self._cache.put(cache_name, params_key, version, rows)
+            return rows
+
         except Exception as e:
             # Aici prinzi eroarea dacă AI-ul a încercat să șteargă
             if "Forbidden" in str(e):
                 return "SECURITY_BLOCK: AI attempted a write operation."
             return f"ERROR: {str(e)}"
 
+    def _execute_read(self, cypher_query, parameters=None):
+        # Transaction timeout = what is left of the turn deadline (raises once it is spent)
+        timeout = query_timeout()
+        query = Query(cypher_query, timeout=timeout) if timeout is not None else cypher_query
+        # Folosim execute_query (metoda modernă din Neo4j 5.x)
+        records, _, _ = self._driver_reader.execute_query(
+            query,
+            parameters_=parameters,
+            routing_=RoutingControl.READ
+        )
+        # Transformăm în JSON simplu pentru LLM
+        return [r.data() for r in records]
+
+    def _graph_version(self) -> int:
+        # Imported here: graph_version reads its stamp through this client
+        from src.infrastructure.graph_version import get_graph_version
+        return get_graph_version()
+
+    def _projection(self):
+        # Imported here: the projection loads itself through this client
+        from src.infrastructure.kg_projection import get_kg_projection
+        return get_kg_projection()
+
     def run_admin_write(self, cypher_query, params=None):
         self._driver_admin.execute_query(cypher_query, parameters_=params)
 
@@ -0,0 +1,53 @@
+import copy
+import threading
+from collections import OrderedDict
+
+import logging
+
+from src.config import QUERY_CACHE_MAX_ENTRIES
+from src.infrastructure.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class QueryResultCache:
+    """
+    LRU cache of read-query results, keyed by (query name, canonical parameters).
+
+    Every entry is stamped with the graph version it was read at; a lookup under another
+    version is a miss and drops the entry, so a re-ingestion (which bumps the version)
+    invalidates everything without a flush. Only successful results (row lists) are cached.
+    Callers get their own copy of the rows.
+    """
+
+    def __init__(self, max_entries: int = QUERY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[int, list]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = get_metrics()
+
+    def get(self, name: str, params_key: str, graph_version: int) -> list | None:
+        key = (name, params_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] != graph_version:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self._metrics.incr("query_cache_total", query=name, result="hit" if entry else "miss")
+        return copy.deepcopy(entry[1]) if entry else None
+
+    def put(self, name: str, params_key: str, graph_version: int, rows: list):
+        key = (name, params_key)
+        with self._lock:
+            self._entries[key] = (graph_version, copy.deepcopy(rows))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._metrics.set_gauge("query_cache_entries", len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._metrics.set_gauge("query_cache_entries", 0)
@@ -0,0 +1,151 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+
+import logging
+
+from src.config import (
+    AZURE_CHAT_TPM,
+    AZURE_CHAT_RPM,
+    AZURE_EMBEDDINGS_TPM,
+    AZURE_EMBEDDINGS_RPM,
+)
+from src.infrastructure.deadline import DeadlineExceeded
+from src.infrastructure.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Lower value = served first when several calls are waiting for quota
+PRIORITY_INTERACTIVE = 0    # synthesis: the user is waiting on this exact call
+PRIORITY_DEFAULT = 1        # supervisor routing, V1 agent
+PRIORITY_BACKGROUND = 2     # ingestion, evaluations, cache warm-up
+
+
+class TokenBucketScheduler:
+    """
+    Client-side pacing for one Azure OpenAI deployment: a tokens-per-minute bucket and a
+    requests-per-minute bucket, both refilled continuously.
+
+    acquire() blocks until both buckets can cover the call. Waiters are served strictly by
+    (priority, arrival), so an interactive call never queues behind background work.
+    The token estimate is corrected after the call with settle() (actual usage from the
+    response), which may leave the bucket in debt until it refills.
+    A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, name: str, tokens_per_minute: int, requests_per_minute: int):
+        self.name = name
+        self.tpm = tokens_per_minute
+        self.rpm = requests_per_minute
+        self._tokens = float(tokens_per_minute)
+        self._requests = float(requests_per_minute)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._metrics = get_metrics()
+
+    @property
+    def enabled(self) -> bool:
+        return self.tpm > 0 or self.rpm > 0
+
+    def acquire(self, tokens: int, priority: int = PRIORITY_DEFAULT, max_wait: float | None = None) -> float:
+        """
+        Reserve quota for one call of ~`tokens` tokens. Returns the seconds spent waiting.
+        Raises DeadlineExceeded (and leaves the queue) if the quota isn't there within `max_wait`.
+        """
+        if not self.enabled:
+            return 0.0
+
+        # A call larger than the whole bucket would wait forever: cap it at one full minute
+        tokens = min(tokens, self.tpm) if self.tpm > 0 else 0
+        ticket = (priority, next(self._seq))
+        started = time.monotonic()
+        give_up_at = None if max_wait is None else started + max_wait
+
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            while True:
+                self._refill()
+                delay = self._delay_for(tokens) if self._waiters[0] == ticket else None
+                if delay is not None and delay <= 0:
+                    break
+                if give_up_at is not None:
+                    left = give_up_at - time.monotonic()
+                    if left <= 0:
+                        self._leave(ticket)
+                        self._metrics.incr("llm_throttle_timeout_total", deployment=self.name, priority=priority)
+                        raise DeadlineExceeded(f"RateLimiter[{self.name}]: no quota before the turn deadline")
+                    delay = left if delay is None else min(delay, left)
+                self._cond.wait(timeout=delay)
+
+            heapq.heappop(self._waiters)
+            if self.tpm > 0:
+                self._tokens -= tokens
+            if self.rpm > 0:
+                self._requests -= 1
+            self._cond.notify_all()
+
+        waited = time.monotonic() - started
+        self._metrics.observe("llm_throttle_wait_seconds", waited, deployment=self.name, priority=priority)
+        if waited > 1.0:
+            logger.info(f"RateLimiter[{self.name}]: waited {waited:.2f}s for {tokens} tokens (priority {priority})")
+        return waited
+
+    def settle(self, estimated: int, actual: int | None):
+        """Charge (or refund) the difference between the estimate and the reported usage."""
+        if not actual or self.tpm <= 0:
+            return
+        with self._cond:
+            self._refill()
+            self._tokens -= actual - estimated
+            self._cond.notify_all()
+        self._metrics.incr("llm_tokens_total", actual, deployment=self.name)
+
+    def _leave(self, ticket: tuple[int, int]):
+        """Drop a ticket that gave up; the waiters behind it may now be at the head."""
+        self._waiters.remove(ticket)
+        heapq.heapify(self._waiters)
+        self._cond.notify_all()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.tpm > 0:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+        if self.rpm > 0:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+
+    def _delay_for(self, tokens: int) -> float:
+        delay = 0.0
+        if self.tpm > 0 and self._tokens < tokens:
+            delay = max(delay, (tokens - self._tokens) * 60 / self.tpm)
+        if self.rpm > 0 and self._requests < 1:
+            delay = max(delay, (1 - self._requests) * 60 / self.rpm)
+        return delay
+
+
+def _per_process(limit: int) -> int:
+    # Quotas are per deployment; every uvicorn worker gets an equal share. A positive limit
+    # never rounds down to 0, which would mean "unlimited" and switch throttling off
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    return max(1, limit // workers) if limit > 0 else limit
+
+
+_rate_limiters: dict[str, TokenBucketScheduler] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(deployment: str) -> TokenBucketScheduler:
+    """Shared scheduler for 'chat' or 'embeddings' (one per process)."""
+    with _rate_limiters_lock:
+        if deployment not in _rate_limiters:
+            if deployment == "embeddings":
+                tpm, rpm = AZURE_EMBEDDINGS_TPM, AZURE_EMBEDDINGS_RPM
+            else:
+                tpm, rpm = AZURE_CHAT_TPM, AZURE_CHAT_RPM
+            _rate_limiters[deployment] = TokenBucketScheduler(deployment, _per_process(tpm), _per_process(rpm))
+        return _rate_limiters[deployment]
@@ -0,0 +1,111 @@
+import copy
+import json
+import threading
+from typing import Any, Callable, Hashable
+
+import logging
+
+from src.infrastructure.deadline import query_timeout
+from src.infrastructure.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Request coalescing: concurrent calls with the same key share one in-flight execution.
+
+    The first caller (the leader) runs `fn`; callers arriving while it runs wait for it and
+    receive their own deep copy of its result. Only successes are shared: the leader's error
+    may be its own (its turn deadline ran out), so followers then start a new round under
+    their own deadline. Nothing is cached: once the leader finishes, the next call executes
+    again. Followers wait at most for their own turn deadline.
+
+    Counted in 'singleflight_total{call=...,role=leader|coalesced}'.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._metrics = get_metrics()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                else:
+                    call.waiters += 1
+
+            if leader:
+                self._metrics.incr("singleflight_total", call=self.name, role="leader")
+                return self._lead(key, call, fn)
+
+            self._metrics.incr("singleflight_total", call=self.name, role="coalesced")
+            if not call.done.wait(query_timeout()):
+                raise TimeoutError(f"{self.name}: coalesced call did not finish within the turn deadline")
+            if call.error is None:
+                # Followers get their own copy so nobody mutates the rows another caller is reading
+                return copy.deepcopy(call.result)
+            logger.debug(f"SingleFlight[{self.name}]: leader failed ({call.error!r}), retrying")
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def _lead(self, key: Hashable, call: _Call, fn: Callable[[], Any]) -> Any:
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            self._unregister(key, call)
+            call.done.set()
+            raise
+        try:
+            if self._unregister(key, call):
+                # Followers copy from a private snapshot, so the leader keeps the original
+                call.result = copy.deepcopy(result)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.done.set()
+        return result
+
+    def _unregister(self, key: Hashable, call: _Call) -> int:
+        """Stop new callers from joining `call`; returns how many followers wait for it."""
+        with self._lock:
+            self._calls.pop(key, None)
+            waiters = call.waiters
+        if waiters:
+            logger.debug(f"SingleFlight[{self.name}]: {waiters} call(s) coalesced")
+        return waiters
+
+
+def flight_key(*parts: Any) -> str:
+    """Canonical key: parameter dicts compare equal regardless of insertion order."""
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+_flights: dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight(name)
+        return _flights[name]
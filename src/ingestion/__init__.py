@@ -0,0 +1,10 @@
+"""Ingestion-time steps run after (re-)loading the knowledge graph."""
+from .depletion_profiles import materialize_depletion_profiles
+from .symptom_causes import materialize_symptom_causes
+from .materialize import materialize_all
+
+__all__ = [
+    "materialize_depletion_profiles",
+    "materialize_symptom_causes",
+    "materialize_all",
+]
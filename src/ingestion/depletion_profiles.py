@@ -0,0 +1,41 @@
+"""
+Materialize each medication's depletion profile onto its Medicament node.
+
+MEDICATION_LOOKUP used to walk Medicament -> DepletionEvent -> Nutrient / Symptom and aggregate
+on every request, although the answer only changes when the graph is re-ingested. This step
+does that aggregation once and stores the result as parallel list properties:
+
+    depletion_profile_nutrients  ["Vitamin B12", "Folate", ...]
+    depletion_profile_symptoms   ["Fatigue\\u001FNeuropathy", "", ...]   (one joined string per nutrient)
+    depletion_profile_version    graph version the profile belongs to
+
+so MEDICATION_LOOKUP reads them right after the fulltext seek, as long as the version matches
+the GraphVersion node (a stale profile is ignored and the medication walked live). Nutrients are
+stored by name, the same order the live walk returns, so a truncated profile is the same either way.
+"""
+import logging
+
+from src.infrastructure.neo4j_client import get_neo4j_client
+
+logger = logging.getLogger(__name__)
+
+MATERIALIZE_DEPLETION_PROFILES = """
+    MATCH (med:Medicament)
+    OPTIONAL MATCH (med)-[:CAUSES]->(de:DepletionEvent)-[:DEPLETES]->(nut:Nutrient)
+    OPTIONAL MATCH (de)-[:Has_Symptom]->(sym:Symptom)
+    WITH med, nut, collect(DISTINCT sym.name) AS symptoms
+    ORDER BY nut.name
+    WITH med, collect(CASE WHEN nut IS NOT NULL THEN {nutrient: nut.name, symptoms: symptoms} END) AS profile
+    SET med.depletion_profile_nutrients = [p IN profile | p.nutrient],
+        med.depletion_profile_symptoms = [p IN profile |
+            reduce(joined = "", s IN p.symptoms |
+                CASE joined WHEN "" THEN s ELSE joined + "\\u001F" + s END)
+        ],
+        med.depletion_profile_version = $version
+    RETURN count(med) AS medications
+"""
+
+
+def materialize_depletion_profiles(version: int):
+    logger.info(f"Materializing medication depletion profiles for graph version {version}")
+    get_neo4j_client().run_admin_write(MATERIALIZE_DEPLETION_PROFILES, {"version": version})
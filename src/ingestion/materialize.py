@@ -0,0 +1,47 @@
+"""
+Run every ingestion-time materialization, publish the knowledge graph snapshot (when the
+projection is enabled) and bump the graph version. Run after each ingestion:
+
+    python -m src.ingestion.materialize
+"""
+import logging
+
+from src.config import KG_PROJECTION_ENABLED
+from src.infrastructure.graph_version import get_graph_version, bump_graph_version
+from src.ingestion.depletion_profiles import materialize_depletion_profiles
+from src.ingestion.symptom_causes import materialize_symptom_causes
+from src.infrastructure.kg_projection import publish_kg_snapshot
+
+logger = logging.getLogger(__name__)
+
+MATERIALIZATION_STEPS = (
+    materialize_depletion_profiles,
+    materialize_symptom_causes,
+)
+
+
+def materialize_all() -> int:
+    """
+    Write every precomputed structure stamped with the next graph version, then bump it.
+    Writing before the bump means no cache can pair the new version with stale data.
+    Returns the new version.
+    """
+    version = get_graph_version() + 1
+    for step in MATERIALIZATION_STEPS:
+        step(version)
+
+    # Published before the bump too: API workers that see the new version find this file
+    # ready to map, instead of each running its own export in the meantime
+    if KG_PROJECTION_ENABLED:
+        publish_kg_snapshot(version)
+
+    new_version = bump_graph_version()
+    if new_version != version:
+        logger.warning(f"Graph version moved to {new_version} while materializations were stamped {version}")
+    logger.info(f"Materialization complete; graph version is now {new_version}")
+    return new_version
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    materialize_all()
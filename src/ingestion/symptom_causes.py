@@ -0,0 +1,50 @@
+"""
+Materialize a ranked symptom -> causes index onto each Symptom node.
+
+SYMPTOM_INVESTIGATION used to expand every DepletionEvent with the symptom, every depleted
+nutrient and every causing medication on each request, with no bound on the number of causes.
+This step ranks the causes once (by number of supporting depletion events) and stores them as
+parallel list properties:
+
+    cause_medications   ["Metformin", "General Deficiency (no specific drug)", ...]
+    cause_nutrients     ["Vitamin B12\\u001FFolate", "Iron", ...]   (one joined string per cause)
+    cause_support       [4, 2, ...]                                  (supporting depletion events)
+    causes_version      graph version the index belongs to
+
+so SYMPTOM_INVESTIGATION returns one page of causes by slicing them, as long as the version
+matches the GraphVersion node (a stale index is ignored and the causes ranked live).
+"""
+import logging
+
+from src.infrastructure.neo4j_client import get_neo4j_client
+
+logger = logging.getLogger(__name__)
+
+MATERIALIZE_SYMPTOM_CAUSES = """
+    MATCH (sym:Symptom)
+    OPTIONAL MATCH (de:DepletionEvent)-[:Has_Symptom]->(sym)
+    OPTIONAL MATCH (de)-[:DEPLETES]->(nut:Nutrient)
+    OPTIONAL MATCH (med:Medicament)-[:CAUSES]->(de)
+    WITH sym, med,
+         count(DISTINCT CASE WHEN nut IS NOT NULL THEN de END) AS support,
+         collect(DISTINCT nut.name) AS nutrients
+    ORDER BY support DESC, med.name
+    WITH sym, collect(CASE WHEN support > 0 THEN {
+        medication: COALESCE(med.name, "General Deficiency (no specific drug)"),
+        nutrients: nutrients,
+        support: support
+    } END) AS causes
+    SET sym.cause_medications = [c IN causes | c.medication],
+        sym.cause_nutrients = [c IN causes |
+            reduce(joined = "", n IN c.nutrients |
+                CASE joined WHEN "" THEN n ELSE joined + "\\u001F" + n END)
+        ],
+        sym.cause_support = [c IN causes | c.support],
+        sym.causes_version = $version
+    RETURN count(sym) AS symptoms
+"""
+
+
+def materialize_symptom_causes(version: int):
+    logger.info(f"Materializing ranked symptom causes for graph version {version}")
+    get_neo4j_client().run_admin_write(MATERIALIZE_SYMPTOM_CAUSES, {"version": version})
@@ -0,0 +1,156 @@
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import logging
+
+from src.config import ANSWER_CACHE_MAX_ENTRIES, ANSWER_CACHE_TTL_SECONDS, ANSWER_CACHE_SIMILARITY
+from src.infrastructure.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+PERSISTED_KEYS = ("persisted_medications", "persisted_symptoms", "persisted_nutrients", "persisted_products")
+
+
+def normalize_question(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.casefold()).split())
+
+
+def context_fingerprint(state: dict) -> str:
+    """Hash of the persisted user context: answers are only shared between identical contexts."""
+    parts = ["|".join(sorted(e.casefold() for e in (state.get(key) or []))) for key in PERSISTED_KEYS]
+    return hashlib.sha1("#".join(parts).encode()).hexdigest()[:16]
+
+
+@dataclass
+class CachedAnswer:
+    question: str                                   # normalized
+    context: str                                    # context_fingerprint before the turn
+    graph_version: int
+    answer: str
+    entities: list[str]                             # resolved entity names the answer is about
+    context_updates: dict[str, list[str]] = field(default_factory=dict)
+    embedding: list[float] | None = None            # unit-normalized
+    created_at: float = field(default_factory=time.time)
+
+
+class AnswerCache:
+    """
+    Cross-session cache of final answers for self-contained, data-backed questions.
+
+    Lookup is exact on (normalized question, context fingerprint) first, then by cosine
+    similarity >= `similarity` among entries with the same context. A near-duplicate only
+    matches when every entity the cached answer is about is named in the new question,
+    so "what does metformin deplete?" never answers "what does lisinopril deplete?".
+    Entries expire after `ttl_seconds` or as soon as the graph version changes — the graph
+    version stands in for an evidence fingerprint: the worker results an answer was built
+    from can only change with it.
+
+    The question is embedded lazily (`embed`), only after an exact miss and only when some
+    entry could match it, so exact hits and questions with no candidate pay no embedding call.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = ANSWER_CACHE_TTL_SECONDS,
+        similarity: float = ANSWER_CACHE_SIMILARITY,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self._entries: OrderedDict[tuple[str, str], CachedAnswer] = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = get_metrics()
+
+    def lookup(
+        self, question: str, context: str, graph_version: int,
+        embed: Callable[[], list[float] | None] | None = None,
+    ) -> CachedAnswer | None:
+        with self._lock:
+            entry = self._entries.get((question, context))
+            if entry is not None and self._valid(entry, graph_version):
+                self._entries.move_to_end((question, context))
+                self._metrics.incr("answer_cache_total", result="hit_exact")
+                return entry
+
+            candidates = self._candidates(context, graph_version) if embed else []
+
+        # Embedding and similarity scan outside the lock: other sessions don't wait on them
+        candidates = [entry for entry in candidates if _names_all(question, entry.entities)]
+        match = self._nearest(embed(), candidates) if candidates else None
+        if match is not None:
+            self._metrics.incr("answer_cache_total", result="hit_semantic")
+            return match
+
+        self._metrics.incr("answer_cache_total", result="miss")
+        return None
+
+    def store(self, entry: CachedAnswer):
+        if entry.embedding:
+            entry.embedding = _unit(entry.embedding)
+        with self._lock:
+            key = (entry.question, entry.context)
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._metrics.set_gauge("answer_cache_entries", len(self._entries))
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._metrics.set_gauge("answer_cache_entries", 0)
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    def _valid(self, entry: CachedAnswer, graph_version: int) -> bool:
+        if entry.graph_version == graph_version and time.time() - entry.created_at < self.ttl_seconds:
+            return True
+        self._entries.pop((entry.question, entry.context), None)
+        return False
+
+    def _candidates(self, context: str, graph_version: int) -> list[CachedAnswer]:
+        """Valid entries with an embedding and the same context (caller holds the lock)."""
+        return [
+            entry for entry in list(self._entries.values())
+            if entry.context == context and entry.embedding and self._valid(entry, graph_version)
+        ]
+
+    def _nearest(self, embedding: list[float] | None, candidates: list[CachedAnswer]) -> CachedAnswer | None:
+        if not embedding or not candidates:
+            return None
+        query = _unit(embedding)
+        best, best_score = None, self.similarity
+        for entry in candidates:
+            score = sum(a * b for a, b in zip(query, entry.embedding))
+            if score >= best_score:
+                best, best_score = entry, score
+        if best is not None:
+            logger.info(f"Answer cache: near-duplicate of '{best.question}' (cosine {best_score:.3f})")
+        return best
+
+
+def _names_all(question: str, entities: list[str]) -> bool:
+    """Every entity is named in the (normalized) question."""
+    return all(f" {normalize_question(e)} " in f" {question} " for e in entities)
+
+
+def _unit(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+_answer_cache_instance: AnswerCache | None = None
+
+
+def get_answer_cache() -> AnswerCache:
+    global _answer_cache_instance
+    if _answer_cache_instance is None:
+        _answer_cache_instance = AnswerCache()
+    return _answer_cache_instance
@@ -0,0 +1,42 @@
+import logging
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.config import (
+    CHECKPOINTER_BACKEND,
+    CHECKPOINT_DB_PATH,
+    CHECKPOINT_KEEP_LAST,
+    CHECKPOINT_PRUNE_EVERY,
+    CHECKPOINT_COMPRESS_MIN_BYTES,
+)
+from .codec import CompactCheckpointSerializer, CheckpointSchemaError
+from .sqlite_saver import SqliteCheckpointSaver
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "CheckpointSchemaError",
+    "CompactCheckpointSerializer",
+    "SqliteCheckpointSaver",
+    "get_checkpointer",
+]
+
+
+def get_checkpointer() -> BaseCheckpointSaver:
+    """Build the checkpointer selected by CHECKPOINTER_BACKEND ('memory' or 'sqlite')."""
+    serde = CompactCheckpointSerializer()
+
+    if CHECKPOINTER_BACKEND == "sqlite":
+        logger.info(f"Using SQLite checkpointer at '{CHECKPOINT_DB_PATH}'")
+        return SqliteCheckpointSaver(
+            CHECKPOINT_DB_PATH,
+            serde=serde,
+            keep_last=CHECKPOINT_KEEP_LAST,
+            prune_every=CHECKPOINT_PRUNE_EVERY,
+            compress_min_bytes=CHECKPOINT_COMPRESS_MIN_BYTES,
+        )
+
+    if CHECKPOINTER_BACKEND != "memory":
+        logger.warning(f"Unknown CHECKPOINTER_BACKEND '{CHECKPOINTER_BACKEND}', falling back to memory")
+    return MemorySaver(serde=serde)
@@ -0,0 +1,139 @@
+import zlib
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.multi_agent.schemas import (
+    MedicalWorker,
+    ProductWorker,
+    NutrientWorker,
+    RespondWorker,
+    MedicalWorkerResult,
+    ProductWorkerResult,
+    NutrientWorkerResult,
+)
+
+TYPE_PREFIX = "compact:"
+MODEL_KEY = "__m"
+VALUES_KEY = "v"
+FIELDS_KEY = "f"
+
+# Stable wire tags — NEVER renumber, only append (old checkpoints reference these ids)
+MODEL_TAGS: dict[int, type[BaseModel]] = {
+    1: MedicalWorker,
+    2: ProductWorker,
+    3: NutrientWorker,
+    4: RespondWorker,
+    10: MedicalWorkerResult,
+    11: ProductWorkerResult,
+    12: NutrientWorkerResult,
+}
+TAGS_BY_MODEL = {model: tag for tag, model in MODEL_TAGS.items()}
+
+
+class CheckpointSchemaError(Exception):
+    pass
+
+
+def _fingerprint(field_names: list[str]) -> int:
+    return zlib.crc32("\x1f".join(field_names).encode())
+
+
+class CompactCheckpointSerializer(SerializerProtocol):
+    """
+    Schema-aware wrapper around LangGraph's msgpack serializer.
+
+    The project's Pydantic models (supervisor decisions, worker results) are written as
+    {"__m": <tag>, "f": [field count, fingerprint], "v": [field values in schema order]}
+    instead of the default
+    (module path, class name, {field: value}) extension payload:
+      - no module/class/field-name strings repeated on every superstep
+      - trailing fields still equal to their default are omitted
+      - enums are stored as their raw value and restored by model validation
+    Values are positional, so fields may only ever be appended to these models. "f" records
+    how many fields the model had when written and a CRC of their names: a checkpoint whose
+    names are no longer a prefix of the current schema (a field inserted, renamed or
+    reordered) raises CheckpointSchemaError instead of loading values into the wrong fields.
+    Everything else (messages, plain dicts/lists) is delegated to JsonPlusSerializer.
+    """
+
+    def __init__(self, inner: SerializerProtocol | None = None):
+        self.inner = inner or JsonPlusSerializer()
+        self._field_names = {model: list(model.model_fields) for model in TAGS_BY_MODEL}
+        self._defaults = {
+            model: [info.get_default(call_default_factory=True) for info in model.model_fields.values()]
+            for model in TAGS_BY_MODEL
+        }
+        # Fingerprint of every prefix of the schema: a checkpoint written before fields were
+        # appended still matches the prefix it was written with
+        self._prefix_fingerprints = {
+            model: [_fingerprint(names[:count]) for count in range(len(names) + 1)]
+            for model, names in self._field_names.items()
+        }
+
+    # ── SerializerProtocol ───────────────────────────────────────────────────
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        type_, data = self.inner.dumps_typed(self._pack(obj))
+        return TYPE_PREFIX + type_, data
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if not type_.startswith(TYPE_PREFIX):
+            # Checkpoint written before the compact codec was enabled
+            return self.inner.loads_typed(data)
+        return self._unpack(self.inner.loads_typed((type_[len(TYPE_PREFIX):], payload)))
+
+    # ── Encoding ─────────────────────────────────────────────────────────────
+
+    def _pack(self, obj: Any) -> Any:
+        tag = TAGS_BY_MODEL.get(type(obj))
+        if tag is not None:
+            return self._pack_model(obj, tag)
+        if isinstance(obj, dict):
+            return {k: self._pack(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [self._pack(v) for v in obj]
+        return obj
+
+    def _pack_model(self, model: BaseModel, tag: int) -> dict:
+        cls = type(model)
+        values = [self._pack_value(getattr(model, name)) for name in self._field_names[cls]]
+        defaults = self._defaults[cls]
+        while values and defaults[len(values) - 1] is not PydanticUndefined and values[-1] == defaults[len(values) - 1]:
+            values.pop()
+        return {MODEL_KEY: tag, FIELDS_KEY: [len(defaults), self._prefix_fingerprints[cls][-1]], VALUES_KEY: values}
+
+    def _pack_value(self, value: Any) -> Any:
+        if isinstance(value, Enum):
+            return value.value
+        return self._pack(value)
+
+    # ── Decoding ─────────────────────────────────────────────────────────────
+
+    def _unpack(self, obj: Any) -> Any:
+        if isinstance(obj, dict):
+            if MODEL_KEY in obj and VALUES_KEY in obj and obj.keys() <= {MODEL_KEY, FIELDS_KEY, VALUES_KEY}:
+                return self._unpack_model(obj[MODEL_KEY], obj[VALUES_KEY], obj.get(FIELDS_KEY))
+            return {k: self._unpack(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [self._unpack(v) for v in obj]
+        return obj
+
+    def _unpack_model(self, tag: int, values: list, fields: list | None) -> BaseModel:
+        cls = MODEL_TAGS[tag]
+        # fields is None for checkpoints written before fingerprints were recorded
+        if fields is not None:
+            count, fingerprint = fields
+            prefixes = self._prefix_fingerprints[cls]
+            if count >= len(prefixes) or prefixes[count] != fingerprint:
+                raise CheckpointSchemaError(
+                    f"Checkpoint holds a {cls.__name__} written with {count} fields that no longer "
+                    f"match the current schema ({len(prefixes) - 1} fields): fields may only be appended"
+                )
+        fields = dict(zip(self._field_names[cls], (self._unpack(v) for v in values)))
+        return cls.model_validate(fields)
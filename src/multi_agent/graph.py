@@ -1,14 +1,16 @@
 import logging
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 from src.multi_agent.state import MultiAgentState
+from src.multi_agent.checkpoint import get_checkpointer
 from src.multi_agent.nodes.supervisor import run_supervisor
 from src.multi_agent.nodes.medical_worker import run_medical_worker
 from src.multi_agent.nodes.product_worker import run_product_worker
 from src.multi_agent.nodes.nutrient_worker import run_nutrient_worker
 from src.multi_agent.nodes.synthesis_agent import run_synthesis_agent
 from src.multi_agent.nodes.setup_turn import run_setup_turn
+from src.multi_agent.nodes.answer_cache import run_answer_cache_lookup, run_answer_cache_store, answer_cache_routing
 from src.multi_agent.schemas.enums import RoutingNextAction
+from src.infrastructure.deadline import with_deadline
  
 logger = logging.getLogger(__name__)
  
@@ -17,15 +19,25 @@ def build_multi_agent_graph():
  
     graph = StateGraph(MultiAgentState)
  
+    # with_deadline: the turn deadline from config["configurable"] bounds Neo4j + LLM calls in each node
     graph.add_node("setup_turn", run_setup_turn)
-    graph.add_node("supervisor", run_supervisor)
-    graph.add_node("medical_worker", run_medical_worker)
-    graph.add_node("product_worker", run_product_worker)
-    graph.add_node("nutrient_worker", run_nutrient_worker)
-    graph.add_node("synthesis", run_synthesis_agent)
+    graph.add_node("answer_cache", with_deadline(run_answer_cache_lookup))
+    graph.add_node("supervisor", with_deadline(run_supervisor))
+    graph.add_node("medical_worker", with_deadline(run_medical_worker))
+    graph.add_node("product_worker", with_deadline(run_product_worker))
+    graph.add_node("nutrient_worker", with_deadline(run_nutrient_worker))
+    graph.add_node("synthesis", with_deadline(run_synthesis_agent))
+    graph.add_node("answer_cache_store", run_answer_cache_store)
  
     graph.set_entry_point("setup_turn")
-    graph.add_edge("setup_turn", "supervisor")
+    graph.add_edge("setup_turn", "answer_cache")
+
+    # A cached answer ends the turn before the supervisor ever runs
+    graph.add_conditional_edges(
+        "answer_cache",
+        answer_cache_routing,
+        {"supervisor": "supervisor", "end": END},
+    )
  
     graph.add_conditional_edges(
         "supervisor",
@@ -41,11 +53,12 @@ def build_multi_agent_graph():
     graph.add_edge("medical_worker", "supervisor")
     graph.add_edge("product_worker", "supervisor")
     graph.add_edge("nutrient_worker", "supervisor")
-    graph.add_edge("synthesis", END)
+    graph.add_edge("synthesis", "answer_cache_store")
+    graph.add_edge("answer_cache_store", END)
  
  
-    memory = MemorySaver()
-    compiled = graph.compile(checkpointer=memory)
+    checkpointer = get_checkpointer()
+    compiled = graph.compile(checkpointer=checkpointer)
     logger.info("Multi-agent graph compiled successfully")
     return compiled
  
@@ -0,0 +1,142 @@
+import logging
+import threading
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessage
+
+from src.config import ANSWER_CACHE_ENABLED, ANSWER_CACHE_SIMILARITY
+from src.infrastructure.embedding_client import get_embeddings
+from src.infrastructure.graph_version import get_graph_version
+from src.multi_agent.answer_cache import (
+    PERSISTED_KEYS,
+    CachedAnswer,
+    get_answer_cache,
+    normalize_question,
+    context_fingerprint,
+)
+from src.multi_agent.state import MultiAgentState
+
+logger = logging.getLogger(__name__)
+
+_EMBEDDING_MEMO_SIZE = 256
+_embedding_memo: OrderedDict[str, tuple[float, ...]] = OrderedDict()
+_embedding_memo_lock = threading.Lock()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOOKUP — between setup_turn and the supervisor
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def run_answer_cache_lookup(state: MultiAgentState) -> dict:
+    question = _last_user_message(state)
+    if not ANSWER_CACHE_ENABLED or not question:
+        return {"answer_cache_probe": None}
+
+    probe = {
+        "question": normalize_question(question),
+        "context": context_fingerprint(state),
+        "graph_version": get_graph_version(),
+        "context_before": {key: list(state.get(key) or []) for key in PERSISTED_KEYS},
+    }
+    hit = get_answer_cache().lookup(
+        probe["question"], probe["context"], probe["graph_version"], lambda: _question_embedding(question),
+    )
+    if hit is None:
+        return {"answer_cache_probe": probe, "execution_path": ["answer_cache(miss)"]}
+
+    logger.info(f"AnswerCache: hit for '{probe['question']}' (entities {hit.entities})")
+    updates = {
+        key: list(dict.fromkeys((state.get(key) or []) + new_items))
+        for key, new_items in hit.context_updates.items()
+    }
+    return {
+        **updates,
+        "final_response": hit.answer,
+        "messages": [AIMessage(content=hit.answer)],
+        "answer_cache_probe": None,
+        "execution_path": ["answer_cache(hit)"],
+    }
+
+
+def answer_cache_routing(state: MultiAgentState) -> str:
+    return "end" if state.get("final_response") else "supervisor"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STORE — after synthesis
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def run_answer_cache_store(state: MultiAgentState) -> dict:
+    probe = state.get("answer_cache_probe")
+    answer = state.get("final_response")
+    if not probe or not answer or not _cacheable_turn(state):
+        return {"answer_cache_probe": None}
+
+    medical = [r for r in (state.get("medical_worker_results") or []) if r and r != "CLEAR"]
+    nutrients = [r for r in (state.get("nutrient_worker_results") or []) if r and r != "CLEAR"]
+
+    entities = list(dict.fromkeys(
+        [n for r in medical for n in (r.medication_name, r.symptom_name) if n]
+        + [r.nutrient_name for r in nutrients if r.nutrient_name]
+    ))
+    # Self-contained questions only: every entity the answer is about is named in the question
+    question = probe["question"]
+    if not entities or not all(f" {normalize_question(e)} " in f" {question} " for e in entities):
+        return {"answer_cache_probe": None}
+
+    context_updates = {
+        key: [e for e in (state.get(key) or []) if e not in probe["context_before"].get(key, [])]
+        for key in PERSISTED_KEYS
+    }
+    get_answer_cache().store(CachedAnswer(
+        question=question,
+        context=probe["context"],
+        graph_version=probe["graph_version"],
+        answer=answer,
+        entities=entities,
+        context_updates={k: v for k, v in context_updates.items() if v},
+        embedding=_question_embedding(_last_user_message(state)),
+    ))
+    logger.info(f"AnswerCache: stored '{question}' (entities={entities})")
+    return {"answer_cache_probe": None, "execution_path": ["answer_cache(store)"]}
+
+
+def _cacheable_turn(state: MultiAgentState) -> bool:
+    """Only complete, data-backed turns: some worker ran, nothing failed or was cut short."""
+    path = state.get("execution_path") or []
+    if not any(step.endswith("_worker") or "_worker(" in step for step in path):
+        return False
+    if any(flag in step for step in path for flag in ("error", "forced", "fallback", "unknown")):
+        return False
+    results = [
+        r for key in ("medical_worker_results", "product_worker_results", "nutrient_worker_results")
+        for r in (state.get(key) or []) if r and r != "CLEAR"
+    ]
+    return bool(results) and not any(r.summary.lower().startswith("error") for r in results)
+
+
+def _last_user_message(state: MultiAgentState) -> str:
+    user_messages = [m for m in state.get("messages", []) if m.type == "human"]
+    return str(user_messages[-1].content) if user_messages else ""
+
+
+def _question_embedding(question: str) -> tuple[float, ...] | None:
+    # Memoized: the lookup and the store of the same turn embed the same text once.
+    # Failures are not remembered, so a question whose embedding failed is embedded again
+    if ANSWER_CACHE_SIMILARITY >= 1.0 or not question:
+        return None
+    with _embedding_memo_lock:
+        embedding = _embedding_memo.get(question)
+        if embedding is not None:
+            _embedding_memo.move_to_end(question)
+            return embedding
+
+    embedding = get_embeddings(question)
+    if not embedding:
+        return None
+    embedding = tuple(embedding)
+    with _embedding_memo_lock:
+        _embedding_memo[question] = embedding
+        while len(_embedding_memo) > _EMBEDDING_MEMO_SIZE:
+            _embedding_memo.popitem(last=False)
+    return embedding
@@ -1,7 +1,10 @@
 from src.multi_agent.schemas import MedicalWorkerResult
 from src.multi_agent.state.graph_state import MultiAgentState
+from src.multi_agent.state.knowledge import normalize_entity, lookup_knowledge, remember_knowledge
 from src.database.neo4j_client import get_neo4j_client
-from src.database.cypher_queries import CypherQueries
+from src.database.cypher_queries import CypherQueries, CypherEntityValidationQueries
+from src.config import SYMPTOM_CAUSES_PAGE_SIZE
+from src.utils.medication_overlap import analyze_medication_overlap
 from langchain_core.messages import AIMessage
 import logging
  
@@ -18,10 +21,21 @@ def run_medical_worker(state: MultiAgentState) -> dict:
     medical_query = current_step.medical_query.value
  
     logger.info(f"Task: {medical_query}, Medication: {medication}, Symptom: {symptom}, Reasoning: {reasoning}")
+
+    medications = _requested_medications(medication, getattr(current_step, "medications", None))
+    if medical_query == "medication_lookup" and len(medications) > 1:
+        return _run_batch_medication_lookup(state, medications)
+
+    # Same (entity, query) already answered in an earlier turn of this session -> no DB round-trip
+    entity = _knowledge_entity(medical_query, medication, symptom)
+    cached = lookup_knowledge(state, "medical_worker", entity, medical_query)
  
     try:
  
-        if medical_query == "medication_lookup":
+        if cached is not None:
+            result_data = cached
+
+        elif medical_query == "medication_lookup":
             result_data = handle_medical_lookup(medication)
        
         elif medical_query == "symptom_investigation":
@@ -29,6 +43,12 @@ def run_medical_worker(state: MultiAgentState) -> dict:
  
         elif medical_query == "validate_connection":
             result_data = handle_connection_validation(medication, symptom)
+
+        elif medical_query == "medication_overlap":
+            # Every medication of the session, plus any the supervisor just named
+            result_data = handle_medication_overlap(_requested_medications(
+                None, (state.get("persisted_medications") or []) + medications
+            ))
  
         else:
             # e posibil sa sa intample asta din moment ce e validat
@@ -46,30 +66,107 @@ def run_medical_worker(state: MultiAgentState) -> dict:
             "label": "medical_worker(error)",
         }
  
-    # Merge with existing persisted context (last-write-wins, so we read + append)
-    existing_meds = state.get("persisted_medications", []) or []
-    existing_nutrients = state.get("persisted_nutrients", []) or []
-    existing_symptoms = state.get("persisted_symptoms", []) or []
- 
-    new_meds = list(dict.fromkeys(existing_meds + ([result_data.medication_name] if result_data.medication_name else [])))
-    new_nutrients = list(dict.fromkeys(existing_nutrients + (result_data.nutrients_found if hasattr(result_data, 'nutrients_found') else [])))
-    # Add symptom_name (explicitly queried symptom) and symptoms_found (from validation)
-    symptoms_to_add = (getattr(result_data, 'symptoms_found', []) or []) + \
-                      ([getattr(result_data, 'symptom_name', None)] if getattr(result_data, 'symptom_name', None) else [])
-    new_symptoms = list(dict.fromkeys(existing_symptoms + symptoms_to_add))
+    knowledge_cache = state.get("knowledge_cache") or {}
+    if cached is None and _is_cacheable(result_data):
+        result_data.query_type = medical_query
+        knowledge_cache = remember_knowledge(state, "medical_worker", entity, medical_query, result_data)
 
     # Append Pydantic object to the accumulated list — type-safe, IDE-friendly
     return {
         "medical_worker_results": [result_data],
-        "persisted_medications": new_meds,
-        "persisted_nutrients": new_nutrients,
-        "persisted_symptoms": new_symptoms,
-        "execution_path": ["medical_worker"],
+        **_persisted_context(state, [result_data]),
+        "knowledge_cache": knowledge_cache,
+        "execution_path": ["medical_worker(cached)" if cached is not None else "medical_worker"],
         "next_action": None,
         "current_decision": None,
     }
- 
- 
+
+
+def _run_batch_medication_lookup(state: MultiAgentState, medications: list[str]) -> dict:
+    """Several medications at once: cached ones from the session, all others in one query."""
+    results: dict[str, MedicalWorkerResult] = {}
+    for name in medications:
+        cached = lookup_knowledge(state, "medical_worker", normalize_entity(name), "medication_lookup")
+        if cached is not None:
+            results[name] = cached
+    uncached = [name for name in medications if name not in results]
+    results.update(handle_medications_lookup(uncached))
+
+    knowledge_cache = state.get("knowledge_cache") or {}
+    for name in uncached:
+        if _is_cacheable(results[name]):
+            results[name].query_type = "medication_lookup"
+            knowledge_cache = remember_knowledge(
+                {**state, "knowledge_cache": knowledge_cache},
+                "medical_worker", normalize_entity(name), "medication_lookup", results[name],
+            )
+
+    ordered = [results[name] for name in medications]
+    return {
+        "medical_worker_results": ordered,
+        **_persisted_context(state, ordered),
+        "knowledge_cache": knowledge_cache,
+        "execution_path": [f"medical_worker(batch: {len(medications)}, cached: {len(medications) - len(uncached)})"],
+        "next_action": None,
+        "current_decision": None,
+    }
+
+
+def _persisted_context(state: MultiAgentState, results: list) -> dict:
+    """Merge with existing persisted context (last-write-wins, so we read + append)."""
+    new_meds = list(state.get("persisted_medications", []) or [])
+    new_nutrients = list(state.get("persisted_nutrients", []) or [])
+    new_symptoms = list(state.get("persisted_symptoms", []) or [])
+
+    for result_data in results:
+        if getattr(result_data, 'medication_name', None):
+            new_meds.append(result_data.medication_name)
+        new_nutrients.extend(getattr(result_data, 'nutrients_found', []) or [])
+        # Add symptom_name (explicitly queried symptom) and symptoms_found (from validation)
+        new_symptoms.extend(getattr(result_data, 'symptoms_found', []) or [])
+        if getattr(result_data, 'symptom_name', None):
+            new_symptoms.append(result_data.symptom_name)
+
+    return {
+        "persisted_medications": list(dict.fromkeys(new_meds)),
+        "persisted_nutrients": list(dict.fromkeys(new_nutrients)),
+        "persisted_symptoms": list(dict.fromkeys(new_symptoms)),
+    }
+
+
+def _requested_medications(medication: str | None, medications: list[str] | None) -> list[str]:
+    """`medication` plus any `medications`, deduplicated case-insensitively, in order."""
+    unique: dict[str, str] = {}
+    for name in [medication, *(medications or [])]:
+        if name and name.strip():
+            unique.setdefault(normalize_entity(name), name.strip())
+    return list(unique.values())
+ 
+ 
+def _knowledge_entity(medical_query: str, medication: str | None, symptom: str | None) -> str:
+    """Cache key entity for a medical query — only the parameters the query actually uses."""
+    if medical_query == "medication_lookup":
+        return normalize_entity(medication)
+    if medical_query == "symptom_investigation":
+        return normalize_entity(symptom)
+    if medical_query == "validate_connection" and medication and symptom:
+        return normalize_entity(medication, symptom)
+    return ""
+
+
+# Summaries that report missing data rather than an answer (same rule as the nutrient worker)
+_NO_DATA_PREFIXES = ("error", "no results found", "no documented connection", "no connection found", "medication overlap needs")
+_NO_DATA_MARKERS = ("not found in database", "no depletion data found", "no associated causes found")
+
+
+def _is_cacheable(result) -> bool:
+    """Only real answers are cached: errors and not-found/empty results must be retried on the next call."""
+    if not isinstance(result, MedicalWorkerResult) or not result.summary.strip():
+        return False
+    summary = result.summary.lower()
+    return not summary.startswith(_NO_DATA_PREFIXES) and not any(marker in summary for marker in _NO_DATA_MARKERS)
+
+
 def _build_observation_message(result: MedicalWorkerResult) -> AIMessage:
     """Create an observation message from worker results — like ToolMessage in ReAct."""
     summary = result.summary if hasattr(result, 'summary') else str(result)
@@ -85,7 +182,8 @@ def handle_medical_lookup(medication_name: str) -> MedicalWorkerResult:
     try:
         raw_results = driver.run_safe_query(
             CypherQueries.MEDICATION_LOOKUP,
-            {"medications": [medication_name]}
+            {"medications": [medication_name]},
+            cache_name="MEDICATION_LOOKUP",
         )
  
         logger.info(f"Raw lookup results: {raw_results}")
@@ -116,6 +214,105 @@ def handle_medical_lookup(medication_name: str) -> MedicalWorkerResult:
  
    
  
+def handle_medications_lookup(medication_names: list[str]) -> dict[str, MedicalWorkerResult]:
+    """Batch form of handle_medical_lookup: every medication in one MEDICATION_BATCH_LOOKUP query."""
+    if not medication_names:
+        return {}
+    try:
+        contexts = _batch_lookup_contexts(medication_names)
+
+        results = {}
+        for position, medication_name in enumerate(medication_names):
+            context = contexts.get(position)
+            if not context:
+                results[medication_name] = MedicalWorkerResult(
+                    summary=f"No results found for medication '{medication_name}'",
+                    medication_name=medication_name
+                )
+                continue
+            summaries, nutrients_found, _ = extract_summary_facts(context)
+            results[medication_name] = MedicalWorkerResult(
+                summary="\n".join(summaries),
+                medication_name=medication_name,
+                nutrients_found=nutrients_found,
+                symptoms_found=[]  # DO NOT persist possible side-effects as actual user symptoms!
+            )
+        return results
+
+    except Exception as e:
+        logger.error(f"Error in handle_medications_lookup: {e}", exc_info=True)
+        return {
+            name: MedicalWorkerResult(summary=f"Error looking up medication: {str(e)}", medication_name=name)
+            for name in medication_names
+        }
+
+
+def handle_medication_overlap(medication_names: list[str]) -> MedicalWorkerResult:
+    """Nutrients depleted by more than one medication, from a single batch lookup."""
+    if len(medication_names) < 2:
+        return MedicalWorkerResult(
+            summary=f"Medication overlap needs at least two medications; known so far: {', '.join(medication_names) or 'none'}"
+        )
+    try:
+        # Whole profiles: an overlap beyond the tenth depleted nutrient still counts
+        contexts = _batch_lookup_contexts(medication_names, max_depletions=None)
+        profiles = {
+            context["medication"]["name"]: context.get("depletions", [])
+            for context in (contexts.get(i) for i in range(len(medication_names))) if context
+        }
+        not_found = [name for i, name in enumerate(medication_names) if not contexts.get(i)]
+
+        analysis = analyze_medication_overlap(profiles)
+        summary = _extract_overlap_facts(analysis, not_found)
+        return MedicalWorkerResult(
+            summary="\n".join(summary),
+            nutrients_found=[risk["nutrient"] for risk in analysis["cumulative_risk"]]
+        )
+
+    except Exception as e:
+        logger.error(f"Error in handle_medication_overlap: {e}", exc_info=True)
+        return MedicalWorkerResult(summary=f"Error comparing medications: {str(e)}")
+
+
+def _batch_lookup_contexts(medication_names: list[str], max_depletions: int | None = 10) -> dict[int, dict | None]:
+    """MEDICATION_BATCH_LOOKUP contexts by input position (None for a name with no match)."""
+    raw_results = driver.run_safe_query(
+        CypherQueries.MEDICATION_BATCH_LOOKUP,
+        {"medications": medication_names, "max_depletions": max_depletions},
+        cache_name="MEDICATION_BATCH_LOOKUP",
+    )
+    if isinstance(raw_results, str):
+        raise RuntimeError(raw_results)
+
+    logger.info(f"Raw batch lookup results: {raw_results}")
+    return {row["position"]: row.get("context") for row in raw_results}
+
+
+def _extract_overlap_facts(analysis: dict, not_found: list[str]) -> list:
+    """Extract facts from a medication overlap analysis."""
+    summary = []
+    medications = analysis["medications"]
+
+    if len(medications) < 2:
+        summary.append("Medication overlap: fewer than two of the medications were found in database")
+    elif not analysis["cumulative_risk"]:
+        summary.append(f"No nutrient is depleted by more than one of: {', '.join(medications)}")
+    else:
+        summary.append(f"Nutrients depleted by more than one of {', '.join(medications)}:")
+        for risk in analysis["cumulative_risk"]:
+            symptoms = f" (deficiency → {', '.join(risk['deficiency_symptoms'])})" if risk["deficiency_symptoms"] else ""
+            summary.append(
+                f"  • {risk['nutrient']} depleted by {risk['depleted_by_count']} of {len(medications)}: "
+                f"{', '.join(risk['depleted_by'])}{symptoms}"
+            )
+        for pair in analysis["pairwise_overlap"]:
+            summary.append(f"  └ {' + '.join(pair['medications'])} share: {', '.join(pair['shared_nutrients'])}")
+
+    if not_found:
+        summary.append(f"  Not found in database: {', '.join(not_found)}")
+    return summary
+
+
 def extract_summary_facts(context: dict) -> list:
  
     medication_info = context.get("medication", {})
@@ -153,7 +350,8 @@ def handle_symtom_lookup(symptom: str) -> MedicalWorkerResult:
     try:
         raw_results = driver.run_safe_query(
             CypherQueries.SYMPTOM_INVESTIGATION,
-            {"symptom": symptom}
+            {"symptom": symptom, "offset": 0, "limit": SYMPTOM_CAUSES_PAGE_SIZE},
+            cache_name="SYMPTOM_INVESTIGATION",
         )
  
         logger.info(f"Raw symptom investigation results: {raw_results}")
@@ -183,9 +381,20 @@ def handle_symtom_lookup(symptom: str) -> MedicalWorkerResult:
 def handle_connection_validation(medication: str, symptom: str) -> MedicalWorkerResult:
     """Check if there's a connection between a medication and symptom via nutrient depletion."""
     try:
+        # Canonical symptom name first: the query matches by exact set membership
+        canonical_symptom = _resolve_symptom(symptom)
+        if not canonical_symptom:
+            return MedicalWorkerResult(
+                summary=f"Symptom '{symptom}' not found in database",
+                medication_name=medication,
+                symptom_name=symptom
+            )
+        logger.info(f"Symptom '{symptom}' resolved to '{canonical_symptom}'")
+
         raw_results = driver.run_safe_query(
             CypherQueries.CONNECTION_VALIDATION,
-            {"medications": [medication], "symptoms": [symptom]}
+            {"medications": [medication], "symptoms": [canonical_symptom]},
+            cache_name="CONNECTION_VALIDATION",
         )
    
         logger.info(f"Raw connection validation results: {raw_results}")
@@ -197,15 +406,16 @@ def handle_connection_validation(medication: str, symptom: str) -> MedicalWorker
                 symptom_name=symptom
             )
  
-        summaries = _extract_connection_facts(raw_results[0].get("context", {}), medication, symptom)
-        nutrients_involved = _extract_nutrients_from_connection(raw_results[0].get("context", {}))
+        validation = raw_results[0].get("validation", {})
+        summaries = _extract_connection_facts(validation, medication, canonical_symptom)
+        nutrients_involved = _extract_nutrients_from_connection(validation)
        
         return MedicalWorkerResult(
             summary="\n".join(summaries),
             medication_name=medication,
             symptom_name=symptom,
             nutrients_found=nutrients_involved,
-            symptoms_found=[symptom]
+            symptoms_found=[canonical_symptom]
         )
  
     except Exception as e:
@@ -217,62 +427,61 @@ def handle_connection_validation(medication: str, symptom: str) -> MedicalWorker
         )
  
  
+def _resolve_symptom(symptom: str) -> str | None:
+    """Canonical Symptom name: direct match first, then the fulltext index."""
+    for query in (CypherEntityValidationQueries.SYMPTOM_DIRECT_QUERY, CypherEntityValidationQueries.SYMPTOM_FULLTEXT_QUERY):
+        rows = driver.run_safe_query(query, {"search_term": symptom})
+        if isinstance(rows, list) and rows and rows[0].get("name"):
+            return rows[0]["name"]
+    return None
+
+
 def _extract_symptom_investigation_facts(context: dict, symptom: str) -> list:
-    """Extract facts from symptom investigation query results."""
+    """Extract facts from one page of ranked symptom causes."""
     summary = []
    
-    depletions = context.get("depletions", [])
-    medications = context.get("medications", [])
+    causes = context.get("possible_causes", [])
    
-    if not depletions and not medications:
+    if not causes:
         summary.append(f"{symptom}: no associated causes found in database")
         return summary
    
-    summary.append(f"Symptom '{symptom}' may be connected to:")
+    total = context.get("total_causes_found", len(causes))
+    shown = f" (top {len(causes)} of {total})" if total > len(causes) else ""
+    summary.append(f"Symptom '{symptom}' may be connected to{shown}:")
    
-    if depletions:
-        nutrient_names = [d.get("nutrient") for d in depletions if d.get("nutrient")]
-        if nutrient_names:
-            summary.append(f"  • Nutrient deficiencies: {', '.join(nutrient_names)}")
+    nutrient_names = list(dict.fromkeys(n for c in causes for n in c.get("depleted_nutrients", [])))
+    if nutrient_names:
+        summary.append(f"  • Nutrient deficiencies: {', '.join(nutrient_names)}")
    
-    if medications:
-        med_names = [m.get("name") for m in medications if m.get("name")]
-        if med_names:
-            summary.append(f"  • Medications: {', '.join(med_names)}")
+    for cause in causes:
+        nutrients = ", ".join(cause.get("depleted_nutrients", []))
+        summary.append(f"  └ {cause.get('medication')} → {nutrients}")
    
     return summary
  
  
-def _extract_connection_facts(context: dict, medication: str, symptom: str) -> list:
+def _extract_connection_facts(validation: dict, medication: str, symptom: str) -> list:
     """Extract facts from connection validation results."""
     summary = []
    
-    depletions = context.get("depletions", [])
+    matches = validation.get("validated_symptoms", [])
    
-    if not depletions:
+    if not matches:
         summary.append(f"No connection found between '{medication}' and '{symptom}' in database")
         return summary
    
-    summary.append(f"Connection found: {medication} → nutrient depletion → {symptom}")
-   
-    for depletion in depletions:
-        nutrient = depletion.get("nutrient", "unknown")
-        symptoms = depletion.get("symptoms", [])
-        if symptom.lower() in [s.lower() for s in symptoms]:
+    medication = validation.get("medication") or medication
+    for match in matches:
+        graph_symptom = match.get("user_symptom", symptom)
+        summary.append(f"Connection found: {medication} → nutrient depletion → {graph_symptom}")
+        for nutrient in match.get("matched_nutrients", []):
             summary.append(f"  └ {medication} depletes {nutrient}")
-            summary.append(f"  └ {nutrient} deficiency can cause: {', '.join(symptoms)}")
+            summary.append(f"  └ {nutrient} deficiency can cause: {graph_symptom}")
    
     return summary
  
  
-def _extract_nutrients_from_connection(context: dict) -> list:
-    """Extract nutrient names from connection validation context."""
-    nutrients = []
-    depletions = context.get("depletions", [])
-   
-    for depletion in depletions:
-        nutrient = depletion.get("nutrient")
-        if nutrient and nutrient not in nutrients:
-            nutrients.append(nutrient)
-   
-    return nutrients
\ No newline at end of file
+def _extract_nutrients_from_connection(validation: dict) -> list:
+    """Extract nutrient names from connection validation results."""
+    return list(validation.get("nutrients_to_recommend", []))
\ No newline at end of file
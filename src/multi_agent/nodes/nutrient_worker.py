@@ -2,6 +2,7 @@ import json
 import logging
  
 from src.multi_agent.state.graph_state import MultiAgentState
+from src.multi_agent.state.knowledge import normalize_entity, lookup_knowledge, remember_knowledge
 from src.multi_agent.schemas.worker_results import NutrientWorkerResult
 from src.agent.tools.nutrient_tool import nutrient_lookup
  
@@ -16,6 +17,18 @@ def run_nutrient_worker(state: MultiAgentState) -> dict:
  
     logger.info(f"NutrientWorker: task={task_type}, instructions={instructions}")
  
+    entity = normalize_entity(nutrient)
+    cached = lookup_knowledge(state, "nutrient_worker", entity, task_type)
+    if cached is not None:
+        nuts = list(state.get("persisted_nutrients", []))
+        if cached.nutrient_name and cached.nutrient_name not in nuts:
+            nuts.append(cached.nutrient_name)
+        return {
+            "nutrient_worker_results": [cached],
+            "persisted_nutrients": nuts,
+            "execution_path": [f"nutrient_worker({nutrient}, cached)"],
+        }
+ 
     try:
         if task_type == "nutrient_edu":
             nutrient = instructions.get("nutrient", "")
@@ -44,9 +57,15 @@ def run_nutrient_worker(state: MultiAgentState) -> dict:
         nutrient_name=nutrient if isinstance(parsed, dict) else None,
     )
 
+    # Errors / empty lookups are not cached so the next call retries the database
+    knowledge_cache = state.get("knowledge_cache") or {}
+    if isinstance(parsed, (dict, list)) and not summary.startswith(("ERROR", "No data found", "Data received")):
+        knowledge_cache = remember_knowledge(state, "nutrient_worker", entity, task_type, pydantic_result)
+
     return {
         "nutrient_worker_results": [pydantic_result],
         "persisted_nutrients": nuts,
+        "knowledge_cache": knowledge_cache,
         "execution_path": [worker_label],
     }
  
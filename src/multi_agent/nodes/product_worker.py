@@ -56,13 +56,14 @@ def run_product_worker(state: MultiAgentState) -> dict:
         }
  
     parsed = result_data["parsed"]
-    prods = _extract_product_names(state, parsed)
+    found_names = _product_names_in(parsed)
+    prods = _extract_product_names(state, found_names)
  
     logger.info(f"ProductWorker: Done. Summary: {result_data['summary'][:120]}")
  
     pydantic_result = ProductWorkerResult(
         summary=result_data["summary"],
-        products=parsed if isinstance(parsed, list) else [],
+        product_names=found_names,
     )
 
     return {
@@ -240,9 +241,17 @@ def _safe_parse(raw: str):
         return raw
  
  
-def _extract_product_names(state: MultiAgentState, parsed) -> list:
+def _extract_product_names(state: MultiAgentState, found_names: list) -> list:
+    """Persisted products of the session plus the newly found ones, in order, without duplicates."""
     prods = list(state.get("persisted_products", []))
- 
+    prods.extend(name for name in found_names if name not in prods)
+    return prods
+
+
+def _product_names_in(parsed) -> list:
+    """Product names in a tool's parsed result, in order, without duplicates."""
+    prods = []
+
     if not isinstance(parsed, (list, dict)):
         return prods
  
@@ -1,9 +1,14 @@
 import logging
+from functools import lru_cache
+from src.config import SUPERVISOR_PROMPT_TOKEN_BUDGET, DEADLINE_RESPOND_THRESHOLD_SECONDS
+from src.infrastructure.deadline import remaining_seconds
+from src.utils import count_tokens
+from src.multi_agent.prompts.budget import PromptBudget, PromptSection
 from src.multi_agent.state.graph_state import MultiAgentState
 from src.multi_agent.schemas.supervisor_schema import SupervisorDecisionOutput, MedicalWorker, ProductWorker, NutrientWorker, RespondWorker
 from src.multi_agent.prompts.supervisor_prompt import SUPERVISOR_CHAT_PROMPT
-from src.utils.get_llm import get_llm_4_1_mini
-from src.multi_agent.state import log_state_summary
+from src.infrastructure.llm_client import get_llm_4_1_mini
+from src.multi_agent.state import log_state_summary, get_recent_messages, format_cached_facts
  
 logger = logging.getLogger(__name__)
  
@@ -22,6 +27,12 @@ def run_supervisor(state: MultiAgentState) -> dict:
     if loop_count >= MAX_SUPERVISOR_LOOPS:
         logger.warning(f"Supervisor: Max loops ({MAX_SUPERVISOR_LOOPS}) reached.")
         return _force_respond(loop_count, "Max loop count reached.")
+
+    # Not enough time left for another worker round-trip: answer with the evidence we have
+    remaining = remaining_seconds()
+    if remaining is not None and remaining < DEADLINE_RESPOND_THRESHOLD_SECONDS:
+        logger.warning(f"Supervisor: {remaining:.1f}s left in the turn budget, forcing respond.")
+        return _force_respond(loop_count, "Turn deadline almost reached.")
  
     prompt_values = build_prompt_values(state, loop_count)
  
@@ -105,14 +116,29 @@ def _force_respond(loop_count: int, reason: str) -> dict:
 # ═══════════════════════════════════════════════════════════════════════════════
  
 def build_prompt_values(state: MultiAgentState, loop_count: int) -> dict:
+    # Priorities: this turn's worker results > what ran already > prior context > chat history
+    budget = PromptBudget("supervisor", SUPERVISOR_PROMPT_TOKEN_BUDGET, fixed_tokens=_supervisor_template_tokens())
+    texts, messages, _ = budget.fit(
+        sections=[
+            PromptSection("gathered_data_summary", format_worker_results_for_prompt(state), priority=1, min_tokens=300),
+            PromptSection("previous_actions", format_previous_decisions(state), priority=1, min_tokens=150),
+            PromptSection("persisted_context", build_persisted_context(state), priority=2, min_tokens=100),
+            PromptSection("cached_facts", format_cached_facts(state), priority=2, min_tokens=50),
+        ],
+        messages=get_recent_messages(state.get("messages", [])),
+        history_priority=3,
+    )
     return {
-        "persisted_context": build_persisted_context(state),
-        "gathered_data_summary": format_worker_results_for_prompt(state),
-        "previous_actions": format_previous_decisions(state),
+        **texts,
         "loop_count": loop_count,
         "max_loops": MAX_SUPERVISOR_LOOPS,
-        "messages": state.get("messages", [])[-10:],
+        "messages": messages,
     }
+
+
+@lru_cache(maxsize=1)
+def _supervisor_template_tokens() -> int:
+    return count_tokens(SUPERVISOR_CHAT_PROMPT.messages[0].prompt.template)
  
  
 def format_prompt_values_for_logging(prompt_values: dict) -> dict:
@@ -174,6 +200,8 @@ def _format_decision_params(decision) -> str:
     parts = []
     if hasattr(decision, 'medication') and decision.medication:
         parts.append(f"medication='{decision.medication}'")
+    if getattr(decision, 'medications', None):
+        parts.append(f"medications={decision.medications}")
     if hasattr(decision, 'symptom') and decision.symptom:
         parts.append(f"symptom='{decision.symptom}'")
     if hasattr(decision, 'medical_query') and decision.medical_query:
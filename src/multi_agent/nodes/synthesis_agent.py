@@ -1,10 +1,23 @@
 import logging
+import threading
+import time
+from functools import lru_cache
 
 from langchain_core.messages import SystemMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 
 from src.multi_agent.state.graph_state import MultiAgentState
-from src.utils.get_llm import get_llm_4_1_mini
+from src.multi_agent.state import get_recent_messages
+from src.multi_agent.prompts.budget import PromptBudget, PromptSection
+from src.config import (
+    SYNTHESIS_PROMPT_TOKEN_BUDGET, SYNTHESIS_MODE, SYNTHESIS_SLOW_SECONDS, SYNTHESIS_PROBE_SECONDS,
+    SYNTHESIS_TEMPLATE_MIN_REMAINING_SECONDS,
+)
+from src.multi_agent.prompts.synthesis_templates import detect_language, can_render_template, render_template_response
+from src.infrastructure.deadline import remaining_seconds
+from src.utils import count_tokens
+from src.infrastructure.llm_client import get_llm_4_1_mini
+from src.infrastructure.rate_limiter import PRIORITY_INTERACTIVE
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +103,13 @@ SYNTHESIS_PROMPT = ChatPromptTemplate.from_messages([
 
 def run_synthesis_agent(state: MultiAgentState) -> dict:
 
+    # ── 0. Template synthesis for data-only turns (see SYNTHESIS_MODE) ──────
+    medical, products, nutrients = _turn_results(state)
+    language = _user_language(state)
+    template_ready = can_render_template(medical, products, nutrients, language)
+    if template_ready and _prefer_template():
+        return _template_response(medical, products, nutrients, language, "synthesis(template)")
+
     # ── 1. Extract supervisor briefing ──────────────────────────────────────
     current_decision = state.get("current_decision")
     response_guidance = getattr(current_decision, "response_guidance", "Respond naturally based on the evidence available.")
@@ -106,22 +126,30 @@ def run_synthesis_agent(state: MultiAgentState) -> dict:
     safety_flags_raw = state.get("safety_flags", [])
     safety_flags = ", ".join(safety_flags_raw) if safety_flags_raw else "None detected."
 
-    # ── 5. Build prompt values ───────────────────────────────────────────────
-    prompt_values = {
-        "response_guidance": response_guidance,
-        "gathered_evidence": gathered_evidence,
-        "persisted_context": persisted_context,
-        "safety_flags": safety_flags,
-        "messages": state.get("messages", [])[-10:],
-    }
+    # ── 5. Build prompt values (token-budgeted) ──────────────────────────────
+    budget = PromptBudget("synthesis", SYNTHESIS_PROMPT_TOKEN_BUDGET, fixed_tokens=_synthesis_template_tokens())
+    texts, messages, _ = budget.fit(
+        sections=[
+            PromptSection("response_guidance", response_guidance, priority=0, min_tokens=count_tokens(response_guidance)),
+            PromptSection("safety_flags", safety_flags, priority=0, min_tokens=count_tokens(safety_flags)),
+            PromptSection("gathered_evidence", gathered_evidence, priority=1, min_tokens=500),
+            PromptSection("persisted_context", persisted_context, priority=2, min_tokens=100),
+        ],
+        messages=get_recent_messages(state.get("messages", [])),
+        history_priority=3,
+    )
+    prompt_values = {**texts, "messages": messages}
 
     # ── 6. Invoke LLM ────────────────────────────────────────────────────────
-    llm = get_llm_4_1_mini()
+    # The user is waiting on this call: it jumps ahead of routing/background calls for quota
+    llm = get_llm_4_1_mini(priority=PRIORITY_INTERACTIVE)
     chain = SYNTHESIS_PROMPT | llm
 
+    started = time.perf_counter()
     try:
         result = chain.invoke(prompt_values)
         response_text = result.content
+        _llm_health.record(time.perf_counter() - started, ok=True)
         logger.info(f"Synthesis: Generated response ({len(response_text)} chars)")
 
         return {
@@ -132,6 +160,9 @@ def run_synthesis_agent(state: MultiAgentState) -> dict:
 
     except Exception as e:
         logger.error(f"Synthesis Agent failed: {e}", exc_info=True)
+        _llm_health.record(time.perf_counter() - started, ok=False)
+        if template_ready:
+            return _template_response(medical, products, nutrients, language, "synthesis(template_fallback)")
         return {
             "final_response": (
                 "I'm sorry, I had a little trouble putting my thoughts together. "
@@ -141,6 +172,93 @@ def run_synthesis_agent(state: MultiAgentState) -> dict:
         }
 
 
+@lru_cache(maxsize=1)
+def _synthesis_template_tokens() -> int:
+    return count_tokens(SYNTHESIS_SYSTEM_PROMPT)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEMPLATE SYNTHESIS — deterministic answer, no LLM call
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _LlmHealth:
+    """
+    Recent synthesis LLM latency (EWMA) and consecutive failures, per process.
+
+    While degraded, one call every SYNTHESIS_PROBE_SECONDS still goes to the LLM as a probe;
+    a successful call while degraded restarts the average from its latency, so a recovered
+    LLM is picked up again instead of being skipped forever.
+    """
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self.latency: float | None = None
+        self.failures = 0
+        self._next_probe = 0.0
+        # Turns run concurrently in the threadpool: every read-modify-write goes under this
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool):
+        with self._lock:
+            if ok and self._degraded():
+                self.latency = seconds
+            else:
+                self.latency = seconds if self.latency is None else self.latency + self.alpha * (seconds - self.latency)
+            self.failures = 0 if ok else self.failures + 1
+
+    @property
+    def degraded(self) -> bool:
+        with self._lock:
+            return self._degraded()
+
+    def _degraded(self) -> bool:
+        return self.failures >= 2 or (self.latency or 0) > SYNTHESIS_SLOW_SECONDS
+
+    def claim_probe(self) -> bool:
+        """True for the one caller allowed to try the degraded LLM in this probe interval."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_probe:
+                return False
+            self._next_probe = now + SYNTHESIS_PROBE_SECONDS
+            return True
+
+
+_llm_health = _LlmHealth()
+
+
+def _prefer_template() -> bool:
+    if SYNTHESIS_MODE == "template":
+        return True
+    if SYNTHESIS_MODE != "auto":
+        return False
+    remaining = remaining_seconds()
+    short_on_time = remaining is not None and remaining < SYNTHESIS_TEMPLATE_MIN_REMAINING_SECONDS
+    return short_on_time or (_llm_health.degraded and not _llm_health.claim_probe())
+
+
+def _turn_results(state: MultiAgentState) -> tuple[list, list, list]:
+    return tuple(
+        [r for r in (state.get(key) or []) if r and r != "CLEAR"]
+        for key in ("medical_worker_results", "product_worker_results", "nutrient_worker_results")
+    )
+
+
+def _user_language(state: MultiAgentState) -> str:
+    user_messages = [m for m in state.get("messages", []) if m.type == "human"]
+    return detect_language(user_messages[-1].content if user_messages else "")
+
+
+def _template_response(medical: list, products: list, nutrients: list, language: str, label: str) -> dict:
+    response_text = render_template_response(medical, products, nutrients, language)
+    logger.info(f"Synthesis: {label}, language={language} ({len(response_text)} chars)")
+    return {
+        "final_response": response_text,
+        "messages": [AIMessage(content=response_text)],
+        "execution_path": [label],
+    }
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # EVIDENCE BUILDER — Reads all worker results from shared state
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,153 @@
+import logging
+from dataclasses import dataclass, field
+
+from langchain_core.messages import BaseMessage
+
+from src.utils import count_tokens, count_message_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SEPARATOR = "\n\n"
+TRUNCATION_MARKER = "  … ({n} more line(s) omitted to fit the prompt budget)"
+
+
+@dataclass
+class PromptSection:
+    """A variable part of a prompt. Lower priority number = more important = trimmed last."""
+    name: str
+    text: str
+    priority: int
+    min_tokens: int = 0
+
+
+@dataclass
+class BudgetReport:
+    call: str
+    budget: int
+    tokens_before: int
+    tokens_after: int
+    sections: dict[str, tuple[int, int]] = field(default_factory=dict)   # name -> (before, after)
+
+    @property
+    def trimmed(self) -> bool:
+        return self.tokens_after < self.tokens_before
+
+    def log_line(self) -> str:
+        parts = ", ".join(f"{name}={before}->{after}" for name, (before, after) in self.sections.items())
+        return f"PromptBudget[{self.call}]: {self.tokens_before} -> {self.tokens_after} tokens (budget {self.budget}) [{parts}]"
+
+
+class PromptBudget:
+    """
+    Fits the variable parts of a prompt (text sections + chat history) into a token budget.
+
+    Sections are shrunk from the least to the most important one, each down to its
+    `min_tokens` floor, until the total fits:
+      - history: oldest messages are dropped first; the latest message is always kept
+      - text:    blocks (separated by blank lines) share the remaining budget evenly,
+                 each block keeps its first lines (headers / top facts) and gets a marker
+    Deterministic: the same inputs always produce the same prompt.
+    """
+
+    def __init__(self, call: str, budget_tokens: int, fixed_tokens: int = 0):
+        self.call = call
+        self.budget = budget_tokens
+        self.fixed_tokens = fixed_tokens
+
+    def fit(
+        self,
+        sections: list[PromptSection],
+        messages: list[BaseMessage],
+        history_priority: int,
+        history_min_messages: int = 1,
+    ) -> tuple[dict[str, str], list[BaseMessage], BudgetReport]:
+        texts = {s.name: s.text for s in sections}
+        section_tokens = {s.name: count_tokens(s.text) for s in sections}
+        message_tokens = [count_message_tokens(m) for m in messages]
+
+        before = {name: tokens for name, tokens in section_tokens.items()}
+        before["history"] = sum(message_tokens)
+        total_before = self.fixed_tokens + sum(before.values())
+
+        kept_messages = list(messages)
+        overflow = total_before - self.budget
+
+        # Least important first; history competes with the text sections by priority
+        order = sorted(sections + [None], key=lambda s: -(history_priority if s is None else s.priority))
+        for section in order:
+            if overflow <= 0:
+                break
+            if section is None:
+                while overflow > 0 and len(kept_messages) > history_min_messages:
+                    kept_messages.pop(0)
+                    overflow -= message_tokens.pop(0)
+                continue
+
+            current = section_tokens[section.name]
+            target = max(section.min_tokens, current - overflow)
+            if target >= current:
+                continue
+            texts[section.name] = _shrink_text(section.text, target)
+            section_tokens[section.name] = count_tokens(texts[section.name])
+            overflow -= current - section_tokens[section.name]
+
+        after = dict(section_tokens)
+        after["history"] = sum(message_tokens)
+        report = BudgetReport(
+            call=self.call,
+            budget=self.budget,
+            tokens_before=total_before,
+            tokens_after=self.fixed_tokens + sum(after.values()),
+            sections={name: (before[name], after[name]) for name in before},
+        )
+        logger.info(report.log_line())
+        return texts, kept_messages, report
+
+
+def _shrink_text(text: str, max_tokens: int) -> str:
+    """Water-fill `max_tokens` across the blocks of `text`, truncating the largest blocks."""
+    blocks = text.split(BLOCK_SEPARATOR)
+    sizes = [count_tokens(b) for b in blocks]
+    separator_cost = count_tokens(BLOCK_SEPARATOR) * (len(blocks) - 1)
+    remaining = max(0, max_tokens - separator_cost)
+
+    # Small blocks keep everything; the leftover is split evenly between the large ones
+    allowance = [0] * len(blocks)
+    pending = sorted(range(len(blocks)), key=lambda i: sizes[i])
+    while pending:
+        share = remaining // len(pending)
+        i = pending[0]
+        if sizes[i] <= share:
+            allowance[i] = sizes[i]
+            remaining -= sizes[i]
+            pending.pop(0)
+        else:
+            for j in pending:
+                allowance[j] = share
+            break
+
+    return BLOCK_SEPARATOR.join(
+        block if allowance[i] >= sizes[i] else _truncate_block(block, allowance[i])
+        for i, block in enumerate(blocks)
+    )
+
+
+def _truncate_block(block: str, max_tokens: int) -> str:
+    lines = block.splitlines()
+    kept, used = [], 0
+    marker_cost = count_tokens(TRUNCATION_MARKER.format(n=len(lines)))
+    for line in lines:
+        cost = count_tokens(line) + 1
+        if used + cost + marker_cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+
+    if not kept:
+        # Not even the first line fits: cut it on a token boundary
+        return truncate_to_tokens(lines[0], max(0, max_tokens - 1)) + "…" if max_tokens > 1 else ""
+
+    omitted = len(lines) - len(kept)
+    if omitted:
+        kept.append(TRUNCATION_MARKER.format(n=omitted))
+    return "\n".join(kept)
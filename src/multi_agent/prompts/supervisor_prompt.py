@@ -53,6 +53,7 @@ Follow this priority order when deciding what to do:
 | A medication name                       | → call_medical, medication_lookup                   |
 | A symptom/feeling                       | → call_medical, symptom_investigation               |
 | Both medication + symptom               | → call_medical, validate_connection                 |
+| Shared depletions across several meds   | → call_medical, medication_overlap                  |
 | User REPORTS feeling a specific symptom | → call_medical, validate_connection (if meds known) |
 | Asks about a nutrient                   | → call_nutrient                                     |
 | Wants products/recommendations          | → call_product, products_search                     |
@@ -81,11 +82,14 @@ After medical data has been gathered AND user is interested in solutions:
  
 1. MEDICAL WORKER (action: "call_medical"):
    - "medication_lookup": Info about a medication + nutrient depletions + side effects.
-     Requires: medication (string)
+     Requires: medication (string). If the user lists SEVERAL medications, also set
+     medications (list of all of them) — they are looked up together in one call.
    - "symptom_investigation": What deficiencies/medications may cause a symptom.
      Requires: symptom (string)
    - "validate_connection": Does medication X cause symptom Y via nutrient depletion?
      Requires: medication (string) AND symptom (string)
+   - "medication_overlap": Which nutrients are depleted by more than one of the user's medications.
+     Uses every medication already in PRIOR CONTEXT; set medications (list) for any new ones.
  
 2. PRODUCT WORKER (action: "call_product"):
    - "products_search": Find BeLife products matching a health need.
@@ -114,6 +118,10 @@ After medical data has been gathered AND user is interested in solutions:
    → Therefore, if the user asks a follow-up query requiring specific DB data (e.g. "what else does Metformin deplete?", "what are the B12 sources?"), you MUST call the appropriate worker to re-fetch the facts for this new turn.
    → DO NOT respond blindly just because the entity is listed in PRIOR CONTEXT.
    → ⚠️ EXCEPTION: If the user REPORTS experiencing a newly recognized symptom ("I feel dizzy", "I have anemia"), you MUST call `medical_worker` with `validate_connection` to explicitly check the link against their medications.
+- CACHED FACTS lists (worker, query type, entity) results already fetched in earlier turns of this session.
+   → Calling a worker with exactly those parameters returns the cached facts instantly (no database query) — use the SAME query type and entity spelling.
+   → Only use a DIFFERENT query type for a cached entity when the user needs something that query adds (e.g. validate_connection for a newly reported symptom).
+   → If the recent chat messages already contain the cached facts the user asks about → respond.
 - If loop {loop_count} ≥ 1 and you have ANY worker results (for the CURRENT turn) → respond.
    ⚠️ EXCEPTION: If the user is on multiple medications, you MAY loop to call `validate_connection` for each one before responding.
 - Max {max_loops} loops per turn. Currently on loop {loop_count}.
@@ -159,6 +167,9 @@ HOW TO CHOOSE tone:
  
 PRIOR CONTEXT (persisted from all previous turns — do NOT re-fetch these):
 {persisted_context}
+
+CACHED FACTS (fetched in earlier turns — re-calling with these exact parameters is free):
+{cached_facts}
  
 WORKER RESULTS (gathered in THIS turn):
 {gathered_data_summary}
@@ -0,0 +1,148 @@
+"""
+Deterministic, localized answers built straight from the worker results.
+
+Used instead of the synthesis LLM for well-known, data-only turns (see SYNTHESIS_MODE),
+and as the fallback when the LLM call fails. Same persona rules as the LLM prompt:
+"according to my database", a professional referral, one follow-up question.
+
+The worker summaries are English, so they are only shown to English-speaking users. Other
+languages get a body rendered from the structured fields (BODY_TEMPLATES); a turn with a
+result that has no such body (symptom investigation, nutrient education) is left to the LLM.
+"""
+import re
+
+from src.multi_agent.schemas import MedicalQueryType
+
+DEFAULT_LANGUAGE = "en"
+
+# Romanian diacritics or frequent function words -> "ro"; anything else -> English
+_RO_HINTS = re.compile(
+    r"[ăâîșşțţ]|\b(si|sau|pentru|este|sunt|iau|nu|ma|imi|vreau|despre|medicamentul|medicamente)\b",
+    re.IGNORECASE,
+)
+
+TEMPLATES = {
+    "en": {
+        MedicalQueryType.MED_LOOKUP.value: "According to my database, here is what I found about {entity}:",
+        MedicalQueryType.SYMPTOM_INVESTIGATION.value: "My records show a few possible links for {entity}:",
+        MedicalQueryType.VALIDATE_CONNECTION.value: "I checked the link between {entity} for you:",
+        MedicalQueryType.MEDICATION_OVERLAP.value: "According to my database, some of your medications affect the same nutrients:",
+        "and": "and",
+        "nutrient": "Here is what my database says about {entity}:",
+        "products": "These options from our catalog match what we discussed:",
+        "not_found": "I don't have that in my database yet.",
+        "referral_medical": "Everyone reacts differently, so please talk to your doctor or pharmacist before changing anything.",
+        "referral_products": "A pharmacist can check whether any of these fit well with your medications.",
+        "follow_up_medical": "Do you notice any of these in your day-to-day life?",
+        "follow_up_nutrient": "Would you like to know which foods or supplements can help with this?",
+        "follow_up_products": "Would you like more details about any of them?",
+    },
+    "ro": {
+        MedicalQueryType.MED_LOOKUP.value: "Conform bazei mele de date, iată ce am găsit despre {entity}:",
+        MedicalQueryType.SYMPTOM_INVESTIGATION.value: "Înregistrările mele arată câteva legături posibile pentru {entity}:",
+        MedicalQueryType.VALIDATE_CONNECTION.value: "Am verificat legătura dintre {entity}:",
+        MedicalQueryType.MEDICATION_OVERLAP.value: "Conform bazei mele de date, unele dintre medicamentele tale afectează aceiași nutrienți:",
+        "and": "și",
+        "nutrient": "Iată ce spune baza mea de date despre {entity}:",
+        "products": "Aceste opțiuni din catalogul nostru se potrivesc cu ce am discutat:",
+        "not_found": "Încă nu am această informație în baza mea de date.",
+        "referral_medical": "Fiecare organism reacționează diferit, așa că te rog să vorbești cu medicul sau farmacistul tău înainte de orice schimbare.",
+        "referral_products": "Un farmacist poate verifica dacă vreuna dintre ele se potrivește cu medicamentele tale.",
+        "follow_up_medical": "Observi vreunul dintre aceste semne în viața de zi cu zi?",
+        "follow_up_nutrient": "Vrei să afli ce alimente sau suplimente te pot ajuta?",
+        "follow_up_products": "Vrei mai multe detalii despre vreunul dintre ele?",
+    },
+}
+
+# Bodies rendered from the structured result fields, for languages other than the summaries'
+BODY_TEMPLATES = {
+    "ro": {
+        MedicalQueryType.MED_LOOKUP.value: "{medication} poate scădea nivelul de: {nutrients}.",
+        MedicalQueryType.VALIDATE_CONNECTION.value: (
+            "{medication} poate scădea nivelul de {nutrients}, iar lipsa acestora poate explica {symptom}."
+        ),
+        MedicalQueryType.MEDICATION_OVERLAP.value: "Nutrienți afectați de mai multe dintre ele: {nutrients}.",
+        "no_connection": "Nu am găsit o legătură documentată între {medication} și {symptom}.",
+        "no_overlap": "Nu am găsit niciun nutrient afectat de mai mult de unul dintre ele.",
+        "product": "- {name}",
+    },
+}
+
+TEMPLATE_QUERY_TYPES = {q.value for q in MedicalQueryType}
+
+
+def detect_language(text: str) -> str:
+    return "ro" if text and _RO_HINTS.search(text) else DEFAULT_LANGUAGE
+
+
+def _is_error(summary: str) -> bool:
+    return not summary or summary.lower().startswith("error")
+
+
+def can_render_template(medical: list, products: list, nutrients: list, language: str = DEFAULT_LANGUAGE) -> bool:
+    """True when this turn's evidence is fully covered by a known, error-free template in `language`."""
+    results = medical + products + nutrients
+    if not results or any(_is_error(r.summary) for r in results):
+        return False
+    if not all(getattr(r, "query_type", None) in TEMPLATE_QUERY_TYPES for r in medical):
+        return False
+    if language == DEFAULT_LANGUAGE:
+        return True
+    bodies = BODY_TEMPLATES.get(language)
+    return bool(bodies) and not nutrients and all(med.query_type in bodies for med in medical) and all(
+        prod.product_names for prod in products
+    )
+
+
+def _medical_body(med, t: dict, bodies: dict | None) -> str:
+    if bodies is None:
+        return med.summary
+    if not med.nutrients_found:
+        if med.query_type == MedicalQueryType.VALIDATE_CONNECTION.value:
+            return bodies["no_connection"].format(medication=med.medication_name, symptom=med.symptom_name)
+        if med.query_type == MedicalQueryType.MEDICATION_OVERLAP.value:
+            return bodies["no_overlap"]
+        return t["not_found"]
+    return bodies[med.query_type].format(
+        medication=med.medication_name,
+        symptom=", ".join(med.symptoms_found) or med.symptom_name,
+        nutrients=", ".join(med.nutrients_found),
+    )
+
+
+def _products_body(prod, bodies: dict | None) -> str:
+    if bodies is None:
+        return prod.summary
+    return "\n".join(bodies["product"].format(name=name) for name in prod.product_names)
+
+
+def render_template_response(medical: list, products: list, nutrients: list, language: str) -> str:
+    """Only call when can_render_template(..., language) is True."""
+    t = TEMPLATES.get(language, TEMPLATES[DEFAULT_LANGUAGE])
+    bodies = None if language == DEFAULT_LANGUAGE else BODY_TEMPLATES.get(language)
+    paragraphs = []
+
+    for med in medical:
+        entity = f" {t['and']} ".join(n for n in (med.medication_name, med.symptom_name) if n)
+        paragraphs.append(f"{t[med.query_type].format(entity=entity)}\n{_medical_body(med, t, bodies)}")
+    for nut in nutrients:
+        paragraphs.append(f"{t['nutrient'].format(entity=nut.nutrient_name or '')}\n{nut.summary}")
+    for prod in products:
+        paragraphs.append(f"{t['products']}\n{_products_body(prod, bodies)}")
+
+    if not paragraphs:
+        paragraphs.append(t["not_found"])
+
+    if medical or nutrients:
+        paragraphs.append(t["referral_medical"])
+    elif products:
+        paragraphs.append(t["referral_products"])
+
+    if products:
+        paragraphs.append(t["follow_up_products"])
+    elif nutrients:
+        paragraphs.append(t["follow_up_nutrient"])
+    else:
+        paragraphs.append(t["follow_up_medical"])
+
+    return "\n\n".join(paragraphs)
@@ -11,6 +11,7 @@ class MedicalQueryType(str, Enum):                           #str as argument -
     MED_LOOKUP = "medication_lookup"
     SYMPTOM_INVESTIGATION = "symptom_investigation"
     VALIDATE_CONNECTION = "validate_connection"
+    MEDICATION_OVERLAP = "medication_overlap"
  
  
 class ProductQueryType(str, Enum):
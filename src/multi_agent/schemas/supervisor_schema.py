@@ -14,6 +14,7 @@ class MedicalWorker(BaseModel):
     medication: str | None = Field(default = None, description = "The name of the medication (e.g, 'Metformin')")              #same as medication: Optionarl[str] = None
     symptom: str | None = Field(default = None, description = "The symptom the user is experiencing (e.g., 'fatigue')")
     reasoning: str = Field(description="Brief explanation of why you chose to call the medical worker right now.")
+    medications: list[str] | None = Field(default=None, description="For medication_lookup and medication_overlap: ALL medications the user listed when there are several (e.g, ['Metformin', 'Omeprazole']); medication_overlap needs at least two")
  
  
 class ProductWorker(BaseModel):
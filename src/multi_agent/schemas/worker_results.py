@@ -7,10 +7,12 @@ class MedicalWorkerResult(BaseModel):
     symptom_name: Optional[str] = None
     nutrients_found: list[str] = []
     symptoms_found: list[str] = []
+    query_type: Optional[str] = None
  
 class ProductWorkerResult(BaseModel):
     summary: str
-    products: list[dict] = []
+    # Names only — full product dicts live in the graph/catalog and are not checkpointed every superstep
+    product_names: list[str] = []
  
 class NutrientWorkerResult(BaseModel):
     summary: str
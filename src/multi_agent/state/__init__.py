@@ -1,9 +1,16 @@
 from .graph_state import MultiAgentState
-from .reducers import clear_or_add
-from .utils import log_state_summary
+from .reducers import clear_or_add, add_and_trim_messages
+from .utils import log_state_summary, get_recent_messages
+from .knowledge import normalize_entity, lookup_knowledge, remember_knowledge, format_cached_facts
 
 __all__ = [
     "MultiAgentState",
     "clear_or_add",
+    "add_and_trim_messages",
     "log_state_summary",
+    "get_recent_messages",
+    "normalize_entity",
+    "lookup_knowledge",
+    "remember_knowledge",
+    "format_cached_facts",
 ]
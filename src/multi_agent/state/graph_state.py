@@ -1,12 +1,12 @@
 from typing import Annotated, TypedDict
 from langchain_core.messages import BaseMessage
-from langgraph.graph.message import add_messages
 from src.multi_agent.schemas import SupervisorDecision
-from .reducers import clear_or_add
+from .reducers import clear_or_add, add_and_trim_messages
 from src.multi_agent.schemas import MedicalWorkerResult, ProductWorkerResult, NutrientWorkerResult
 
 class MultiAgentState(TypedDict):
-    messages: Annotated[list[BaseMessage], add_messages]
+    # Bounded: recent window + rolling summary message (see add_and_trim_messages)
+    messages: Annotated[list[BaseMessage], add_and_trim_messages]
     session_id: str
 
     #supervisor - workers
@@ -24,9 +24,13 @@ class MultiAgentState(TypedDict):
     persisted_symptoms: list[str]
     persisted_nutrients: list[str]
     persisted_products: list[str]
+    # Worker results from earlier turns, keyed "worker|entity|query_type" (see state/knowledge.py)
+    knowledge_cache: dict[str, MedicalWorkerResult | NutrientWorkerResult]
 
     #output
     final_response: str | None
+    # Set by the answer_cache lookup on a miss, consumed by answer_cache_store after synthesis
+    answer_cache_probe: dict | None
 
     #observability
     step_count: int
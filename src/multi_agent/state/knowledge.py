@@ -0,0 +1,63 @@
+import logging
+from pydantic import BaseModel
+from src.config import KNOWLEDGE_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+KEY_SEPARATOR = "|"
+
+
+def normalize_entity(*names: str | None) -> str:
+    """Canonical cache form of an entity: case/whitespace-insensitive, '+'-joined for pairs."""
+    return "+".join(" ".join(str(n).split()).casefold() for n in names if n)
+
+
+def knowledge_key(worker: str, entity: str, query_type: str) -> str:
+    return KEY_SEPARATOR.join([worker, entity, query_type])
+
+
+def lookup_knowledge(state: dict, worker: str, entity: str, query_type: str) -> BaseModel | None:
+    """Cached worker result for this session, or None. `entity` must already be normalized."""
+    if not entity:
+        return None
+    cached = (state.get("knowledge_cache") or {}).get(knowledge_key(worker, entity, query_type))
+    if cached is not None:
+        logger.info(f"Knowledge cache hit: {worker} {query_type} '{entity}'")
+    return cached
+
+
+def remember_knowledge(state: dict, worker: str, entity: str, query_type: str, result: BaseModel) -> dict:
+    """
+    New knowledge_cache dict with `result` stored as the most recent entry.
+
+    The state field is last-write-wins, so this always returns the full cache. Insertion
+    order doubles as recency: the oldest entries are evicted beyond KNOWLEDGE_CACHE_MAX_ENTRIES.
+    """
+    cache = dict(state.get("knowledge_cache") or {})
+    if not entity:
+        return cache
+
+    key = knowledge_key(worker, entity, query_type)
+    cache.pop(key, None)
+    cache[key] = result
+
+    for stale in list(cache)[:max(0, len(cache) - KNOWLEDGE_CACHE_MAX_ENTRIES)]:
+        del cache[stale]
+    return cache
+
+
+def format_cached_facts(state: dict) -> str:
+    """One line per cached (worker, query type) group, listing the entities already known."""
+    cache = state.get("knowledge_cache") or {}
+    if not cache:
+        return "Nothing cached yet."
+
+    groups: dict[tuple[str, str], list[str]] = {}
+    for key in cache:
+        worker, entity, query_type = key.split(KEY_SEPARATOR, 2)
+        groups.setdefault((worker, query_type), []).append(entity)
+
+    return "\n".join(
+        f"- {worker} {query_type}: {', '.join(entities)}"
+        for (worker, query_type), entities in groups.items()
+    )
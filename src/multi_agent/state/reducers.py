@@ -1,9 +1,63 @@
+from langchain_core.messages import BaseMessage, SystemMessage
+from langgraph.graph.message import add_messages
+from src.config import MAX_HISTORY_MESSAGES, HISTORY_SUMMARY_MAX_CHARS
+
+SUMMARY_MESSAGE_ID = "conversation_summary"
+SUMMARY_HEADER = "Summary of the earlier conversation (oldest first):"
+SUMMARY_LINE_CHARS = 160
+
+
 def clear_or_add(existing_list: list, new_elements: list) -> list:
 
     if new_elements == ["CLEAR"]:
         return []
-    
+
     if existing_list is None:
         return new_elements
-        
+
     return existing_list + new_elements
+
+
+def add_and_trim_messages(existing: list[BaseMessage], new: list[BaseMessage]) -> list[BaseMessage]:
+    """
+    add_messages + a bounded history, so checkpoints don't grow with every turn.
+
+    Keeps the last MAX_HISTORY_MESSAGES messages. Older messages are folded into a single
+    SystemMessage (id=SUMMARY_MESSAGE_ID) at the head of the list: one truncated line per
+    message, capped at HISTORY_SUMMARY_MAX_CHARS by dropping the oldest lines.
+    Deterministic and LLM-free — reducers run on every superstep.
+    """
+    merged = add_messages(existing, new)
+
+    summary = next((m for m in merged if m.id == SUMMARY_MESSAGE_ID), None)
+    history = [m for m in merged if m.id != SUMMARY_MESSAGE_ID]
+
+    if len(history) <= MAX_HISTORY_MESSAGES:
+        return merged
+
+    overflow = history[:-MAX_HISTORY_MESSAGES]
+    kept = history[-MAX_HISTORY_MESSAGES:]
+    summary_text = _roll_summary(summary.content if summary else "", overflow)
+
+    return [SystemMessage(content=summary_text, id=SUMMARY_MESSAGE_ID)] + kept
+
+
+def _roll_summary(previous: str, dropped: list[BaseMessage]) -> str:
+    lines = previous.splitlines()[1:] if previous else []
+
+    for msg in dropped:
+        role = "User" if msg.type == "human" else "Yoboo"
+        text = " ".join(str(msg.content).split())
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[:SUMMARY_LINE_CHARS - 3] + "..."
+        lines.append(f"- {role}: {text}")
+
+    # Keep the most recent lines that fit in the budget
+    kept, size = [], len(SUMMARY_HEADER)
+    for line in reversed(lines):
+        size += len(line) + 1
+        if size > HISTORY_SUMMARY_MAX_CHARS:
+            break
+        kept.append(line)
+
+    return "\n".join([SUMMARY_HEADER] + kept[::-1])
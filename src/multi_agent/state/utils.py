@@ -1,8 +1,20 @@
 import logging
 from typing import Any
+from langchain_core.messages import BaseMessage
+from src.config import PROMPT_HISTORY_MESSAGES
+from .reducers import SUMMARY_MESSAGE_ID
 
 logger = logging.getLogger(__name__)
 
+
+def get_recent_messages(messages: list[BaseMessage], limit: int = PROMPT_HISTORY_MESSAGES) -> list[BaseMessage]:
+    """Last `limit` messages for a prompt, preceded by the rolling summary message if one exists."""
+    messages = messages or []
+    summary = [m for m in messages[:1] if m.id == SUMMARY_MESSAGE_ID]
+    recent = [m for m in messages[-limit:] if m.id != SUMMARY_MESSAGE_ID]
+    return summary + recent
+
+
 def log_state_summary(state: dict, title: str = "STATE SUMMARY") -> None:
 
     lines = [f"\n{'='*20} {title} {'='*20}"]
@@ -0,0 +1,104 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import logging
+
+from src.config import PRODUCT_SEARCH_RRF_K, PRODUCT_SEARCH_TOP_K
+from src.infrastructure.embedding_client import get_embeddings
+from src.infrastructure.neo4j_client import get_neo4j_client
+from src.repositories.product_keyword_index import get_product_keyword_index
+from src.repositories.neo4j_queries import PRODUCT_VECTOR_SEARCH
+from src.utils import is_error
+
+logger = logging.getLogger(__name__)
+
+# Shared by all sessions; each search submits exactly two short tasks
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="product-search")
+
+
+def reciprocal_rank_fusion(rankings: dict[str, list[str]], k: int = PRODUCT_SEARCH_RRF_K) -> dict[str, float]:
+    """RRF: score(d) = sum over sources of 1 / (k + rank), rank starting at 1."""
+    fused: dict[str, float] = {}
+    for ranked in rankings.values():
+        for rank, key in enumerate(ranked, start=1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    return fused
+
+
+def hybrid_search_products(query: str, top_k: int = PRODUCT_SEARCH_TOP_K) -> list[dict] | str:
+    """
+    Vector and keyword product search issued concurrently and fused with reciprocal-rank
+    fusion, so a vector miss no longer costs a second sequential round trip.
+
+    Rows keep the keyword-search shape ({"recommendation": {"recommended_product": ...}})
+    plus the fused score and each source's own score/rank. Returns an 'ERROR: ...' string
+    only when both sources failed.
+    """
+    # Each task runs in a copy of the caller's context so the turn deadline still applies
+    vector_future = _executor.submit(contextvars.copy_context().run, _vector_search, query, top_k)
+    keyword_future = _executor.submit(contextvars.copy_context().run, get_product_keyword_index().search, [query], top_k)
+    vector_rows, keyword_rows = vector_future.result(), keyword_future.result()
+
+    if is_error(vector_rows) and is_error(keyword_rows):
+        return vector_rows
+    if is_error(vector_rows):
+        logger.warning(f"Vector product search failed for '{query}', keyword only: {vector_rows}")
+        vector_rows = []
+    if is_error(keyword_rows):
+        logger.warning(f"Keyword product search failed for '{query}', vector only: {keyword_rows}")
+        keyword_rows = []
+
+    products: dict[str, dict] = {}
+    scores: dict[str, dict] = {}
+    rankings: dict[str, list[str]] = {"vector": [], "keyword": []}
+
+    for rank, row in enumerate(vector_rows, start=1):
+        rec = row.get("recommendation") or {}
+        product = rec.get("product") or {}
+        key = _product_key(product)
+        if not key or key in scores:
+            continue
+        products[key] = dict(product)
+        scores[key] = {"vector": {"rank": rank, "similarity": rec.get("similarity_score")}}
+        rankings["vector"].append(key)
+
+    for rank, row in enumerate(keyword_rows, start=1):
+        rec = row.get("recommendation") or {}
+        product = rec.get("recommended_product") or {}
+        key = _product_key(product)
+        if not key or "keyword" in scores.get(key, {}):
+            continue
+        merged = products.setdefault(key, {})
+        merged.update({k: v for k, v in product.items() if merged.get(k) is None})
+        merged.setdefault("all_nutrients_in_product", rec.get("all_nutrients_in_product") or [])
+        scores.setdefault(key, {})["keyword"] = {"rank": rank, "matched_keyword": rec.get("matched_keyword")}
+        rankings["keyword"].append(key)
+
+    fused = reciprocal_rank_fusion(rankings)
+    ordered = sorted(fused, key=lambda key: fused[key], reverse=True)[:top_k]
+    return [
+        {
+            "recommendation": {
+                "recommended_product": products[key],
+                "search_method": "hybrid_rrf",
+                "rrf_score": round(fused[key], 6),
+                "source_scores": scores[key],
+            }
+        }
+        for key in ordered
+    ]
+
+
+def _vector_search(query: str, top_k: int) -> list[dict] | str:
+    embedding = get_embeddings(query)
+    if not embedding:
+        return []
+    return get_neo4j_client().run_safe_query(
+        PRODUCT_VECTOR_SEARCH,
+        {"embedding_vector": embedding, "top_k": top_k},
+    )
+
+
+def _product_key(product: dict) -> str | None:
+    name = product.get("name")
+    return name.casefold() if name else None
@@ -4,11 +4,13 @@ from src.repositories.product_repository import BaseProductRepository
 from src.infrastructure.embedding_client import get_embeddings
 from src.utils import clean_results, is_error
 from src.infrastructure.neo4j_client import get_neo4j_client
+from src.config import PRODUCT_SEARCH_MODE
+from src.repositories.product_catalog import get_product_catalog
+from src.repositories.product_keyword_index import get_product_keyword_index
+from src.repositories.hybrid_product_search import hybrid_search_products
 from src.repositories.neo4j_queries import (
-    PRODUCT_KEYWORD_SEARCH,
     PRODUCT_FULLTEXT_SEARCH,
     PRODUCT_VECTOR_SEARCH,
-    PRODUCT_DETAILS
 )
 
 logger = logging.getLogger(__name__)
@@ -19,6 +21,9 @@ class Neo4jProductRepository(BaseProductRepository):
 
     def search_products(self, query: str) -> list[dict] | None:
 
+        if PRODUCT_SEARCH_MODE == "hybrid":
+            return self._search_hybrid(query)
+
         #embeddings
         results = self._search_by_embedding(query)
         if results is None:
@@ -47,6 +52,17 @@ class Neo4jProductRepository(BaseProductRepository):
         return results
 
 
+    def _search_hybrid(self, query: str) -> list[dict] | None:
+        try:
+            results = hybrid_search_products(query)
+            if is_error(results):
+                logger.error(f"Error in hybrid product search: {results}")
+                return None
+            return clean_results(results)
+        except Exception as e:
+            logger.error(f"Error in hybrid product search: {e}")
+            return None
+
     def _search_by_embedding(self, query: str) -> list[dict] | None:
         try:
             embeddings = get_embeddings(query)
@@ -71,12 +87,7 @@ class Neo4jProductRepository(BaseProductRepository):
 
     def _search_by_keyword(self, query: list[str]) -> list[dict] | None:
         try:
-            results = self.neo4j.run_safe_query(
-                PRODUCT_KEYWORD_SEARCH,
-                {
-                    "keywords": query
-                }
-            )
+            results = get_product_keyword_index().search(query)
             if is_error(results):
                 logger.error(f"Error searching products by keyword: {results}")
                 return None
@@ -87,14 +98,11 @@ class Neo4jProductRepository(BaseProductRepository):
 
         
     def _get_details_by_exact_match(self, product_name: str) -> list[dict] | None:
-        results = self.neo4j.run_safe_query(
-            PRODUCT_DETAILS,
-            {"product_name": product_name}
-        )
-        if is_error(results):
-            logger.error(f"DB error in exact product lookup: {results}")
+        snapshot = get_product_catalog().snapshot()
+        if is_error(snapshot):
+            logger.error(f"DB error in exact product lookup: {snapshot}")
             return None
-        return clean_results(results)
+        return clean_results(snapshot.details(product_name))
 
     
     def _get_details_by_fulltext_match(self, product_name: str) -> list[dict] | None:
@@ -7,7 +7,8 @@ from src.repositories.neo4j_queries import (
     MEDICATION_DIRECT_QUERY,
     MEDICATION_FULLTEXT_QUERY,
     MEDICATION_EMBEDDINGS_QUERY,
-    MEDICATION_LOOKUP
+    MEDICATION_LOOKUP,
+    MEDICATION_BATCH_LOOKUP
 )
 from src.infrastructure.embedding_client import get_embeddings
 from src.utils import clean_results, is_error
@@ -68,6 +69,7 @@ class Neo4jMedicationRepository(BaseRepository, Neo4jEntityMixin):
         results = self._neo4j.run_safe_query(
             MEDICATION_LOOKUP,
             {"medications": [canonical_name]},
+            cache_name="MEDICATION_LOOKUP",
         )
  
         if is_error(results):
@@ -75,6 +77,28 @@ class Neo4jMedicationRepository(BaseRepository, Neo4jEntityMixin):
             return None
  
         return clean_results(results)
+
+
+    def fetch_batch_data(self, medication_names: list[str], max_depletions: int | None = 10) -> list[dict] | None:
+        """
+        Depletion profiles for several medications in one round trip: one row per name, in
+        order, {"position", "medication_searched", "context"} with context None when no
+        Medicament matched. max_depletions=None returns whole profiles. Returns None on DB error.
+        """
+        if not medication_names:
+            return []
+
+        results = self._neo4j.run_safe_query(
+            MEDICATION_BATCH_LOOKUP,
+            {"medications": list(medication_names), "max_depletions": max_depletions},
+            cache_name="MEDICATION_BATCH_LOOKUP",
+        )
+
+        if is_error(results):
+            logger.error(f"Database error during batch medication depletion lookup: {results}")
+            return None
+
+        return results
  
  
 _med_repo_instance: Neo4jMedicationRepository | None = None
@@ -44,7 +44,8 @@ class Neo4jNutrientRepository(BaseRepository, Neo4jEntityMixin):
 
         results = self._neo4j.run_safe_query(
             NUTRIENT_LOOKUP,
-            {"nutrients": [canonical_name]}
+            {"nutrients": [canonical_name]},
+            cache_name="NUTRIENT_LOOKUP",
         )
 
         if is_error(results):
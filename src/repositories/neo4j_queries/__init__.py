@@ -3,6 +3,7 @@ from .medication_queries import (
     MEDICATION_FULLTEXT_QUERY,
     MEDICATION_EMBEDDINGS_QUERY,
     MEDICATION_LOOKUP,
+    MEDICATION_BATCH_LOOKUP,
     MEDICATION_SYMPTOM_CONNECTION
 )
 
@@ -20,11 +21,9 @@ from .symptoms_queries import (
 )
 
 from .product_queries import (
-    PRODUCT_KEYWORD_SEARCH,
+    PRODUCT_CATALOG_SNAPSHOT,
     PRODUCT_FULLTEXT_SEARCH,
     PRODUCT_VECTOR_SEARCH,
-    PRODUCT_CATALOG,
-    PRODUCT_DETAILS
 )
 
 __all__ = [
@@ -32,6 +31,7 @@ __all__ = [
     "MEDICATION_FULLTEXT_QUERY",
     "MEDICATION_EMBEDDINGS_QUERY",
     "MEDICATION_LOOKUP",
+    "MEDICATION_BATCH_LOOKUP",
     "NUTRIENT_DIRECT_QUERY",
     "NUTRIENT_FULLTEXT_QUERY",
     "NUTRIENT_LOOKUP",
@@ -40,9 +40,7 @@ __all__ = [
     "SYMPTOM_FULLTEXT_QUERY",
     "SYMPTOM_EMBEDDINGS_QUERY",
     "MEDICATION_SYMPTOM_CONNECTION",
-    "PRODUCT_KEYWORD_SEARCH",
+    "PRODUCT_CATALOG_SNAPSHOT",
     "PRODUCT_FULLTEXT_SEARCH",
     "PRODUCT_VECTOR_SEARCH",
-    "PRODUCT_CATALOG",
-    "PRODUCT_DETAILS"
 ]
\ No newline at end of file
@@ -1,32 +1,59 @@
 SYMPTOM_INVESTIGATION = """
-    // INPUT: $symptom (A symptom)
-    // OUTPUT: ALL possible causes - filtered by the agent
+    // INPUT: $symptom (A symptom), $offset / $limit (page of causes)
+    // OUTPUT: one page of possible causes, ranked by supporting depletion events
    
     // 1. Find the symptom
     CALL db.index.fulltext.queryNodes('symptom_full_search', $symptom)
     YIELD node AS sym, score
     WHERE score > 0.3
     WITH sym ORDER BY score DESC LIMIT 1
+
+    // The causes index is only trusted when stamped with the current graph version: after a
+    // re-ingest that skipped materialization it describes the old graph and causes are ranked live
+    OPTIONAL MATCH (gv:GraphVersion {id: 'knowledge_graph'})
+    WITH sym, gv.version AS graph_version
    
-    // 2. Find ALL connections
-    MATCH (de:DepletionEvent)-[:Has_Symptom]->(sym)
-    MATCH (de)-[:DEPLETES]->(nut:Nutrient)
-    OPTIONAL MATCH (med:Medicament)-[:CAUSES]->(de)
-   
-    // 3. Group by medication
-    WITH sym, med, collect(DISTINCT nut.name) AS nutrients_depleted
-   
-    // 4. Collect all medication-cause pairs
-    WITH sym, collect({
-        medication: COALESCE(med.name, "General Deficiency (no specific drug)"),
-        depleted_nutrients: nutrients_depleted
-    }) AS all_causes
+    // 2. Ranked causes: sliced from the index materialized at ingest time
+    //    (src/ingestion/symptom_causes.py); symptoms not materialized yet are ranked live
+    CALL {
+        WITH sym, graph_version
+        WITH sym WHERE sym.cause_medications IS NOT NULL
+                   AND sym.causes_version = graph_version
+        WITH sym, size(sym.cause_medications) AS total
+        WITH sym, total,
+             CASE WHEN $offset + $limit < total THEN $offset + $limit ELSE total END AS page_end
+        RETURN total, [i IN range($offset, page_end - 1) | {
+            medication: sym.cause_medications[i],
+            depleted_nutrients: CASE sym.cause_nutrients[i]
+                WHEN "" THEN []
+                ELSE split(sym.cause_nutrients[i], "\\u001F")
+            END,
+            supporting_events: sym.cause_support[i]
+        }] AS page
+      UNION
+        WITH sym, graph_version
+        WITH sym WHERE sym.cause_medications IS NULL
+                    OR coalesce(sym.causes_version <> graph_version, true)
+        MATCH (de:DepletionEvent)-[:Has_Symptom]->(sym)
+        MATCH (de)-[:DEPLETES]->(nut:Nutrient)
+        OPTIONAL MATCH (med:Medicament)-[:CAUSES]->(de)
+        WITH med, count(DISTINCT de) AS support, collect(DISTINCT nut.name) AS nutrients_depleted
+        ORDER BY support DESC, med.name
+        WITH collect({
+            medication: COALESCE(med.name, "General Deficiency (no specific drug)"),
+            depleted_nutrients: nutrients_depleted,
+            supporting_events: support
+        }) AS all_causes
+        RETURN size(all_causes) AS total, all_causes[$offset..($offset + $limit)] AS page
+    }
    
-    // 5. Return results
+    // 3. Return results
     RETURN {
         symptom: sym.name,
-        possible_causes: all_causes,
-        total_causes_found: size(all_causes)
+        possible_causes: page,
+        total_causes_found: total,
+        offset: $offset,
+        has_more: $offset + size(page) < total
     } AS context
     """
 
@@ -15,10 +15,15 @@ class Neo4jQueryRepository:
  
 
     def find_med_symptom_connection(self, med_canonical_name: str, sym_canonical_name: str) -> list[dict]:
- 
+        return self.find_med_symptoms_connection(med_canonical_name, [sym_canonical_name])
+
+
+    def find_med_symptoms_connection(self, med_canonical_name: str, sym_canonical_names: list[str]) -> list[dict]:
+        """Validate several canonical symptoms against one medication in a single adjacency check."""
         results = self._neo4j.run_safe_query(
             MEDICATION_SYMPTOM_CONNECTION,
-            {"medications": [med_canonical_name], "symptoms": [sym_canonical_name]},
+            {"medications": [med_canonical_name], "symptoms": sorted(set(sym_canonical_names))},
+            cache_name="CONNECTION_VALIDATION",
         )
  
         if is_error(results):
@@ -10,6 +10,7 @@ from src.repositories.neo4j_queries import (
     SYMPTOM_EMBEDDINGS_QUERY
 )
 from src.infrastructure.embedding_client import get_embeddings
+from src.config import SYMPTOM_CAUSES_PAGE_SIZE
 from src.utils import clean_results, is_error
  
 logger = logging.getLogger(__name__)
@@ -65,10 +66,12 @@ class Neo4jSymptomRepository(BaseRepository, Neo4jEntityMixin):
             return None
     
 
-    def fetch_entity_data(self, symptom_name: str) -> list[dict]:
+    def fetch_entity_data(self, symptom_name: str, offset: int = 0, limit: int = SYMPTOM_CAUSES_PAGE_SIZE) -> list[dict]:
+        # One page of causes, ranked by supporting depletion events
         results = self._neo4j.run_safe_query(
             SYMPTOM_INVESTIGATION,
-            {"symptom": symptom_name}
+            {"symptom": symptom_name, "offset": offset, "limit": limit},
+            cache_name="SYMPTOM_INVESTIGATION",
         )
         if is_error(results):
             logger.error(f"Error finding causes for symptom '{symptom_name}': {results}")
@@ -0,0 +1,222 @@
+import bisect
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+import logging
+
+from src.infrastructure.graph_version import get_graph_version
+from src.infrastructure.metrics import get_metrics
+from src.infrastructure.neo4j_client import get_neo4j_client
+from src.utils import is_error
+from src.repositories.neo4j_queries import PRODUCT_CATALOG_SNAPSHOT
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PAGE_SIZE = 20
+
+# Delay before retrying a failed load, doubled on each further failure up to the maximum
+REFRESH_RETRY_SECONDS = 5.0
+REFRESH_RETRY_MAX_SECONDS = 300.0
+
+# Query tokens shorter than this only match whole tokens (no prefix expansion)
+MIN_PREFIX_LENGTH = 3
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.casefold()) if text else []
+
+
+def normalize_name(name: str) -> str:
+    """'Anti-Stress 600' and 'anti stress600' map to the same key."""
+    return "".join(tokenize(name))
+
+
+class _TokenIndex:
+    """token -> product ids; a query matches when every query token is a token (or prefix) of the product."""
+
+    def __init__(self, texts: list[str]):
+        postings: dict[str, set[int]] = {}
+        for pid, text in enumerate(texts):
+            for token in tokenize(text):
+                postings.setdefault(token, set()).add(pid)
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+
+    def match(self, query: str) -> set[int]:
+        ids: set[int] | None = None
+        for token in tokenize(query):
+            hits = self._lookup(token)
+            ids = hits if ids is None else ids & hits
+            if not ids:
+                return set()
+        return ids or set()
+
+    def _lookup(self, token: str) -> set[int]:
+        if len(token) < MIN_PREFIX_LENGTH:
+            return set(self._postings.get(token, ()))
+        hits: set[int] = set()
+        for term in self._vocabulary[bisect.bisect_left(self._vocabulary, token):]:
+            if not term.startswith(token):
+                break
+            hits |= self._postings[term]
+        return hits
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable view of the whole catalog at one graph version; replaced, never mutated."""
+    version: int
+    products: tuple[dict, ...]                  # ordered by (primary_category, name)
+    by_exact_name: dict[str, int]
+    by_normalized_name: dict[str, int]
+    name_index: _TokenIndex
+    category_index: _TokenIndex                 # primary_category + target_benefit
+
+    @classmethod
+    def build(cls, version: int, rows: list[dict]) -> "CatalogSnapshot":
+        products = tuple(sorted(
+            (row["product"] for row in rows if row.get("product", {}).get("name")),
+            key=lambda p: ((p.get("primary_category") or ""), p["name"]),
+        ))
+        return cls(
+            version=version,
+            products=products,
+            by_exact_name={p["name"]: i for i, p in enumerate(products)},
+            by_normalized_name={normalize_name(p["name"]): i for i, p in enumerate(products)},
+            name_index=_TokenIndex([p["name"] for p in products]),
+            category_index=_TokenIndex([
+                f"{p.get('primary_category') or ''} {p.get('target_benefit') or ''}" for p in products
+            ]),
+        )
+
+    def browse(self, category: str = "", limit: int = CATALOG_PAGE_SIZE) -> list[dict]:
+        """Same rows as PRODUCT_CATALOG: all products, or those whose category/benefit match."""
+        ids = range(len(self.products)) if not category.strip() else sorted(self.category_index.match(category))
+        return [{"catalog_entry": {"product": _catalog_fields(self.products[i])}} for i in list(ids)[:limit]]
+
+    def details(self, product_name: str) -> list[dict]:
+        """Same rows as PRODUCT_DETAILS: exact name, normalized name, then all-name-tokens match."""
+        pid = self.by_exact_name.get(product_name)
+        if pid is None:
+            pid = self.by_normalized_name.get(normalize_name(product_name))
+        if pid is None:
+            candidates = self.name_index.match(product_name)
+            pid = min(candidates, key=lambda i: len(self.products[i]["name"])) if candidates else None
+        if pid is None:
+            return []
+        return [{"product_details": _details_fields(self.products[pid])}]
+
+
+def _catalog_fields(product: dict) -> dict:
+    return {
+        "name": product.get("name"),
+        "primary_category": product.get("primary_category"),
+        "target_benefit": product.get("target_benefit"),
+        "scientific_description": product.get("scientific_description"),
+        "dosage_per_day": product.get("dosage_per_day"),
+        "ingredients_summary": product.get("ingredients_text"),
+    }
+
+
+def _details_fields(product: dict) -> dict:
+    return {
+        "name": product.get("name"),
+        "primary_category": product.get("primary_category"),
+        "target_benefit": product.get("target_benefit"),
+        "scientific_description": product.get("scientific_description"),
+        "dosage_per_day": product.get("dosage_per_day"),
+        "dosage_timing": product.get("dosage_timing"),
+        "precautions": product.get("precautions"),
+        "marketing_claims": product.get("marketing_claims"),
+        "ingredients_summary": product.get("ingredients_text"),
+        "ingredient_names": product.get("ingredient_names"),
+        "interactions": product.get("interactions_text"),
+    }
+
+
+class ProductCatalog:
+    """
+    Holds the current CatalogSnapshot. The first call loads it synchronously; after that, a
+    graph-version change triggers a background reload while the previous snapshot keeps
+    serving, so no request waits on a catalog rebuild.
+
+    A snapshot of an older version only serves while that first reload runs: once it has
+    failed, callers get its 'ERROR: ...' string until a reload succeeds. Failed loads are
+    retried no sooner than REFRESH_RETRY_SECONDS later, doubling up to REFRESH_RETRY_MAX_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: CatalogSnapshot | None = None
+        self._refreshing = False
+        self._error: str | None = None          # last failed load, until one succeeds
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        self._metrics = get_metrics()
+
+    def snapshot(self) -> CatalogSnapshot | str:
+        """The snapshot of the current graph version, or an 'ERROR: ...' string (see class docstring)."""
+        version = get_graph_version()
+        current = self._snapshot
+        if current is not None:
+            if current.version == version:
+                return current
+            self._refresh_in_background(version)
+            return current if self._error is None else self._error
+
+        with self._lock:
+            if self._snapshot is None:
+                if self._error is not None and time.monotonic() < self._retry_at:
+                    return self._error
+                result = self._load(version)
+                if isinstance(result, str):
+                    return result
+        return self._snapshot
+
+    def _refresh_in_background(self, version: int):
+        with self._lock:
+            if self._refreshing or time.monotonic() < self._retry_at:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self._load(version)
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="product-catalog-refresh", daemon=True).start()
+
+    def _load(self, version: int) -> CatalogSnapshot | str:
+        rows = get_neo4j_client().run_safe_query(PRODUCT_CATALOG_SNAPSHOT)
+        if is_error(rows):
+            self._retry_delay = min(max(2 * self._retry_delay, REFRESH_RETRY_SECONDS), REFRESH_RETRY_MAX_SECONDS)
+            self._retry_at = time.monotonic() + self._retry_delay
+            self._error = rows
+            logger.error(f"Could not load the product catalog snapshot (retry in {self._retry_delay:g}s): {rows}")
+            self._metrics.incr("product_catalog_refresh_total", result="error")
+            return rows
+
+        snapshot = CatalogSnapshot.build(version, rows)
+        self._snapshot = snapshot
+        self._error = None
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        self._metrics.incr("product_catalog_refresh_total", result="ok")
+        self._metrics.set_gauge("product_catalog_products", len(snapshot.products))
+        logger.info(f"Product catalog snapshot loaded: {len(snapshot.products)} products (graph version {version})")
+        return snapshot
+
+
+_product_catalog_instance: ProductCatalog | None = None
+
+
+def get_product_catalog() -> ProductCatalog:
+    global _product_catalog_instance
+    if _product_catalog_instance is None:
+        _product_catalog_instance = ProductCatalog()
+    return _product_catalog_instance
@@ -0,0 +1,141 @@
+import bisect
+import threading
+
+import logging
+
+from src.repositories.product_catalog import CatalogSnapshot, get_product_catalog, tokenize, MIN_PREFIX_LENGTH
+
+logger = logging.getLogger(__name__)
+
+# Tokenized product fields, in ranking order: a hit in the name beats a hit in the marketing text
+INDEXED_FIELDS = (
+    "name",
+    "ingredient_names",
+    "target_benefit",
+    "ingredients_text",
+    "scientific_description",
+    "marketing_text",
+)
+
+
+class ProductKeywordIndex:
+    """
+    In-process inverted index over the BeLife catalog: token -> {product id: best field rank}.
+
+    Replaces the keyword tier that scanned every product with six CONTAINS predicates.
+    A keyword matches a product when every keyword token is a token (or, from
+    MIN_PREFIX_LENGTH characters, a token prefix) of one of INDEXED_FIELDS. Prefixes are
+    resolved by bisecting the sorted vocabulary, so a lookup costs O(log V + matches)
+    regardless of catalog size. Built from the product catalog snapshot and rebuilt
+    whenever a new snapshot replaces it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: CatalogSnapshot | None = None
+        # (products, postings, sorted vocabulary), swapped as one so readers never mix builds
+        self._index: tuple[tuple[dict, ...], dict[str, dict[int, int]], list[str]] = ((), {}, [])
+
+    def search(self, keywords: list[str] | str, limit: int = 5) -> list[dict] | str:
+        """Same rows as the former PRODUCT_KEYWORD_SEARCH, or an 'ERROR: ...' string."""
+        error = self._ensure_fresh()
+        if error:
+            return error
+
+        if isinstance(keywords, str):
+            keywords = [keywords]
+
+        index = self._index
+        rows = []
+        for keyword in keywords:
+            for product_id in self._match(index, keyword):
+                rows.append({"recommendation": self._recommendation(index[0][product_id], keyword)})
+                if len(rows) >= limit:
+                    return rows
+        return rows
+
+    # ── Matching ─────────────────────────────────────────────────────────────
+
+    def _match(self, index: tuple, keyword: str) -> list[int]:
+        """Product ids matching every token of `keyword`, best field first."""
+        products, postings, vocabulary = index
+        ranks: dict[int, int] | None = None
+        for token in tokenize(keyword):
+            token_ranks = self._lookup_token(postings, vocabulary, token)
+            if ranks is None:
+                ranks = token_ranks
+            else:
+                ranks = {pid: max(rank, token_ranks[pid]) for pid, rank in ranks.items() if pid in token_ranks}
+            if not ranks:
+                return []
+        return sorted(ranks or {}, key=lambda pid: (ranks[pid], products[pid]["name"] or ""))
+
+    @staticmethod
+    def _lookup_token(postings: dict[str, dict[int, int]], vocabulary: list[str], token: str) -> dict[int, int]:
+        if len(token) < MIN_PREFIX_LENGTH:
+            return dict(postings.get(token, {}))
+
+        merged: dict[int, int] = {}
+        start = bisect.bisect_left(vocabulary, token)
+        for term in vocabulary[start:]:
+            if not term.startswith(token):
+                break
+            for pid, rank in postings[term].items():
+                merged[pid] = min(rank, merged.get(pid, rank))
+        return merged
+
+    @staticmethod
+    def _recommendation(product: dict, keyword: str) -> dict:
+        return {
+            "recommended_product": {
+                "name": product.get("name"),
+                "primary_category": product.get("primary_category"),
+                "target_benefit": product.get("target_benefit"),
+                "scientific_description": product.get("scientific_description"),
+                "dosage_per_day": product.get("dosage_per_day"),
+                "dosage_timing": product.get("dosage_timing"),
+                "precautions": product.get("precautions"),
+                "ingredients_summary": product.get("ingredients_text"),
+            },
+            "search_method": "keyword_match",
+            "matched_keyword": keyword,
+            "all_nutrients_in_product": product.get("all_nutrients_in_product") or [],
+        }
+
+    # ── Building ─────────────────────────────────────────────────────────────
+
+    def _ensure_fresh(self) -> str | None:
+        snapshot = get_product_catalog().snapshot()
+        if isinstance(snapshot, str):
+            return snapshot
+        if snapshot is self._snapshot:
+            return None
+
+        with self._lock:
+            if snapshot is not self._snapshot:
+                self._build(snapshot.products)
+                self._snapshot = snapshot
+        return None
+
+    def _build(self, products: tuple[dict, ...]):
+        postings: dict[str, dict[int, int]] = {}
+        for pid, product in enumerate(products):
+            for rank, field in enumerate(INDEXED_FIELDS):
+                value = product.get(field)
+                text = " ".join(value) if isinstance(value, list) else (value or "")
+                for token in set(tokenize(text)):
+                    by_product = postings.setdefault(token, {})
+                    by_product[pid] = min(rank, by_product.get(pid, rank))
+
+        self._index = (products, postings, sorted(postings))
+        logger.info(f"Product keyword index built: {len(products)} products, {len(postings)} terms")
+
+
+_product_keyword_index_instance: ProductKeywordIndex | None = None
+
+
+def get_product_keyword_index() -> ProductKeywordIndex:
+    global _product_keyword_index_instance
+    if _product_keyword_index_instance is None:
+        _product_keyword_index_instance = ProductKeywordIndex()
+    return _product_keyword_index_instance
@@ -3,6 +3,7 @@ import logging
 from src.repositories.entity_repository import BaseRepository
 from src.repositories import get_neo4j_medication_repository
 from src.services.service_results import ServiceResult, ResultStatus
+from src.utils.medication_overlap import analyze_medication_overlap
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +50,91 @@ class MedicationService:
             entity_found=canonical_name
         )
 
+    def get_medications_info(self, medication_names: list[str], max_depletions: int | None = 10) -> list[ServiceResult]:
+        """
+        Batch form of get_medication_info: one ServiceResult per name, in input order.
+
+        Every name goes to the graph in a single query. Only the names its fulltext seek
+        misses are resolved one by one (direct / fulltext / embeddings) and fetched in one
+        more query, so a list of prescriptions usually costs a single round trip.
+        max_depletions=None returns every depleted nutrient instead of the first ten.
+        """
+        names = list(medication_names)
+        rows = self.repo.fetch_batch_data(names, max_depletions)
+        if rows is None:
+            logger.error(f"Database error while fetching depletions for {names}")
+            return [ServiceResult(status=ResultStatus.DB_ERROR, entity_searched=name) for name in names]
+
+        contexts = {row["position"]: row.get("context") for row in rows}
+        missing = [i for i in range(len(names)) if not contexts.get(i)]
+        if missing:
+            resolved = {i: self.repo.resolve(names[i]) for i in missing}
+            retry = [i for i in missing if resolved[i]]
+            retry_rows = self.repo.fetch_batch_data([resolved[i] for i in retry], max_depletions) if retry else []
+            for row in retry_rows or []:
+                contexts[retry[row["position"]]] = row.get("context")
+
+        return [self._batch_item_result(name, contexts.get(i)) for i, name in enumerate(names)]
+
+    def get_medication_overlap(self, medication_names: list[str]) -> ServiceResult:
+        """
+        Nutrients depleted by more than one of the given medications, from one batch lookup.
+        data holds a single analysis dict (see analyze_medication_overlap) plus the names
+        that were not found.
+        """
+        # Whole profiles: an overlap beyond the tenth depleted nutrient still counts
+        results = self.get_medications_info(medication_names, max_depletions=None)
+        if results and all(r.is_error for r in results):
+            return ServiceResult(status=ResultStatus.DB_ERROR, entity_searched=", ".join(medication_names))
+
+        profiles = {}
+        for r in results:
+            if r.is_success:
+                profiles[r.entity_found] = r.data[0]["context"].get("depletions", [])
+            elif r.is_empty:
+                profiles[r.entity_found] = []
+        not_found = [r.entity_searched for r in results if r.is_not_found or r.is_error]
+
+        if len(profiles) < 2:
+            logger.warning(f"Medication overlap needs two known medications, found {list(profiles)}")
+            return ServiceResult(
+                status=ResultStatus.NOT_FOUND if not profiles else ResultStatus.EMPTY_DATA,
+                entity_searched=", ".join(medication_names),
+                entity_found=", ".join(profiles) or None,
+            )
+
+        analysis = analyze_medication_overlap(profiles)
+        analysis["not_found"] = not_found
+        logger.info(f"Medication overlap for {list(profiles)}: {len(analysis['cumulative_risk'])} shared nutrients")
+        return ServiceResult(
+            status=ResultStatus.SUCCESS,
+            data=[analysis],
+            entity_searched=", ".join(medication_names),
+            entity_found=", ".join(profiles),
+        )
+
+    @staticmethod
+    def _batch_item_result(medication_name: str, context: dict | None) -> ServiceResult:
+        if not context:
+            logger.warning(f"Medication '{medication_name}' not found in the knowledge graph")
+            return ServiceResult(status=ResultStatus.NOT_FOUND, entity_searched=medication_name)
+
+        canonical_name = (context.get("medication") or {}).get("name")
+        if not context.get("depletions"):
+            logger.warning(f"No depletions found for '{canonical_name}'")
+            return ServiceResult(
+                status=ResultStatus.EMPTY_DATA,
+                entity_searched=medication_name,
+                entity_found=canonical_name
+            )
+
+        return ServiceResult(
+            status=ResultStatus.SUCCESS,
+            data=[{"context": context}],
+            entity_searched=medication_name,
+            entity_found=canonical_name
+        )
+
 _med_service_instance: MedicationService | None = None
 
 def get_medication_service() -> MedicationService:
@@ -1 +1,2 @@
-from .results_formatter import clean_results, is_error
\ No newline at end of file
+from .results_formatter import clean_results, is_error
+from .tokens import count_tokens, count_message_tokens, truncate_to_tokens
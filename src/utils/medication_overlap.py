@@ -0,0 +1,89 @@
+"""
+Nutrient-overlap analysis across several medications.
+
+The medication x nutrient incidence is held as bitsets (Python ints): one mask of nutrient
+bits per medication and one mask of medication bits per nutrient. Every overlap count is then
+an AND plus a popcount, so the pairwise matrix costs O(M^2) word operations and the cumulative
+risk per nutrient is one popcount, whatever the number of nutrients.
+"""
+from itertools import combinations
+
+
+def analyze_medication_overlap(profiles: dict[str, list[dict]]) -> dict:
+    """
+    `profiles`: canonical medication name -> MEDICATION_LOOKUP depletions
+    ([{"nutrient": ..., "symptoms": [...]}, ...]).
+
+    Returns:
+        medications:       the analysed medications, in input order
+        nutrients:         every depleted nutrient (column order of `incidence`)
+        incidence:         medication x nutrient 0/1 matrix
+        overlap_matrix:    medication x medication count of shared depleted nutrients
+                           (the diagonal is each medication's own depletion count)
+        cumulative_risk:   nutrients depleted by 2+ medications, most medications first:
+                           {nutrient, depleted_by, depleted_by_count, risk_share, deficiency_symptoms}
+        pairwise_overlap:  medication pairs sharing nutrients, largest overlap first
+    """
+    medications = list(profiles)
+    nutrients: list[str] = []
+    nutrient_bit: dict[str, int] = {}
+    symptoms: dict[str, dict[str, None]] = {}
+
+    medication_masks = []
+    for name in medications:
+        mask = 0
+        for depletion in profiles[name]:
+            nutrient = depletion.get("nutrient")
+            if not nutrient:
+                continue
+            if nutrient not in nutrient_bit:
+                nutrient_bit[nutrient] = len(nutrients)
+                nutrients.append(nutrient)
+            mask |= 1 << nutrient_bit[nutrient]
+            symptoms.setdefault(nutrient, {}).update(dict.fromkeys(depletion.get("symptoms") or []))
+        medication_masks.append(mask)
+
+    nutrient_masks = [0] * len(nutrients)
+    for m, mask in enumerate(medication_masks):
+        for n in _bits(mask):
+            nutrient_masks[n] |= 1 << m
+
+    cumulative_risk = [
+        {
+            "nutrient": nutrients[n],
+            "depleted_by": [medications[m] for m in _bits(nutrient_masks[n])],
+            "depleted_by_count": nutrient_masks[n].bit_count(),
+            "risk_share": round(nutrient_masks[n].bit_count() / len(medications), 3),
+            "deficiency_symptoms": list(symptoms.get(nutrients[n], {})),
+        }
+        for n in range(len(nutrients)) if nutrient_masks[n].bit_count() > 1
+    ]
+    cumulative_risk.sort(key=lambda row: (-row["depleted_by_count"], row["nutrient"]))
+
+    pairwise_overlap = []
+    for a, b in combinations(range(len(medications)), 2):
+        shared = medication_masks[a] & medication_masks[b]
+        if shared:
+            pairwise_overlap.append({
+                "medications": [medications[a], medications[b]],
+                "shared_nutrients": [nutrients[n] for n in _bits(shared)],
+                "shared_count": shared.bit_count(),
+            })
+    pairwise_overlap.sort(key=lambda row: -row["shared_count"])
+
+    return {
+        "medications": medications,
+        "nutrients": nutrients,
+        "incidence": [[(mask >> n) & 1 for n in range(len(nutrients))] for mask in medication_masks],
+        "overlap_matrix": [[(a & b).bit_count() for b in medication_masks] for a in medication_masks],
+        "cumulative_risk": cumulative_risk,
+        "pairwise_overlap": pairwise_overlap,
+    }
+
+
+def _bits(mask: int):
+    """Indices of the set bits of `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -0,0 +1,49 @@
+import logging
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+TOKENIZER_ENCODING = "o200k_base"   # gpt-4o / gpt-4.1 / gpt-5 family
+CHARS_PER_TOKEN = 4                 # fallback heuristic when tiktoken is unavailable
+MESSAGE_OVERHEAD_TOKENS = 4         # role + separators per chat message
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken     # installed with langchain_openai
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable ({e}), falling back to ~{CHARS_PER_TOKEN} chars/token estimate")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens locally (no API call)."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(message: Any) -> int:
+    content = message.content if hasattr(message, "content") else message
+    if not isinstance(content, str):
+        content = str(content)
+    return count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to at most `max_tokens` tokens (on a token boundary when tiktoken is available)."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[: max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])